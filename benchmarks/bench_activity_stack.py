@@ -0,0 +1,48 @@
+"""
+Microbenchmark: ActivityStack push throughput with lazy vs eager timestamps.
+
+Run from the project root:
+    python benchmarks/bench_activity_stack.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_struct.Stacks import ActivityNode, ActivityStack
+
+
+class EagerActivityNode(ActivityNode):
+    """The old behaviour: format the timestamp string on every push."""
+    __slots__ = ("formatted",)
+
+    def __init__(self, action, details, payload=None, created=None):
+        super().__init__(action, details, payload, created)
+        self.formatted = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class EagerActivityStack(ActivityStack):
+    def push(self, action, details, payload=None):
+        self._items.append(EagerActivityNode(action, details, payload))
+        return f"Logged: {action}"
+
+
+def bench(stack_cls, pushes, repeat):
+    stack = stack_cls(max_size=10000)
+    timer = timeit.Timer(lambda: stack.push("ADD", "Added book: Benchmark"))
+    best = min(timer.repeat(repeat=repeat, number=pushes))
+    return pushes / best
+
+
+def main(pushes=200000, repeat=5):
+    eager = bench(EagerActivityStack, pushes, repeat)
+    lazy = bench(ActivityStack, pushes, repeat)
+    print(f"eager timestamp: {eager:12,.0f} pushes/sec")
+    print(f"lazy timestamp:  {lazy:12,.0f} pushes/sec")
+    print(f"speedup:         {lazy / eager:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Throughput benchmark for bulk circulation in LibrarySystem (in memory).
+
+Run from the project root:
+    python benchmarks/bench_circulation.py [events]
+
+Simulates a self-checkout rush followed by the overnight book-drop: every
+title has a few copies and a waitlist, so returns also promote holds.
+Target: 100k events/sec for the bulk APIs.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_struct.queue import LibrarySystem
+
+TARGET_EVENTS_PER_SEC = 100000
+
+
+def build(titles, copies):
+    system = LibrarySystem()
+    for i in range(titles):
+        system.add_book(f"B{i:07d}", f"Title {i}", copies)
+    return system
+
+
+def workload(events, titles, seed=42):
+    rng = random.Random(seed)
+    return [(f"U{i:07d}", f"B{rng.randrange(titles):07d}") for i in range(events)]
+
+
+def run(label, fn, events):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    rate = events / elapsed
+    verdict = "ok" if rate >= TARGET_EVENTS_PER_SEC else "BELOW TARGET"
+    print(f"{label:<28} {events:>9,} events {elapsed:8.3f}s {rate:>12,.0f} events/sec  {verdict}")
+    return rate
+
+
+def main(events=200000):
+    titles = max(1, events // 20)
+
+    requests = workload(events, titles)
+    returns = [(book_id, user_id) for user_id, book_id in requests]
+
+    system = build(titles, copies=10)
+    run("check_out_book (one by one)", lambda: [system.check_out_book(u, b) for u, b in requests], events)
+    run("return_book (one by one)", lambda: [system.return_book(b, u) for b, u in returns], events)
+
+    system = build(titles, copies=10)
+    run("check_out_many", lambda: system.check_out_many(requests), events)
+    run("return_many", lambda: system.return_many(returns), events)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
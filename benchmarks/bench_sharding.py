@@ -0,0 +1,57 @@
+"""
+Full-catalog search throughput for ShardedCatalog as the shard count grows.
+
+Run from the project root:
+    python benchmarks/bench_sharding.py [books] [queries]
+
+Each configuration loads the same synthetic catalog and runs the same
+substring searches (title or author, top 20). "local" keeps every shard in
+this process; "parallel" gives each shard its own worker process, so the
+throughput should rise with the shard count up to the number of cores.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_struct.sharding import ShardedCatalog
+
+WORDS = ["atomic", "habits", "dune", "code", "clean", "river", "garden", "night", "empire",
+         "ocean", "silent", "winter", "glass", "stone", "shadow", "light", "history", "python"]
+
+
+def catalog_rows(books, seed=7):
+    rng = random.Random(seed)
+    return [(f"{i:013d}", " ".join(rng.sample(WORDS, 3)).title(), f"Author {rng.randrange(books // 10 + 1)}")
+            for i in range(books)]
+
+
+def run(label, rows, queries, num_shards, parallel):
+    with ShardedCatalog(num_shards=num_shards, parallel=parallel) as catalog:
+        catalog.bulk_load(rows)
+        start = time.perf_counter()
+        for query in queries:
+            catalog.search(query, limit=20)
+        elapsed = time.perf_counter() - start
+    rate = len(queries) / elapsed
+    print(f"{label:<10} shards={num_shards:<3} {len(queries):>6} searches {elapsed:8.3f}s {rate:>10,.1f} searches/sec")
+    return rate
+
+
+def main(books=200000, queries=50):
+    rows = catalog_rows(books)
+    rng = random.Random(1)
+    searches = [rng.choice(WORDS)[:4] for _ in range(queries)]
+    cores = os.cpu_count() or 1
+    print(f"{books:,} books, {cores} cores")
+
+    run("local", rows, searches, 1, parallel=False)
+    for num_shards in sorted({1, 2, 4, cores}):
+        run("parallel", rows, searches, num_shards, parallel=True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,77 @@
+"""
+Warm-start benchmark: rebuilding the catalog indexes from SQLite row by row
+versus restoring them from a binary snapshot.
+
+Run from the project root:
+    python benchmarks/bench_snapshot.py [books]
+
+Both paths produce the BST, BookDictionary and BookLinkedList the GUI uses.
+Target: snapshot restore well under one second for 100k books.
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_struct.Bsearch import BinarySearchTree
+from src.data_struct.BookDictionary import BookDictionary
+from src.data_struct.linkedList import BookLinkedList
+from src.data_struct.snapshot import save_snapshot, load_snapshot
+
+TARGET_SECONDS = 1.0
+
+
+def build_database(path, books, seed=3):
+    rng = random.Random(seed)
+    isbns = [f"978{i:010d}" for i in range(books)]
+    rng.shuffle(isbns)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, isbn TEXT UNIQUE, title TEXT, author TEXT)")
+    conn.executemany("INSERT INTO books (isbn, title, author) VALUES (?, ?, ?)",
+                     ((isbn, f"Title {isbn[-6:]}", f"Author {rng.randrange(5000)}") for isbn in isbns))
+    conn.commit()
+    return conn
+
+
+def rebuild_from_database(conn):
+    bst, book_dict, linked_list = BinarySearchTree(), BookDictionary(), BookLinkedList()
+    for isbn, title, author in conn.execute("SELECT isbn, title, author FROM books"):
+        bst.insert(isbn, (title, author, isbn))
+        book_dict.add_book(isbn, title, author)
+        linked_list.add_book(title, author, isbn)
+    return bst, book_dict, linked_list
+
+
+def restore_from_snapshot(path):
+    snapshot = load_snapshot(path, "bench", 1)
+    return snapshot.build_bst(), snapshot.build_book_dictionary(), snapshot.build_linked_list()
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def main(books=100000):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_database(os.path.join(tmp, "library.db"), books)
+        snapshot_path = os.path.join(tmp, "catalog.snap")
+
+        (bst, _, linked_list), _ = timed("rebuild from SQLite", lambda: rebuild_from_database(conn))
+        timed("save snapshot", lambda: save_snapshot(snapshot_path, bst, linked_list, "bench", 1))
+        print(f"{'snapshot size':<24} {os.path.getsize(snapshot_path) / 1e6:8.2f}MB")
+        _, elapsed = timed("restore from snapshot", lambda: restore_from_snapshot(snapshot_path))
+        verdict = "ok" if elapsed < TARGET_SECONDS else "BELOW TARGET"
+        print(f"{books:,} books: {verdict}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
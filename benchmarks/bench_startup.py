@@ -0,0 +1,85 @@
+"""
+Startup benchmark for the GUI: time to first window and time to interactive.
+
+Run from the project root (needs a display):
+    python benchmarks/bench_startup.py [books]
+
+A throwaway working directory gets a database with the given number of
+books. The app is started twice: a cold start (no snapshot yet) and a warm
+start (snapshot saved by the first run's close). Reported per run:
+    import       - importing ui.gui_appl
+    first window - constructor returned and the first frame was painted
+    interactive  - the background catalog load has been installed
+    tree filled  - the Books treeview holds every row
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+
+def build_database(path, books, seed=5):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE books (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            isbn TEXT UNIQUE NOT NULL,
+            title TEXT NOT NULL,
+            author TEXT NOT NULL,
+            status TEXT DEFAULT 'Available'
+        )""")
+    isbns = [f"978{i:010d}" for i in range(books)]
+    rng.shuffle(isbns)
+    conn.executemany("INSERT INTO books (isbn, title, author) VALUES (?, ?, ?)",
+                     ((isbn, f"Title {isbn[-7:]}", f"Author {rng.randrange(5000)}") for isbn in isbns))
+    conn.commit()
+    conn.close()
+
+
+def start_once(label):
+    start = time.perf_counter()
+    from ui.gui_appl import IntegratedLibraryGUI
+    imported = time.perf_counter()
+
+    app = IntegratedLibraryGUI()
+    app.update()
+    first_window = time.perf_counter()
+
+    while app.loading:
+        app.update()
+        time.sleep(0.001)
+    interactive = time.perf_counter()
+
+    while app._books_fill is not None:
+        app.update()
+    filled = time.perf_counter()
+
+    app._on_close()
+    print(f"{label:<6} import {imported - start:6.3f}s  first window {first_window - start:6.3f}s  "
+          f"interactive {interactive - start:6.3f}s  tree filled {filled - start:6.3f}s")
+
+
+def main(books=100000):
+    import tkinter as tk
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        print(f"No display available: {e}")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        build_database(os.path.join(tmp, "integrated_library.db"), books)
+        print(f"{books:,} books")
+        start_once("cold")
+        start_once("warm")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,475 @@
+"""
+Benchmark suite for the data_struct modules and SQLiteService.
+
+Run from the project root:
+    python benchmarks/suite.py                          # 1k and 100k, compare to baseline
+    python benchmarks/suite.py --sizes 1k,100k,1m       # include the 1M catalog
+    python benchmarks/suite.py --cases bst,dict --repeat 5
+    python benchmarks/suite.py --json > results.json    # machine-readable output
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+
+Every case builds its input from the same seeded synthetic catalog, times
+only the operation itself (best of --repeat runs) and, for the cases that
+build a structure, records memory with tracemalloc. Results are compared
+case by case with the stored baseline. A case counts as a regression when it
+is more than --tolerance slower (and by more than --min-delta seconds, so
+sub-millisecond cases do not trip on timer noise); the exit status is then 1,
+so the suite can gate CI.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_struct.Bsearch import BinarySearchTree
+from src.data_struct.BookDictionary import BookDictionary
+from src.data_struct.linkedList import BookLinkedList
+from src.data_struct.Stacks import ActivityStack
+from src.data_struct.queue import LibrarySystem
+from src.data_struct.graph import Graphs
+from src.data_struct.query_cache import QueryCache
+from src.data_struct.fuzzy import FuzzyIndex
+try:
+    from src.data_struct.analytics import CatalogAnalytics
+except ImportError:     # NumPy missing: the analytics cases are skipped
+    CatalogAnalytics = None
+from src.data_struct.sharding import ShardedCatalog
+from src.data_struct.snapshot import save_snapshot, load_snapshot
+from src.database.sqlite import SQLiteService
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SIZES = {"1k": 1000, "10k": 10000, "100k": 100000, "1m": 1000000}
+QUERIES = 10000     # point lookups per query case (capped at the catalog size)
+SCANS = 20          # O(n) scans per scan case
+
+WORDS = ["atomic", "habits", "dune", "code", "clean", "river", "garden", "night", "empire", "ocean",
+         "silent", "winter", "glass", "stone", "shadow", "light", "history", "python", "data", "city"]
+
+
+class Catalog:
+    """Synthetic catalog shared by every case of one size."""
+    def __init__(self, size, seed=2025):
+        rng = random.Random(seed)
+        isbns = [f"978{i:010d}" for i in range(size)]
+        rng.shuffle(isbns)
+        self.size = size
+        self.rows = [(isbn, f"{' '.join(rng.sample(WORDS, 3)).title()} {i}", f"Author {rng.randrange(size // 20 + 1)}")
+                     for i, isbn in enumerate(isbns)]
+        self.queries = min(size, QUERIES)
+        self.lookup = [self.rows[rng.randrange(size)] for _ in range(self.queries)]
+        self.scan = [self.rows[rng.randrange(size)] for _ in range(SCANS)]
+        self.pairs = [(self.rows[rng.randrange(size)][1], self.rows[rng.randrange(size)][1])
+                      for _ in range(size)]
+        self.users = [f"U{rng.randrange(size):07d}" for _ in range(size)]
+
+
+CASES = []
+
+
+def case(name, memory=False, max_size=None):
+    """
+    Register a benchmark. The decorated function receives the Catalog, does
+    its (untimed) setup and returns (run, ops): run() is what gets timed.
+    """
+    def register(fn):
+        CASES.append({"name": name, "setup": fn, "memory": memory, "max_size": max_size})
+        return fn
+    return register
+
+
+def build_bst(catalog):
+    bst = BinarySearchTree()
+    for isbn, title, author in catalog.rows:
+        bst.insert(isbn, (title, author, isbn))
+    return bst
+
+
+def build_dict(catalog):
+    book_dict = BookDictionary()
+    for isbn, title, author in catalog.rows:
+        book_dict.add_book(isbn, title, author)
+    return book_dict
+
+
+def build_linked_list(catalog):
+    linked_list = BookLinkedList()
+    for isbn, title, author in catalog.rows:
+        linked_list.add_book(title, author, isbn)
+    return linked_list
+
+
+def build_library(catalog, copies=3):
+    library = LibrarySystem()
+    for isbn, title, _ in catalog.rows:
+        library.add_book(isbn, title, copies)
+    return library
+
+
+def build_graph(catalog):
+    graph = Graphs()
+    for _, title, _ in catalog.rows:
+        graph.add_book_node(title)
+    return graph
+
+
+# --- BinarySearchTree ---
+
+@case("bst.insert", memory=True)
+def _(catalog):
+    return lambda: build_bst(catalog), catalog.size
+
+
+@case("bst.search")
+def _(catalog):
+    bst = build_bst(catalog)
+    return lambda: [bst.search(isbn) for isbn, _, _ in catalog.lookup], catalog.queries
+
+
+@case("bst.inorder")
+def _(catalog):
+    bst = build_bst(catalog)
+    return lambda: sum(1 for _ in bst.inorder()), catalog.size
+
+
+@case("bst.delete")
+def _(catalog):
+    bst = build_bst(catalog)
+    return lambda: [bst.delete(isbn) for isbn, _, _ in catalog.lookup], catalog.queries
+
+
+# --- BookDictionary ---
+
+@case("dict.add_book", memory=True)
+def _(catalog):
+    return lambda: build_dict(catalog), catalog.size
+
+
+@case("dict.search_by_isbn")
+def _(catalog):
+    book_dict = build_dict(catalog)
+    return lambda: [book_dict.search_by_isbn(isbn) for isbn, _, _ in catalog.lookup], catalog.queries
+
+
+@case("dict.search_by_title")
+def _(catalog):
+    book_dict = build_dict(catalog)
+    return lambda: [book_dict.search_by_title(title[:8]) for _, title, _ in catalog.scan], SCANS
+
+
+# --- BookLinkedList ---
+
+@case("linked_list.add_book", memory=True)
+def _(catalog):
+    return lambda: build_linked_list(catalog), catalog.size
+
+
+@case("linked_list.search_by_title")
+def _(catalog):
+    linked_list = build_linked_list(catalog)
+    return lambda: [linked_list.search_by_title(title) for _, title, _ in catalog.scan], SCANS
+
+
+@case("linked_list.delete_book")
+def _(catalog):
+    linked_list = build_linked_list(catalog)
+    return lambda: [linked_list.delete_book(isbn) for isbn, _, _ in catalog.scan], SCANS
+
+
+# --- ActivityStack ---
+
+@case("stack.push", memory=True)
+def _(catalog):
+    stack = ActivityStack(max_size=1000)
+    return lambda: [stack.push("ADD", title) for _, title, _ in catalog.rows], catalog.size
+
+
+@case("stack.pop")
+def _(catalog):
+    stack = ActivityStack(max_size=catalog.size)
+    for _, title, _ in catalog.rows:
+        stack.push("ADD", title)
+    return lambda: [stack.pop() for _ in range(catalog.size)], catalog.size
+
+
+# --- LibrarySystem ---
+
+@case("library.add_book", memory=True)
+def _(catalog):
+    return lambda: build_library(catalog), catalog.size
+
+
+@case("library.check_out_book")
+def _(catalog):
+    library = build_library(catalog)
+    requests = list(zip(catalog.users, (isbn for isbn, _, _ in catalog.lookup)))
+    return lambda: [library.check_out_book(user, isbn) for user, isbn in requests], len(requests)
+
+
+@case("library.check_out_many")
+def _(catalog):
+    library = build_library(catalog)
+    requests = [(user, catalog.rows[i % catalog.size][0]) for i, user in enumerate(catalog.users)]
+    return lambda: library.check_out_many(requests), len(requests)
+
+
+@case("library.return_many")
+def _(catalog):
+    library = build_library(catalog)
+    requests = [(user, catalog.rows[i % catalog.size][0]) for i, user in enumerate(catalog.users)]
+    library.check_out_many(requests)
+    returns = [(isbn, user) for user, isbn in requests]
+    return lambda: library.return_many(returns), len(returns)
+
+
+# --- Graphs ---
+
+@case("graph.add_book_node", memory=True)
+def _(catalog):
+    return lambda: build_graph(catalog), catalog.size
+
+
+@case("graph.add_edges")
+def _(catalog):
+    graph = build_graph(catalog)
+    return lambda: graph.add_edges(catalog.pairs), len(catalog.pairs)
+
+
+@case("graph.get_recommendations")
+def _(catalog):
+    graph = build_graph(catalog)
+    graph.add_edges(catalog.pairs)
+    return lambda: [graph.get_recommendations(title) for _, title, _ in catalog.lookup], catalog.queries
+
+
+# --- QueryCache ---
+
+@case("query_cache.repeat_search")
+def _(catalog):
+    # The dict.search_by_title scans again, answered from a warm cache
+    book_dict = build_dict(catalog)
+    cache = QueryCache()
+    terms = [title[:8] for _, title, _ in catalog.scan]
+
+    def run():
+        return [cache.get_or_compute(("dict", "Title", term), lambda: book_dict.search_by_title(term))
+                for term in terms]
+    run()
+    return run, SCANS
+
+
+# --- FuzzyIndex ---
+
+def build_fuzzy(catalog):
+    index = FuzzyIndex()
+    index.bulk_load((isbn, title) for isbn, title, _ in catalog.rows)
+    return index
+
+
+@case("fuzzy.bulk_load", memory=True)
+def _(catalog):
+    return lambda: build_fuzzy(catalog), catalog.size
+
+
+@case("fuzzy.search")
+def _(catalog):
+    index = build_fuzzy(catalog)
+    # One typo per title: the first two letters swapped
+    typos = [title[1] + title[0] + title[2:] for _, title, _ in catalog.scan]
+    return lambda: [index.search(typo) for typo in typos], SCANS
+
+
+# --- CatalogAnalytics ---
+
+if CatalogAnalytics is not None:
+    @case("analytics.build", memory=True)
+    def _(catalog):
+        library = build_library(catalog)
+        return lambda: CatalogAnalytics.build(((isbn, author) for isbn, _, author in catalog.rows),
+                                              library.books), catalog.size
+
+    @case("analytics.reports")
+    def _(catalog):
+        analytics = CatalogAnalytics.build(((isbn, author) for isbn, _, author in catalog.rows), {})
+
+        def run():
+            analytics.count_by("status")
+            analytics.availability()
+            analytics.top_authors(10)
+        return run, 1
+
+
+# --- ShardedCatalog and snapshots ---
+
+@case("sharding.search")
+def _(catalog):
+    sharded = ShardedCatalog(num_shards=4)
+    sharded.bulk_load(catalog.rows)
+    return lambda: [sharded.search(title.split()[0], limit=20) for _, title, _ in catalog.scan], SCANS
+
+
+@case("snapshot.save_load")
+def _(catalog):
+    import tempfile
+    bst, linked_list = build_bst(catalog), build_linked_list(catalog)
+    path = os.path.join(tempfile.mkdtemp(), "catalog.snap")
+
+    def run():
+        save_snapshot(path, bst, linked_list, "bench", 1)
+        snapshot = load_snapshot(path, "bench", 1)
+        snapshot.build_bst()
+        snapshot.build_linked_list()
+    return run, catalog.size
+
+
+# --- SQLiteService ---
+
+def build_sqlite(catalog):
+    storage = SQLiteService(":memory:")
+    storage.conn.executemany("INSERT INTO items (title, details) VALUES (?, ?)",
+                             [(title, author) for _, title, author in catalog.rows])
+    storage.conn.commit()
+    return storage
+
+
+@case("sqlite.create_item")
+def _(catalog):
+    storage = SQLiteService(":memory:")
+    return lambda: [storage.create_item(title, author) for _, title, author in catalog.rows], catalog.size
+
+
+@case("sqlite.read_all")
+def _(catalog):
+    storage = build_sqlite(catalog)
+    return storage.read_all, catalog.size
+
+
+@case("sqlite.update_item")
+def _(catalog):
+    storage = build_sqlite(catalog)
+    ids = [1 + (i * 7919) % catalog.size for i in range(catalog.queries)]
+    return lambda: [storage.update_item(item_id, "Updated", "x") for item_id in ids], len(ids)
+
+
+@case("sqlite.delete_item")
+def _(catalog):
+    storage = build_sqlite(catalog)
+    ids = list(range(1, catalog.queries + 1))
+    return lambda: [storage.delete_item(item_id) for item_id in ids], len(ids)
+
+
+def measure(spec, catalog, repeat, memory):
+    best = None
+    for _ in range(repeat):
+        run, ops = spec["setup"](catalog)
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    result = {"case": spec["name"], "size": catalog.size, "ops": ops, "seconds": best,
+              "ops_per_sec": ops / best if best else None}
+    if memory and spec["memory"]:
+        run, _ = spec["setup"](catalog)
+        tracemalloc.start()
+        kept = run()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+        result["retained_bytes"] = current
+        result["peak_bytes"] = peak
+    return result
+
+
+def compare(results, baseline, tolerance, min_delta=0.002):
+    """
+    Attach baseline ratios to results; return the regressed results.
+    Slowdowns smaller than min_delta seconds are timer noise and never count.
+    """
+    reference = {(r["case"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        base = reference.get((result["case"], result["size"]))
+        if not base or not base.get("seconds"):
+            continue
+        result["baseline_seconds"] = base["seconds"]
+        result["ratio"] = result["seconds"] / base["seconds"]
+        if result["ratio"] > 1 + tolerance and result["seconds"] - base["seconds"] > min_delta:
+            regressions.append(result)
+    return regressions
+
+
+def parse_sizes(text):
+    sizes = []
+    for token in text.split(","):
+        token = token.strip().lower()
+        sizes.append(SIZES[token] if token in SIZES else int(token))
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="1k,100k", help="comma list: 1k, 10k, 100k, 1m or a number")
+    parser.add_argument("--cases", default="", help="comma list of case name prefixes (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest counts")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--min-delta", type=float, default=0.002,
+                        help="ignore slowdowns smaller than this many seconds")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write these results as the new baseline")
+    parser.add_argument("--output", metavar="PATH", help="also write the JSON results to PATH")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args(argv)
+
+    prefixes = [p.strip() for p in args.cases.split(",") if p.strip()]
+    selected = [spec for spec in CASES if not prefixes or any(spec["name"].startswith(p) for p in prefixes)]
+    results = []
+    for size in parse_sizes(args.sizes):
+        catalog = Catalog(size)
+        for spec in selected:
+            if spec["max_size"] is not None and size > spec["max_size"]:
+                continue
+            result = measure(spec, catalog, args.repeat, not args.no_memory)
+            results.append(result)
+            if not args.json:
+                memory = f"{result['retained_bytes'] / 1e6:9.1f}MB" if "retained_bytes" in result else " " * 11
+                print(f"{result['case']:<28} {size:>9,} {result['seconds']:10.4f}s "
+                      f"{result['ops_per_sec']:>14,.0f} ops/s {memory}", flush=True)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+            "tolerance": args.tolerance,
+        },
+        "results": results,
+        "regressions": [r["case"] + f"@{r['size']}" for r in regressions],
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for r in regressions:
+            print(f"REGRESSION {r['case']} @ {r['size']:,}: {r['seconds']:.4f}s vs "
+                  f"baseline {r['baseline_seconds']:.4f}s ({r['ratio']:.2f}x)")
+        if os.path.exists(args.baseline) and not args.save_baseline and not regressions:
+            print("No regressions against baseline")
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,14 @@ class BookDictionary:
         }
         return True
 
+    def update_book(self, isbn, title, author):
+        book = self.books.get(isbn)
+        if book is None:
+            return False
+        book["title"] = title
+        book["author"] = author
+        return True
+
     def delete_book(self, isbn):
         return self.books.pop(isbn, None) is not None
 
@@ -1,3 +1,6 @@
+from .metrics import Metrics
+
+
 class TreeNode:
     """
     Node of the BST.
@@ -16,9 +19,12 @@ class BinarySearchTree:
     """
     In-memory index for fast CRUD via BST operations.
     """
-    def __init__(self, log_fn=None):
+    def __init__(self, log_fn=None, metrics=None):
         self.root = None
+        self.size = 0
         self.log = log_fn or (lambda msg: None)
+        # Disabled registry unless one is shared in; see data_struct.metrics
+        self.metrics = metrics if metrics is not None else Metrics()
 
     def insert(self, key, data):
         self.log(f"[Insert] key={key}")
@@ -26,6 +32,7 @@ class BinarySearchTree:
 
     def _insert(self, node, key, data):
         if node is None:
+            self.size += 1
             return TreeNode(key, data)
         if key < node.key:
             self.log(f"[Insert] go left at {node.key}")
@@ -38,21 +45,25 @@ class BinarySearchTree:
             node.data = data
         return node
 
+    def __len__(self):
+        return self.size
+
     def search(self, key):
         self.log(f"[Search] key={key}")
-        return self._search(self.root, key)
-
-    def _search(self, node, key):
-        if node is None:
-            return None
-        if key == node.key:
-            return node.data
-        if key < node.key:
-            self.log(f"[Search] left at {node.key}")
-            return self._search(node.left, key)
-        else:
-            self.log(f"[Search] right at {node.key}")
-            return self._search(node.right, key)
+        node, depth = self.root, 0
+        while node is not None:
+            depth += 1
+            if key == node.key:
+                break
+            if key < node.key:
+                self.log(f"[Search] left at {node.key}")
+                node = node.left
+            else:
+                self.log(f"[Search] right at {node.key}")
+                node = node.right
+        if self.metrics.enabled:
+            self.metrics.observe("bst_lookup_depth", depth)
+        return node.data if node is not None else None
 
     def delete(self, key):
         self.log(f"[Delete] key={key}")
@@ -66,10 +77,9 @@ class BinarySearchTree:
         elif key > node.key:
             node.right = self._delete(node.right, key)
         else:
-            if not node.left:
-                return node.right
-            if not node.right:
-                return node.left
+            if not node.left or not node.right:
+                self.size -= 1
+                return node.right if not node.left else node.left
             succ = self._min_node(node.right)
             node.key, node.data = succ.key, succ.data
             node.right = self._delete(node.right, succ.key)
@@ -1,5 +1,7 @@
+import time
 from datetime import datetime
-from typing import Optional, Tuple, List, Dict, Union
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 class ActivityNode:
     """
@@ -7,75 +9,93 @@ class ActivityNode:
     Attributes:
         action: Type of action performed (e.g., "ADD", "DELETE")
         details: Additional information about the action
-        timestamp: When the action occurred
-        next: Reference to the next node
+        created: Epoch seconds when the action occurred
+        payload: Optional data attached by the caller (e.g. undo operations)
+    The human-readable timestamp is only formatted when someone reads it,
+    so pushing an activity costs a single clock read.
     """
-    def __init__(self, action: str, details: str):
+    __slots__ = ("action", "details", "created", "payload")
+
+    def __init__(self, action: str, details: str, payload: Any = None,
+                 created: Optional[float] = None):
         self.action = action
         self.details = details
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.next: Optional[ActivityNode] = None
+        self.created = time.time() if created is None else created
+        self.payload = payload
+
+    @property
+    def timestamp(self) -> str:
+        """When the action occurred, formatted as YYYY-MM-DD HH:MM:SS."""
+        return datetime.fromtimestamp(self.created).strftime("%Y-%m-%d %H:%M:%S")
 
 class ActivityStack:
     """
     Stack implementation for tracking library activities.
     Features:
-        - Maximum size of 10 activities
+        - Bounded capacity (10 activities by default, configurable)
         - LIFO (Last In First Out) operation
-        - Automatic removal of oldest activity when full
+        - Automatic O(1) removal of oldest activity when full
+    Backed by a deque(maxlen=...) ring buffer: the right end is the top of
+    the stack and the deque discards from the left once capacity is reached.
     """
-    def __init__(self):
-        self.top: Optional[ActivityNode] = None
-        self.size: int = 0
-        self.max_size: int = 10
+    def __init__(self, max_size: int = 10):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size: int = max_size
+        self._items: Deque[ActivityNode] = deque(maxlen=max_size)
+
+    @property
+    def size(self) -> int:
+        return len(self._items)
+
+    @property
+    def top(self) -> Optional[ActivityNode]:
+        """The most recent activity node, or None when empty."""
+        return self._items[-1] if self._items else None
+
+    def __len__(self) -> int:
+        return len(self._items)
 
-    def push(self, action: str, details: str) -> str:
+    def __iter__(self) -> Iterator[ActivityNode]:
+        """Iterate from the most recent activity to the oldest."""
+        return reversed(self._items)
+
+    def push(self, action: str, details: str, payload: Any = None) -> str:
         """Add a new activity to the stack."""
-        new_node = ActivityNode(action, details)
-        new_node.next = self.top
-        self.top = new_node
-        self.size += 1
-        if self.size > self.max_size:
-            self._remove_last()
+        self._items.append(ActivityNode(action, details, payload))
         return f"Logged: {action}"
 
+    def push_node(self, node: ActivityNode) -> None:
+        """Put an existing node back on top, keeping its original timestamp."""
+        self._items.append(node)
+
     def pop(self) -> Optional[Tuple[str, str, str]]:
         """Remove and return the most recent activity."""
-        if not self.top:
+        if not self._items:
             return None
-        popped = self.top
-        self.top = self.top.next
-        self.size -= 1
+        popped = self._items.pop()
         return (popped.action, popped.details, popped.timestamp)
 
+    def pop_node(self) -> Optional[ActivityNode]:
+        """Remove and return the most recent activity node, payload included."""
+        return self._items.pop() if self._items else None
+
     def peek(self) -> Optional[Tuple[str, str]]:
         """View the most recent activity without removing it."""
-        return (self.top.action, self.top.details) if self.top else None
-
-    def _remove_last(self) -> None:
-        """Remove the oldest activity when stack is full."""
-        if not self.top or not self.top.next:
-            return
-        current = self.top
-        while current.next and current.next.next:
-            current = current.next
-        current.next = None
-        self.size -= 1
+        top = self.top
+        return (top.action, top.details) if top else None
 
     def get_all_actions(self) -> List[Dict[str, str]]:
         """Return list of all activities in the stack."""
-        actions = []
-        current = self.top
-        while current:
-            actions.append({
-                "action": current.action,
-                "details": current.details,
-                "timestamp": current.timestamp
-            })
-            current = current.next
-        return actions
+        return [
+            {
+                "action": node.action,
+                "details": node.details,
+                "timestamp": node.timestamp
+            }
+            for node in reversed(self._items)
+        ]
 
     def clear_stack(self) -> None:
         """Remove all activities from the stack."""
-        self.top = None
-        self.size = 0
+        self._items.clear()
@@ -0,0 +1,187 @@
+import numpy as np
+
+# Codes of the status column
+AVAILABLE, CHECKED_OUT = 0, 1
+STATUS_NAMES = ("Available", "Checked Out")
+
+# Rows allocated when the columns first have to grow
+_MIN_CAPACITY = 1024
+
+
+class CatalogAnalytics:
+    """
+    Columnar snapshot of the catalog for reports, one row per title in
+    NumPy arrays. Author and status are dictionary-encoded: each row holds
+    a small integer code into a list of distinct values, so a group-by is a
+    single np.bincount over the codes instead of a walk over book objects.
+    Rows of deleted titles stay where they are, masked out by the live
+    column, until they outnumber the live ones.
+    Columns:
+        author: int32 code into authors
+        status: uint8 code into STATUS_NAMES
+        copies, available: int32 copy counts
+        live: bool, False once the title is deleted
+    """
+    def __init__(self):
+        self.authors = []           # code -> author
+        self._author_code = {}      # author -> code
+        self._row = {}              # isbn -> row
+        self._size = 0
+        self._dead = 0
+        self._columns(0)
+
+    def _columns(self, capacity):
+        self._author = np.zeros(capacity, np.int32)
+        self._status = np.zeros(capacity, np.uint8)
+        self._copies = np.zeros(capacity, np.int32)
+        self._available = np.zeros(capacity, np.int32)
+        self._live = np.zeros(capacity, bool)
+
+    @classmethod
+    def build(cls, books, circulation):
+        """
+        Snapshot from (isbn, author) pairs, with copy counts from the
+        checkout engine's books (LibrarySystem.books). Titles it does not
+        know are counted as one available copy.
+        """
+        analytics = cls()
+        authors = dict(books)                           # isbn -> author
+        analytics._row = dict(zip(authors, range(len(authors))))
+        code = analytics._author_code
+        codes = [code.setdefault(author, len(code)) for author in authors.values()]
+        state = [circulation.get(isbn) for isbn in authors]
+        available = [1 if book is None else book['available_copies'] for book in state]
+        copies = [1 if book is None else book['total_copies'] for book in state]
+        # Codes were handed out in insertion order
+        analytics.authors = list(code)
+        analytics._author = np.array(codes, np.int32)
+        analytics._copies = np.array(copies, np.int32)
+        analytics._available = np.array(available, np.int32)
+        analytics._status = np.where(analytics._available > 0, AVAILABLE, CHECKED_OUT).astype(np.uint8)
+        analytics._live = np.ones(len(codes), bool)
+        analytics._size = len(codes)
+        return analytics
+
+    def __len__(self):
+        return self._size - self._dead
+
+    def __contains__(self, isbn):
+        return isbn in self._row
+
+    # -- Keeping the snapshot current ---------------------------------------
+
+    def add(self, isbn, author, copies=1, available=None):
+        """Add a title. For one already in the snapshot only the author changes."""
+        code = self._author_code.get(author)
+        if code is None:
+            code = self._author_code[author] = len(self.authors)
+            self.authors.append(author)
+        row = self._row.get(isbn)
+        if row is not None:
+            self._author[row] = code
+            return
+        if self._size == len(self._author):
+            self._grow()
+        row = self._row[isbn] = self._size
+        self._size += 1
+        self._author[row] = code
+        self._live[row] = True
+        self._copies[row] = copies
+        self._set_available(row, copies if available is None else available)
+
+    def remove(self, isbn):
+        row = self._row.pop(isbn, None)
+        if row is None:
+            return False
+        self._live[row] = False
+        self._copies[row] = self._available[row] = 0
+        self._dead += 1
+        if self._dead > len(self):
+            self._compact()
+        return True
+
+    def apply(self, results):
+        """
+        Take the copy counts from a batch of circulation events
+        (CirculationResult), O(1) per event.
+        """
+        for result in results:
+            row = self._row.get(result.book_id)
+            if row is None:
+                continue
+            if result.total_copies is not None:
+                self._copies[row] = result.total_copies
+            if result.available_copies is not None:
+                self._set_available(row, result.available_copies)
+
+    def _set_available(self, row, available):
+        self._available[row] = available
+        self._status[row] = AVAILABLE if available > 0 else CHECKED_OUT
+
+    def _grow(self):
+        capacity = max(_MIN_CAPACITY, 2 * len(self._author))
+        old = (self._author, self._status, self._copies, self._available, self._live)
+        self._columns(capacity)
+        for new, column in zip((self._author, self._status, self._copies, self._available, self._live), old):
+            new[:len(column)] = column
+
+    def _compact(self):
+        live = self._live[:self._size]
+        keep = np.flatnonzero(live)
+        for name in ("_author", "_status", "_copies", "_available", "_live"):
+            setattr(self, name, getattr(self, name)[keep])
+        # Rows are renumbered in the same order, so a row's new number is the live rows before it
+        renumber = np.cumsum(live) - 1
+        self._row = {isbn: int(renumber[row]) for isbn, row in self._row.items()}
+        self._size, self._dead = len(keep), 0
+
+    # -- Reports --------------------------------------------------------------
+
+    def _column(self, name):
+        return getattr(self, "_" + name)[:self._size]
+
+    def count_by(self, column, n=None):
+        """
+        [(value, titles)] for the "author" or "status" column, most titles
+        first; only the first n groups if n is given.
+        """
+        names = {"author": self.authors, "status": STATUS_NAMES}[column]
+        counts = np.bincount(self._column(column), weights=self._column("live"), minlength=len(names))
+        order = np.argsort(-counts, kind="stable")[:n]
+        order = order[counts[order] > 0]
+        return [(names[code], int(counts[code])) for code in order.tolist()]
+
+    def availability(self):
+        """Copy and title totals for the whole catalog."""
+        copies = int(self._column("copies").sum())
+        available = int(np.clip(self._column("available"), 0, None).sum())
+        titles_available = int(np.count_nonzero(self._column("live") & (self._column("status") == AVAILABLE)))
+        return {
+            "titles": len(self),
+            "titles_available": titles_available,
+            "copies": copies,
+            "available": available,
+            "checked_out": copies - available,
+            "ratio": available / copies if copies else 0.0,
+        }
+
+    def top_authors(self, n=10):
+        """
+        [(author, titles, copies, available)] for the n authors with the most
+        titles, ties going to the author catalogued first. np.argpartition
+        picks them without sorting every author.
+        """
+        codes, live = self._column("author"), self._column("live")
+        titles = np.bincount(codes, weights=live, minlength=len(self.authors)).astype(np.int64)
+        n = min(n, int(np.count_nonzero(titles)))
+        if n <= 0:
+            return []
+        # One distinct key per author: most titles first, then lowest code
+        key = -titles * len(titles) + np.arange(len(titles))
+        top = np.argpartition(key, n - 1)[:n] if n < len(key) else np.arange(len(key))
+        top = top[np.argsort(key[top])]
+        copies = np.bincount(codes, weights=self._column("copies"), minlength=len(self.authors))
+        available = np.bincount(codes, weights=np.clip(self._column("available"), 0, None),
+                                minlength=len(self.authors))
+        return [(self.authors[code], int(titles[code]), int(copies[code]), int(available[code]))
+                for code in top.tolist()]
@@ -0,0 +1,214 @@
+import heapq
+import re
+import unicodedata
+from array import array
+from collections import Counter
+from itertools import chain
+from math import ceil
+
+_WORD = re.compile(r"\w+")
+
+# Candidates ranked by trigram overlap that go on to an edit distance check, per result wanted
+RERANK_FACTOR = 8
+
+
+def normalize(text):
+    """Lower case, accents stripped and words separated by single spaces."""
+    text = text.lower()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(_WORD.findall(text))
+
+
+def trigrams(text):
+    """Distinct 3-grams of normalized text, padded so short words still have a few."""
+    padded = f"  {text}  "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def substring_distance(query, text):
+    """
+    Fewest single-character edits that turn query into some substring of
+    text, so a partial or misspelt title still scores well against the full
+    one ("lord of the rngs" is 1 from "the lord of the rings").
+    Myers' bit-parallel algorithm: one column of the edit distance table is
+    a pair of bit vectors over the query, updated with a few integer
+    operations per character of text instead of one cell at a time.
+    """
+    m = len(query)
+    if not m:
+        return 0
+    peq = {}
+    for i, ch in enumerate(query):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv = mask, 0
+    score = best = m
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # Shifting in 0 rather than 1 lets a match start anywhere in text
+        ph = (ph << 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        if score < best:
+            best = score
+    return best
+
+
+class FuzzyIndex:
+    """
+    Typo-tolerant lookup over one text field, backed by a trigram index.
+    Each gram maps to an ascending array of document numbers. A query only
+    reads the postings of its own grams: a match must share a minimum
+    number of grams with the query, so it has to appear in one of the
+    rarest few postings, and only those candidates are scored. Edit
+    distance is computed for the best RERANK_FACTOR * k of them, never for
+    the whole catalog.
+    Removing a key leaves a tombstone; the postings are compacted once
+    tombstones outnumber live documents.
+    """
+    def __init__(self):
+        self._docs = []         # doc number -> (key, normalized text, gram count), None once removed
+        self._doc_of = {}       # key -> doc number
+        self._postings = {}     # gram -> array of doc numbers
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._doc_of)
+
+    def __contains__(self, key):
+        return key in self._doc_of
+
+    def bulk_load(self, items):
+        """Index (key, text) pairs into an empty index, building each posting as a list first."""
+        grouped = {}
+        docs, doc_of = self._docs, self._doc_of
+        for key, text in items:
+            text = normalize(text)
+            grams = trigrams(text)
+            doc = len(docs)
+            docs.append((key, text, len(grams)))
+            doc_of[key] = doc
+            for gram in grams:
+                posting = grouped.get(gram)
+                if posting is None:
+                    grouped[gram] = [doc]
+                else:
+                    posting.append(doc)
+        self._postings = {gram: array("I", posting) for gram, posting in grouped.items()}
+
+    def add(self, key, text):
+        """Index key under text, replacing whatever it was indexed under before."""
+        self.remove(key)
+        text = normalize(text)
+        grams = trigrams(text)
+        doc = len(self._docs)
+        self._docs.append((key, text, len(grams)))
+        self._doc_of[key] = doc
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = array("I", (doc,))
+            else:
+                posting.append(doc)
+
+    def remove(self, key):
+        doc = self._doc_of.pop(key, None)
+        if doc is None:
+            return
+        self._docs[doc] = None
+        self._dead += 1
+        if self._dead > len(self._doc_of):
+            self._compact()
+
+    def search(self, query, k=5, min_overlap=0.3, max_distance=None):
+        """
+        Up to k (key, distance, similarity) triples, closest first.
+        A candidate must share at least min_overlap of the query's trigrams.
+        distance is substring_distance(query, text) and may not exceed
+        max_distance, by default a third of the query's length plus one.
+        similarity is the Dice coefficient of the two trigram sets and
+        breaks ties between equally distant matches.
+        """
+        query = normalize(query)
+        if not query or k <= 0:
+            return []
+        if max_distance is None:
+            max_distance = len(query) // 3 + 1
+        grams = trigrams(query)
+        need = max(1, ceil(len(grams) * min_overlap))
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+
+        # A document sharing `need` grams must be in one of the rarest len - need + 1
+        # postings; the commoner ones only add to the counts of those candidates
+        split = len(postings) - need + 1
+        shared = Counter(chain.from_iterable(postings[:split]))
+        common = postings[split:]
+        if len(shared) > sum(map(len, common)) // 4:
+            # Candidates are not much rarer than the common postings: count those outright
+            shared.update(chain.from_iterable(common))
+        else:
+            pool = set(shared)
+            for posting in common:
+                for doc in pool.intersection(posting):
+                    shared[doc] += 1
+        docs = self._docs
+        scored = [(2 * count / (len(grams) + docs[doc][2]), doc)
+                  for doc, count in shared.items() if count >= need and docs[doc] is not None]
+
+        best = []
+        for similarity, doc in heapq.nlargest(RERANK_FACTOR * k, scored):
+            key, text, _ = docs[doc]
+            distance = substring_distance(query, text)
+            if distance <= max_distance:
+                best.append((distance, -similarity, len(text), text, key))
+        best.sort()
+        return [(key, distance, -negated) for distance, negated, _, _, key in best[:k]]
+
+    def _compact(self):
+        live = [entry for entry in self._docs if entry is not None]
+        self._docs, self._doc_of, self._dead = [], {}, 0
+        # Texts are already normalized, so normalizing them again is a no-op
+        self.bulk_load((key, text) for key, text, _ in live)
+
+
+class FuzzyCatalog:
+    """
+    FuzzyIndex per search field (Title, Author), keyed by ISBN. Like
+    CatalogSearchIndex, add() replaces and remove() ignores unknown ISBNs.
+    """
+    FIELDS = ("Title", "Author")
+
+    def __init__(self):
+        self.indexes = {field: FuzzyIndex() for field in self.FIELDS}
+
+    def __len__(self):
+        return len(self.indexes["Title"])
+
+    def bulk_load(self, rows):
+        """Index (isbn, title, author) rows."""
+        for isbn, title, author in rows:
+            self.add(isbn, title, author)
+
+    def add(self, isbn, title, author):
+        self.indexes["Title"].add(isbn, title)
+        self.indexes["Author"].add(isbn, author)
+
+    def remove(self, isbn):
+        for index in self.indexes.values():
+            index.remove(isbn)
+
+    def search(self, field, query, k=5, **kwargs):
+        return self.indexes[field].search(query, k, **kwargs)
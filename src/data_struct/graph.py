@@ -1,6 +1,12 @@
+from collections import deque
+
+from .metrics import Metrics
+
+
 class Graphs:
-    def __init__(self):
+    def __init__(self, metrics=None):
         self.graph = {}
+        self.metrics = metrics if metrics is not None else Metrics()
 
     def add_book_node(self, title):
         """Add a new book node to the graph"""
@@ -19,27 +25,119 @@ class Graphs:
             return True
         return False
 
-    def get_recommendations(self, title):
-        """Get book recommendations using BFS traversal"""
+    def add_edges(self, pairs):
+        """
+        Bulk-connect many (book1, book2) pairs, skipping unknown books and
+        existing edges. Returns the pairs that were actually added.
+        """
+        neighbours = {}
+        added = []
+        for book1, book2 in pairs:
+            if book1 == book2 or book1 not in self.graph or book2 not in self.graph:
+                continue
+            seen1 = neighbours.get(book1)
+            if seen1 is None:
+                seen1 = neighbours[book1] = set(self.graph[book1])
+            if book2 in seen1:
+                continue
+            seen2 = neighbours.get(book2)
+            if seen2 is None:
+                seen2 = neighbours[book2] = set(self.graph[book2])
+            seen1.add(book2)
+            seen2.add(book1)
+            self.graph[book1].append(book2)
+            self.graph[book2].append(book1)
+            added.append((book1, book2))
+        return added
+
+    def remove_edges(self, pairs):
+        """Bulk-disconnect (book1, book2) pairs in both directions"""
+        doomed = {}
+        for book1, book2 in pairs:
+            doomed.setdefault(book1, set()).add(book2)
+            doomed.setdefault(book2, set()).add(book1)
+        for book, others in doomed.items():
+            if book in self.graph:
+                self.graph[book] = [b for b in self.graph[book] if b not in others]
+
+    def rename_book(self, old_title, new_title):
+        """
+        Rename a book node while keeping its edges. If a node with the new
+        title already exists the two are merged, keeping the edges of both;
+        node_edges taken beforehand lets split_book undo that.
+        """
+        if old_title not in self.graph or old_title == new_title:
+            return False
+        neighbours = self.graph.pop(old_title)
+        merged = self.graph.setdefault(new_title, [])
+        for other in neighbours:
+            if other == new_title:
+                # The two books were connected; a node has no edge to itself
+                self.graph[new_title] = merged = [b for b in merged if b != old_title]
+                continue
+            if other not in merged:
+                merged.append(other)
+            edges = self.graph[other]
+            if new_title in edges:
+                edges.remove(old_title)
+            else:
+                edges[edges.index(old_title)] = new_title
+        return True
+
+    def node_edges(self, titles):
+        """{title: neighbours} for those of titles in the graph, to hand to split_book later"""
+        return {title: list(self.graph[title]) for title in titles if title in self.graph}
+
+    def split_book(self, merged_title, nodes):
+        """
+        Reverse a merging rename_book: replace the merged node with the nodes
+        as node_edges returned them before the merge. Edges the merged node
+        gained since then stay with merged_title.
+        """
+        merged = self.graph.pop(merged_title, [])
+        for other in merged:
+            if other in self.graph:
+                self.graph[other] = [b for b in self.graph[other] if b != merged_title]
+        known = {b for neighbours in nodes.values() for b in neighbours}
+        for title in nodes:
+            self.graph[title] = []
+        for title, neighbours in nodes.items():
+            for other in neighbours:
+                self._link(title, other)
+        if merged_title in nodes:
+            for other in merged:
+                if other not in known and other not in nodes:
+                    self._link(merged_title, other)
+
+    def _link(self, book1, book2):
+        # Like add_edge, but keeps an existing neighbour order
+        if book2 not in self.graph or book1 == book2:
+            return
+        if book2 not in self.graph[book1]:
+            self.graph[book1].append(book2)
+        if book1 not in self.graph[book2]:
+            self.graph[book2].append(book1)
+
+    def get_recommendations(self, title, limit=5):
+        """Get book recommendations using BFS traversal (stops once limit books are found)"""
         if title not in self.graph:
             return []
 
-        visited = set()
+        visited = {title}
         recommendations = []
-        queue = [title]
-
-        while queue:
-            current_book = queue.pop(0)
-            if current_book not in visited:
-                visited.add(current_book)
-                recommendations.append(current_book)
-                for neighbor in self.graph[current_book]:
-                    if neighbor not in visited:
-                        queue.append(neighbor)
-
-        # Remove the original book and return top 5 recommendations
-        recommendations.remove(title)
-        return recommendations[:5]
+        queue = deque([title])
+
+        while queue and len(recommendations) < limit:
+            current_book = queue.popleft()
+            for neighbor in self.graph[current_book]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    recommendations.append(neighbor)
+                    queue.append(neighbor)
+                    if len(recommendations) >= limit:
+                        break
+        self.metrics.observe("recommendation_nodes_visited", len(visited))
+        return recommendations
 
     def remove_book(self, title):
         """Remove a book and all its edges from the graph"""
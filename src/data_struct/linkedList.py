@@ -47,6 +47,16 @@ class BookLinkedList:
             current = current.next
         return "Book not found"
 
+    def update_book(self, isbn, title, author):
+        current = self.head
+        while current:
+            if str(current.isbn) == str(isbn).strip():
+                current.title = title
+                current.author = author
+                return f"Updated: {title}"
+            current = current.next
+        return "Book not found"
+
     def search_by_title(self, title):
         current = self.head
         while current:
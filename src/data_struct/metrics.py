@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+# Upper bounds (seconds) for latency histograms, roughly 100us to 10s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds for count-like histograms (tree depth, nodes visited)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536)
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Fixed-bucket histogram: O(log buckets) per observation, constant memory."""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)     # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Estimate the q-quantile by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics, name, labels):
+        self.metrics, self.name, self.labels = metrics, name, labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class Metrics:
+    """
+    In-process registry of counters, gauges and histograms.
+    Every metric is keyed by name plus optional labels, e.g.
+    observe("search_seconds", 0.002, strategy="bst"). While enabled is False
+    each call returns after a single attribute check and timer() hands back
+    a shared no-op context manager, so instrumented hot paths cost next to
+    nothing. Callers on very hot paths may test metrics.enabled themselves
+    to skip computing the value as well.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._help = {}
+        self._buckets = {}
+
+    def describe(self, name, help_text, buckets=None):
+        """Attach help text (and histogram buckets) to a metric name."""
+        self._help[name] = help_text
+        if buckets is not None:
+            self._buckets[name] = tuple(buckets)
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._buckets.get(name, LATENCY_BUCKETS))
+            histogram.observe(value)
+
+    def timer(self, name, **labels):
+        """Context manager that observes the elapsed seconds of its block."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def rows(self):
+        """
+        Flat summary for display, sorted by name then labels:
+        (name, labels text, kind, count, value or mean, p50, p95, max).
+        """
+        with self._lock:
+            counters = list(self._counters.items())
+            gauges = list(self._gauges.items())
+            histograms = [(key, h.count, h.sum, h.quantile(0.5), h.quantile(0.95), h.max)
+                          for key, h in self._histograms.items()]
+        rows = [(name, _label_text(labels), "counter", None, value, None, None, None)
+                for (name, labels), value in counters]
+        rows += [(name, _label_text(labels), "gauge", None, value, None, None, None)
+                 for (name, labels), value in gauges]
+        rows += [(name, _label_text(labels), "histogram", count, total / count if count else None, p50, p95, peak)
+                 for (name, labels), count, total, p50, p95, peak in histograms]
+        return sorted(rows, key=lambda row: (row[0], row[1]))
+
+    def to_prometheus(self):
+        """Everything in the Prometheus text exposition format."""
+        with self._lock:
+            families = {}
+            for (name, labels), value in self._counters.items():
+                families.setdefault((name, "counter"), []).append((labels, value))
+            for (name, labels), value in self._gauges.items():
+                families.setdefault((name, "gauge"), []).append((labels, value))
+            for (name, labels), h in self._histograms.items():
+                families.setdefault((name, "histogram"), []).append(
+                    (labels, (h.buckets, list(h.counts), h.count, h.sum)))
+
+        lines = []
+        for (name, kind), series in sorted(families.items()):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series, key=lambda item: item[0]):
+                if kind != "histogram":
+                    lines.append(f"{name}{_prom_labels(labels)} {_prom_number(value)}")
+                    continue
+                buckets, counts, count, total = value
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = labels + (("le", _prom_number(bound)),)
+                    lines.append(f"{name}_bucket{_prom_labels(le)} {cumulative}")
+                lines.append(f"{name}_sum{_prom_labels(labels)} {_prom_number(total)}")
+                lines.append(f"{name}_count{_prom_labels(labels)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_prometheus(self, path):
+        """
+        Write to_prometheus() to path atomically, so a collector reading the
+        file (e.g. node_exporter's textfile collector) never sees half of it.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _label_text(labels):
+    return ", ".join(f"{key}={value}" for key, value in labels)
+
+
+def _prom_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+               for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+def _prom_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
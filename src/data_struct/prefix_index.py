@@ -0,0 +1,317 @@
+import queue
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+_WORD = re.compile(r"\w+")
+
+# Checked every this many candidates so a stale query can stop early
+CANCEL_CHECK_EVERY = 4096
+
+
+def tokenize(text):
+    """Lower-case words of text; the unit a query word has to be a prefix of."""
+    return _WORD.findall(text.lower())
+
+
+class PrefixIndex:
+    """
+    Word-prefix index over one text field.
+    Every (word, id) pair lives in two parallel sorted lists, so all ids with
+    a word starting with a prefix form one contiguous range found by two
+    bisects. text_of(id) returns the indexed text; the index itself keeps no
+    copy of it. Words are interned, so a word used by many books is stored once.
+    """
+    def __init__(self, text_of):
+        self.text_of = text_of
+        self.narrowed = False
+        self._words = []
+        self._ids = []
+
+    def __len__(self):
+        return len(self._words)
+
+    def bulk_load(self, items):
+        """
+        Build from (id, text) pairs; the index must be empty. Ids are grouped
+        per word first, so only the vocabulary and each word's ids get sorted.
+        """
+        postings = {}
+        for book_id, text in items:
+            for word in set(tokenize(text)):
+                posting = postings.get(word)
+                if posting is None:
+                    postings[sys.intern(word)] = [book_id]
+                else:
+                    posting.append(book_id)
+        words, ids = [], []
+        for word in sorted(postings):
+            posting = postings.pop(word)
+            posting.sort()
+            words.extend([word] * len(posting))
+            ids.extend(posting)
+        self._words, self._ids = words, ids
+
+    def add(self, book_id, text):
+        for word in set(tokenize(text)):
+            lo, hi = self._exact(word)
+            i = bisect_left(self._ids, book_id, lo, hi)
+            if i < hi and self._ids[i] == book_id:
+                continue
+            self._words.insert(i, sys.intern(word))
+            self._ids.insert(i, book_id)
+
+    def remove(self, book_id, text):
+        for word in set(tokenize(text)):
+            lo, hi = self._exact(word)
+            i = bisect_left(self._ids, book_id, lo, hi)
+            if i < hi and self._ids[i] == book_id:
+                del self._words[i]
+                del self._ids[i]
+
+    def prefix_range(self, prefix):
+        """(lo, hi) positions of every word starting with prefix."""
+        lo = bisect_left(self._words, prefix)
+        return lo, bisect_left(self._words, prefix + "\U0010ffff", lo)
+
+    def search(self, query, candidates=None, cancelled=None):
+        """
+        Ids whose text has, for every word of query, a word starting with it,
+        sorted by text. With candidates (the sorted result of a query this one
+        extends) the answer is narrowed from them when that is cheaper than a
+        fresh index lookup (narrowed records which was done). Returns None
+        if cancelled() became true.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        ranges = [(self.prefix_range(word), word) for word in words]
+        (lo, hi), first = min(ranges, key=lambda item: item[0][1] - item[0][0])
+
+        self.narrowed = candidates is not None and len(candidates) <= hi - lo
+        if self.narrowed:
+            return self._filter(candidates, words, cancelled)
+
+        ids = list(dict.fromkeys(self._ids[lo:hi]))
+        rest = [word for word in words if word != first]
+        if rest:
+            ids = self._filter(ids, rest, cancelled)
+            if ids is None:
+                return None
+        elif cancelled is not None and cancelled():
+            return None
+        text_of = self.text_of
+        ids.sort(key=lambda book_id: (text_of(book_id).lower(), book_id))
+        return ids
+
+    def _filter(self, ids, words, cancelled):
+        text_of = self.text_of
+        kept = []
+        for n, book_id in enumerate(ids):
+            if cancelled is not None and n % CANCEL_CHECK_EVERY == 0 and cancelled():
+                return None
+            tokens = tokenize(text_of(book_id))
+            if all(any(token.startswith(word) for token in tokens) for word in words):
+                kept.append(book_id)
+        return kept
+
+    def _exact(self, word):
+        # Words never contain NUL, so word + "\0" sorts right after every copy of word
+        lo = bisect_left(self._words, word)
+        return lo, bisect_left(self._words, word + "\0", lo)
+
+
+class KeyPrefixIndex:
+    """
+    Prefix search over the ids themselves (ISBNs): a single sorted list, so
+    a query is two bisects and the matches are already in order.
+    """
+    def __init__(self):
+        self.narrowed = False
+        self._keys = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def bulk_load(self, keys):
+        self._keys = sorted(keys)
+
+    def add(self, key):
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            self._keys.insert(i, key)
+
+    def remove(self, key):
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def search(self, query, candidates=None, cancelled=None):
+        prefix = query.strip()
+        if not prefix:
+            return []
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        self.narrowed = candidates is not None and len(candidates) <= hi - lo
+        if self.narrowed:
+            return [key for key in candidates if key.startswith(prefix)]
+        return self._keys[lo:hi]
+
+
+class CatalogSearchIndex:
+    """
+    Prefix indexes for the Title, Author and ISBN search fields, keyed by
+    ISBN. add() replaces an existing book and remove() ignores unknown ones,
+    so replaying a write the index has already seen is harmless.
+    version changes on every write; a result computed at one version can
+    only be narrowed into the next query while the version is unchanged.
+    """
+    FIELDS = ("Title", "Author", "ISBN")
+
+    def __init__(self):
+        self.rows = {}      # isbn -> (title, author)
+        self.version = 0
+        self.indexes = {
+            "Title": PrefixIndex(lambda isbn: self.rows[isbn][0]),
+            "Author": PrefixIndex(lambda isbn: self.rows[isbn][1]),
+            "ISBN": KeyPrefixIndex(),
+        }
+
+    def __len__(self):
+        return len(self.rows)
+
+    def bulk_load(self, rows):
+        """Index (isbn, title, author) rows into an empty index."""
+        for isbn, title, author in rows:
+            self.rows[isbn] = (title, author)
+        self.indexes["Title"].bulk_load((isbn, title) for isbn, (title, _) in self.rows.items())
+        self.indexes["Author"].bulk_load((isbn, author) for isbn, (_, author) in self.rows.items())
+        self.indexes["ISBN"].bulk_load(self.rows)
+        self.version += 1
+
+    def add(self, isbn, title, author):
+        self.remove(isbn)
+        self.rows[isbn] = (title, author)
+        self.indexes["Title"].add(isbn, title)
+        self.indexes["Author"].add(isbn, author)
+        self.indexes["ISBN"].add(isbn)
+        self.version += 1
+
+    def remove(self, isbn):
+        row = self.rows.get(isbn)
+        if row is None:
+            return
+        title, author = row
+        self.indexes["Title"].remove(isbn, title)
+        self.indexes["Author"].remove(isbn, author)
+        self.indexes["ISBN"].remove(isbn)
+        del self.rows[isbn]
+        self.version += 1
+
+    def search(self, field, query, candidates=None, cancelled=None):
+        return self.indexes[field].search(query, candidates, cancelled)
+
+
+class SearchWorker:
+    """
+    Owns a CatalogSearchIndex on one background thread.
+    Building the index, applying catalog writes and answering queries all go
+    through one FIFO, so the index needs no lock and sees writes in the order
+    they were made. Every submit() supersedes the queries before it: a stale
+    query is skipped if it has not started and stops early if it has.
+    A query that extends the previous one (same field, text starting with
+    the previous text, no write in between) is narrowed from its result.
+    Results arrive on the results queue as
+        ("ready", books indexed, seconds)
+        ("result", seq, field, text, ids, seconds, narrowed)
+        ("error", exception)
+    """
+    def __init__(self, load_rows):
+        self.load_rows = load_rows      # called on the worker: (isbn, title, author) rows
+        self.results = queue.Queue()
+        self.started = False
+        self._tasks = queue.Queue()
+        self._latest = 0
+        self._thread = None
+
+    def start(self):
+        """Start the thread and build the index from load_rows() (once)."""
+        if self._thread is None:
+            self.started = True
+            self._thread = threading.Thread(target=self._run, name="live-search", daemon=True)
+            self._thread.start()
+            self._tasks.put(("build",))
+
+    def rebuild(self):
+        if self.started:
+            self._tasks.put(("build",))
+
+    def add(self, isbn, title, author):
+        """Index a new or changed book (ignored until start(): the build will read it)."""
+        if self.started:
+            self._tasks.put(("add", isbn, title, author))
+
+    def remove(self, isbn):
+        if self.started:
+            self._tasks.put(("remove", isbn))
+
+    def submit(self, field, text):
+        """Queue a query and return its sequence number."""
+        self._latest += 1
+        self._tasks.put(("query", self._latest, field, text))
+        return self._latest
+
+    def cancel(self):
+        """Abandon every query submitted so far."""
+        self._latest += 1
+
+    @property
+    def latest(self):
+        return self._latest
+
+    def close(self):
+        if self._thread is not None:
+            self._tasks.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        index = None
+        last = None     # (field, text, index version, ids) of the last answered query
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            try:
+                kind = task[0]
+                if kind == "build":
+                    started = time.perf_counter()
+                    index = CatalogSearchIndex()
+                    index.bulk_load(self.load_rows())
+                    last = None
+                    self.results.put(("ready", len(index), time.perf_counter() - started))
+                elif kind == "add":
+                    index.add(*task[1:])
+                elif kind == "remove":
+                    index.remove(task[1])
+                elif kind == "query":
+                    last = self._answer(index, last, *task[1:]) or last
+            except Exception as e:
+                self.results.put(("error", e))
+
+    def _answer(self, index, last, seq, field, text):
+        if seq != self._latest:
+            return None         # superseded before it started
+        started = time.perf_counter()
+        key = text.strip().lower()
+        candidates = None
+        if last is not None and last[0] == field and last[2] == index.version and key.startswith(last[1]):
+            candidates = last[3]
+        ids = index.search(field, text, candidates, cancelled=lambda: seq != self._latest)
+        if ids is None:
+            return None
+        self.results.put(("result", seq, field, text, ids, time.perf_counter() - started,
+                          index.indexes[field].narrowed))
+        return field, key, index.version, ids
@@ -0,0 +1,111 @@
+import sys
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def approximate_size(value):
+    """
+    Bytes held by value, following tuples, lists, sets and dicts down to
+    their str/number leaves. Shared objects are counted once.
+    """
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (tuple, list, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class QueryCache:
+    """
+    LRU cache for query results, bounded by memory rather than entry count.
+    Every entry is stamped with the generation it was computed in; bump()
+    starts a new generation in O(1), after which older entries are never
+    returned and are dropped as they are met or pushed out by the LRU order.
+    A result computed elsewhere (e.g. on a worker thread) is passed the
+    generation it started from, so one that raced with a write is not stored.
+    Keys are tuples such as ("bst", "Title", "tolkien") or ("recommend", title).
+    """
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()      # key -> (generation, size, value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def bump(self):
+        """Invalidate every cached result (call after any catalog write)."""
+        with self._lock:
+            self.generation += 1
+            return self.generation
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] == self.generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry is not _MISSING:
+                self._discard(key)
+            self.misses += 1
+            return default
+
+    def put(self, key, value, generation=None):
+        """
+        Store value under key. Returns False (and stores nothing) if value was
+        computed in an older generation or is larger than the whole cache.
+        """
+        size = approximate_size(key) + approximate_size(value)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            if size > self.max_bytes:
+                return False
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (self.generation, size, value)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+            return True
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, calling compute() and caching it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            generation = self.generation
+            value = compute()
+            self.put(key, value, generation)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                "generation": self.generation, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def _discard(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
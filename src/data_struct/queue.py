@@ -1,67 +1,650 @@
-from collections import deque
+import heapq
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+# Priority classes, served lowest value first
+PRIORITY_STAFF = 0
+PRIORITY_COURSE_RESERVE = 1
+PRIORITY_PATRON = 2
+
+
+class Waitlist:
+    """
+    Reservation queue served by priority class, then arrival order.
+    Backed by a binary heap of [priority, ticket, user, expires_at] entries
+    plus a dict of each user's live entry, giving O(log n) promotion and O(1)
+    membership. Cancelled and expired holds are not searched for: they stay
+    in the heap and are dropped lazily when they surface at the top.
+    """
+    def __init__(self, users=()):
+        self._heap = []
+        self._waiting = {}      # user -> their live heap entry
+        self._tickets = 0
+        self._front_tickets = 0
+        for user in users:
+            self.append(user)
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Bulk-build from (priority, ticket, user, expires_at) tuples in O(n)."""
+        waitlist = cls()
+        waitlist._heap = [list(entry) for entry in entries]
+        heapq.heapify(waitlist._heap)
+        for entry in waitlist._heap:
+            waitlist._waiting[entry[2]] = entry
+        tickets = [entry[1] for entry in waitlist._heap]
+        waitlist._tickets = max(tickets, default=0)
+        waitlist._front_tickets = min(min(tickets, default=0), 0)
+        return waitlist
+
+    def _is_live(self, entry, now):
+        if self._waiting.get(entry[2]) is not entry:
+            return False
+        if entry[3] is not None and entry[3] <= now:
+            # Expired: forget it now that we have noticed
+            del self._waiting[entry[2]]
+            return False
+        return True
+
+    def _prune_top(self, now=None):
+        now = time.time() if now is None else now
+        while self._heap and not self._is_live(self._heap[0], now):
+            heapq.heappop(self._heap)
+
+    def _compact(self):
+        # Dead entries pile up when many holds are cancelled; rebuild occasionally
+        if len(self._heap) > 2 * len(self._waiting) + 32:
+            self._heap = [entry for entry in self._heap if self._waiting.get(entry[2]) is entry]
+            heapq.heapify(self._heap)
+
+    def append(self, user, priority=PRIORITY_PATRON, expires_at=None):
+        if user in self:
+            raise ValueError(f"{user} is already waiting")
+        self._tickets += 1
+        entry = [priority, self._tickets, user, expires_at]
+        self._waiting[user] = entry
+        heapq.heappush(self._heap, entry)
+        return self._tickets
+
+    def appendleft(self, user, priority=PRIORITY_PATRON, expires_at=None):
+        """Put a user back at the very front of their priority class."""
+        if user in self:
+            raise ValueError(f"{user} is already waiting")
+        self._front_tickets -= 1
+        entry = [priority, self._front_tickets, user, expires_at]
+        self._waiting[user] = entry
+        heapq.heappush(self._heap, entry)
+        return self._front_tickets
+
+    def popleft(self, now=None):
+        """Remove and return the next user to serve."""
+        return self.popleft_hold(now)[0]
+
+    def popleft_hold(self, now=None):
+        """Remove the next hold to serve and return it as (user, priority, expires_at)."""
+        self._prune_top(now)
+        if not self._heap:
+            raise IndexError("pop from an empty waitlist")
+        priority, _, user, expires_at = heapq.heappop(self._heap)
+        del self._waiting[user]
+        return user, priority, expires_at
+
+    def remove(self, user):
+        if self._waiting.pop(user, None) is None:
+            raise ValueError(f"{user} is not waiting")
+        self._compact()
+
+    def discard(self, user):
+        if self._waiting.pop(user, None) is None:
+            return False
+        self._compact()
+        return True
+
+    def peek(self, now=None):
+        """The next user to serve, or None."""
+        self._prune_top(now)
+        return self._heap[0][2] if self._heap else None
+
+    def priority_of(self, user):
+        entry = self._waiting.get(user)
+        return entry[0] if entry else None
+
+    def __contains__(self, user):
+        entry = self._waiting.get(user)
+        return entry is not None and self._is_live(entry, time.time())
+
+    def __len__(self):
+        """Holds not cancelled or served (an expired hold counts until noticed)."""
+        return len(self._waiting)
+
+    def __iter__(self):
+        """Live holds in serving order. O(n log n); meant for display."""
+        now = time.time()
+        live = [entry for entry in self._waiting.values()
+                if entry[3] is None or entry[3] > now]
+        live.sort()
+        return (entry[2] for entry in live)
+
+    def __getitem__(self, index):
+        if index == 0:
+            user = self.peek()
+            if user is None:
+                raise IndexError("waitlist index out of range")
+            return user
+        return list(self)[index]
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class Holders:
+    """
+    Multiset of users currently holding copies of a title.
+    Membership, append and remove are O(1); a user holding two copies is
+    counted twice, just like the list it replaces.
+    """
+    def __init__(self, users=()):
+        self._counts = dict(Counter(users))
+        self._total = sum(self._counts.values())
+
+    def append(self, user):
+        self._counts[user] = self._counts.get(user, 0) + 1
+        self._total += 1
+
+    def remove(self, user):
+        count = self._counts.get(user)
+        if not count:
+            raise ValueError(f"{user} does not hold this book")
+        if count == 1:
+            del self._counts[user]
+        else:
+            self._counts[user] = count - 1
+        self._total -= 1
+
+    def count(self, user):
+        return self._counts.get(user, 0)
+
+    def __contains__(self, user):
+        return user in self._counts
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        for user, count in self._counts.items():
+            for _ in range(count):
+                yield user
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+# Circulation outcomes, used as CirculationResult.status
+CHECKED_OUT = "checked_out"
+WAITLISTED = "waitlisted"
+ALREADY_WAITING = "already_waiting"
+HOLD_LIMIT_REACHED = "hold_limit_reached"
+RETURNED = "returned"
+NOT_BORROWED = "not_borrowed"
+NOT_WAITING = "not_waiting"
+HOLD_CANCELLED = "hold_cancelled"
+RETURN_UNDONE = "return_undone"
+HOLD_RESTORED = "hold_restored"
+STOCK_CHANGED = "stock_changed"
+NOT_ON_SHELF = "not_on_shelf"
+BOOK_NOT_FOUND = "book_not_found"
+
+_SUCCESS = frozenset((CHECKED_OUT, RETURNED, HOLD_CANCELLED, RETURN_UNDONE, HOLD_RESTORED, STOCK_CHANGED))
+
+
+class CirculationResult:
+    """
+    Outcome of a circulation call, also published to subscribers as an event.
+    Truthy when the operation succeeded, so `if system.check_out_book(...)`
+    keeps working.
+    Attributes:
+        status: One of the status constants above
+        book_id, user_id: What the call was about
+        available_copies: Copies left after the call (None if book not found)
+        position: Waitlist size after the user joined (WAITLISTED only)
+        promoted_user: Who got the copy from the waitlist (RETURNED only)
+        served: Holds served from the waitlist, as (user_id, priority, expires_at)
+            (RETURNED and STOCK_CHANGED only)
+        total_copies: Copies owned after the call (STOCK_CHANGED and NOT_ON_SHELF only)
+    """
+    __slots__ = ("status", "book_id", "user_id", "title", "available_copies",
+                 "position", "promoted_user", "total_copies", "served")
+
+    def __init__(self, status, book_id, user_id, title=None, available_copies=None,
+                 position=None, promoted_user=None, total_copies=None, served=()):
+        self.status = status
+        self.book_id = book_id
+        self.user_id = user_id
+        self.title = title
+        self.available_copies = available_copies
+        self.position = position
+        self.promoted_user = promoted_user
+        self.total_copies = total_copies
+        self.served = served
+
+    def __bool__(self):
+        return self.status in _SUCCESS
+
+    def __repr__(self):
+        return f"CirculationResult({self.status!r}, book_id={self.book_id!r}, user_id={self.user_id!r})"
+
+    def describe(self):
+        """Human-readable message, for logs and status bars."""
+        if self.status == CHECKED_OUT:
+            return f"{self.user_id} checked out '{self.title}'. Copies left: {self.available_copies}"
+        if self.status == WAITLISTED:
+            return f"No copies of '{self.title}' available. {self.user_id} added to waitlist at position {self.position}"
+        if self.status == ALREADY_WAITING:
+            return f"{self.user_id} is already in the waitlist for '{self.title}'"
+        if self.status == HOLD_LIMIT_REACHED:
+            return f"{self.user_id} has reached their hold limit"
+        if self.status == RETURNED:
+            message = f"{self.user_id} returned '{self.title}'."
+            if self.promoted_user is not None:
+                message += f" {self.promoted_user} now has the book."
+            return message + f" Copies left: {self.available_copies}"
+        if self.status == NOT_BORROWED:
+            return f"{self.user_id} did not check out '{self.title}'"
+        if self.status == NOT_WAITING:
+            return f"{self.user_id} is not on the waitlist for '{self.title}'"
+        if self.status == HOLD_CANCELLED:
+            return f"{self.user_id} removed from the waitlist for '{self.title}'"
+        if self.status == RETURN_UNDONE:
+            return f"Return of '{self.title}' by {self.user_id} undone"
+        if self.status == HOLD_RESTORED:
+            return f"{self.user_id} is back on the waitlist for '{self.title}'"
+        if self.status == STOCK_CHANGED:
+            return f"'{self.title}' now has {self.total_copies} copies, {self.available_copies} on the shelf"
+        if self.status == NOT_ON_SHELF:
+            return f"Only {self.available_copies} copies of '{self.title}' are on the shelf"
+        return f"Book {self.book_id} not found"
+
+
+class BookStatus:
+    """Snapshot of one title's circulation state, as returned by view_book_status."""
+    __slots__ = ("book_id", "title", "available_copies", "checked_out_to", "waitlist")
+
+    def __init__(self, book_id, title, available_copies, checked_out_to, waitlist):
+        self.book_id = book_id
+        self.title = title
+        self.available_copies = available_copies
+        self.checked_out_to = checked_out_to
+        self.waitlist = waitlist
+
+    def __repr__(self):
+        return (f"BookStatus({self.book_id!r}, title={self.title!r}, "
+                f"available_copies={self.available_copies}, checked_out_to={self.checked_out_to}, "
+                f"waitlist={self.waitlist})")
+
 
 class LibrarySystem:
-    def __init__(self):
-        self.books = {}  # book_id: {title, available_copies, checked_out_to, reservation_queue}
+    """
+    Checkout engine: copies, loans and prioritised waitlists per title.
+    Circulation methods never print; they return a CirculationResult and
+    publish it to any subscribers (GUI log, metrics, activity journal).
+    Copies owned and on loan are counted per title and for the whole
+    catalog as they change, so availability() never has to count anything.
+    """
+    def __init__(self, max_holds_per_user=None, hold_days=None, store=None):
+        # book_id: {title, total_copies, available_copies, checked_out_to, reservation_queue}
+        self.books = {}
+        self.total_copies = 0   # Across every title
+        self.loaned_copies = 0
+        self.store = store  # Optional write-through persistence (database.circulation)
+        self.max_holds_per_user = max_holds_per_user
+        self.hold_seconds = hold_days * 86400 if hold_days else None
+        self.user_holds = {}  # user_id: set of book_ids they may be waiting for
+        self._subscribers = []
+        self._batch_subscribers = []
+        self._deferred = None
+
+    def subscribe(self, callback, batch=False):
+        """
+        Call callback(result) after every circulation operation. With
+        batch=True the callback instead receives a list of results, once per
+        call (a bulk call delivers all its results together).
+        """
+        (self._batch_subscribers if batch else self._subscribers).append(callback)
+
+    def unsubscribe(self, callback):
+        for subscribers in (self._subscribers, self._batch_subscribers):
+            if callback in subscribers:
+                subscribers.remove(callback)
+
+    @contextmanager
+    def deferred_events(self):
+        """Hold back events raised inside the block and deliver them as one batch."""
+        if self._deferred is not None:
+            yield
+            return
+        self._deferred = []
+        try:
+            yield
+        finally:
+            results, self._deferred = self._deferred, None
+            if results:
+                self._publish_many(results)
+
+    def _publish(self, result):
+        if self._deferred is not None:
+            self._deferred.append(result)
+            return result
+        for callback in self._subscribers:
+            callback(result)
+        for callback in self._batch_subscribers:
+            callback([result])
+        return result
+
+    def _publish_many(self, results):
+        if self._deferred is not None:
+            self._deferred.extend(results)
+            return results
+        for callback in self._subscribers:
+            for result in results:
+                callback(result)
+        for callback in self._batch_subscribers:
+            callback(results)
+        return results
 
     def add_book(self, book_id, title, copies):
+        self.remove_book(book_id)
         self.books[book_id] = {
             'title': title,
+            'total_copies': copies,
             'available_copies': copies,
-            'checked_out_to': [],
-            'reservation_queue': deque()
+            'checked_out_to': Holders(),
+            'reservation_queue': Waitlist()
         }
+        self.total_copies += copies
 
-    def check_out_book(self, user_id, book_id):
-        if book_id not in self.books:
-            print(" Book not found.")
-            return False
+    def availability(self, book_id=None):
+        """(available, total) copies of one title, or of the whole catalog without book_id. O(1)."""
+        if book_id is None:
+            return self.total_copies - self.loaned_copies, self.total_copies
+        book = self.books.get(book_id)
+        return None if book is None else (book['available_copies'], book['total_copies'])
+
+    def add_copies(self, book_id, count):
+        """
+        Stock count more copies of a title, or withdraw -count copies; only
+        copies on the shelf can be withdrawn. New copies serve the waitlist
+        first, as returned ones do, and each user served gets a CHECKED_OUT
+        result after the STOCK_CHANGED one, which lists the holds served.
+        """
+        book = self.books.get(book_id)
+        if book is None:
+            return self._publish(CirculationResult(BOOK_NOT_FOUND, book_id, None))
+        if -count > book['available_copies']:
+            return self._publish(CirculationResult(NOT_ON_SHELF, book_id, None, book['title'],
+                                                   book['available_copies'], total_copies=book['total_copies']))
+        book['total_copies'] += count
+        book['available_copies'] += count
+        self.total_copies += count
+        if self.store and count > 0:
+            self.store.add_copies(book_id, count)
+        elif self.store and count < 0:
+            self.store.withdraw_copies(book_id, -count)
+        promoted = self._promote(book_id, book, count)
+        results = [CirculationResult(STOCK_CHANGED, book_id, None, book['title'], book['available_copies'],
+                                     total_copies=book['total_copies'], served=promoted)]
+        results += [CirculationResult(CHECKED_OUT, book_id, user_id, book['title'], book['available_copies'])
+                    for user_id, _, _ in promoted]
+        return self._publish_many(results)[0]
+
+    def hold_count(self, user_id):
+        """
+        Active holds for a user. Only that user's few holds are checked, so
+        cancelled or expired ones drop out without scanning any queue.
+        """
+        held = self.user_holds.get(user_id)
+        if not held:
+            return 0
+        for book_id in list(held):
+            book = self.books.get(book_id)
+            if book is None or user_id not in book['reservation_queue']:
+                held.discard(book_id)
+        return len(held)
+
+    def _forget_hold(self, user_id, book_id):
+        held = self.user_holds.get(user_id)
+        if held is not None:
+            held.discard(book_id)
 
-        book = self.books[book_id]
+    def check_out_book(self, user_id, book_id, priority=PRIORITY_PATRON):
+        book = self.books.get(book_id)
+        if book is None:
+            return self._publish(CirculationResult(BOOK_NOT_FOUND, book_id, user_id))
+        return self._publish(self._check_out(book, book_id, user_id, priority))
 
+    def _check_out(self, book, book_id, user_id, priority):
+        title = book['title']
         if book['available_copies'] > 0:
             book['available_copies'] -= 1
             book['checked_out_to'].append(user_id)
-            print(f" {user_id} successfully checked out '{book['title']}'. Copies left: {book['available_copies']}")
-            return True
+            self.loaned_copies += 1
+            if self.store:
+                self.store.add_loan(book_id, user_id)
+            return CirculationResult(CHECKED_OUT, book_id, user_id, title, book['available_copies'])
+
+        # Add to reservation queue
+        queue = book['reservation_queue']
+        if user_id in queue:
+            status = ALREADY_WAITING
+        elif self.max_holds_per_user is not None and self.hold_count(user_id) >= self.max_holds_per_user:
+            status = HOLD_LIMIT_REACHED
         else:
-            # Add to reservation queue
-            if user_id not in book['reservation_queue']:
-                book['reservation_queue'].append(user_id)
-                print(f" No copies available. {user_id} added to waitlist at position {len(book['reservation_queue'])}")
-            else:
-                print(f" {user_id} is already in the waitlist.")
+            expires_at = time.time() + self.hold_seconds if self.hold_seconds else None
+            ticket = queue.append(user_id, priority, expires_at)
+            self.user_holds.setdefault(user_id, set()).add(book_id)
+            if self.store:
+                self.store.add_hold(book_id, user_id, priority, ticket, expires_at)
+            return CirculationResult(WAITLISTED, book_id, user_id, title,
+                                     book['available_copies'], position=len(queue))
+        return CirculationResult(status, book_id, user_id, title, book['available_copies'])
+
+    def check_out_many(self, requests):
+        """
+        Check out a batch of (user_id, book_id) or (user_id, book_id, priority)
+        requests. Requests are grouped by book so each title is looked up once;
+        within a title they are served in input order. Subscribers get all
+        results in one delivery. Returns results in input order.
+        """
+        results = [None] * len(requests)
+        by_book = {}
+        for index, request in enumerate(requests):
+            by_book.setdefault(request[1], []).append(index)
+
+        for book_id, indexes in by_book.items():
+            book = self.books.get(book_id)
+            for index in indexes:
+                request = requests[index]
+                user_id = request[0]
+                if book is None:
+                    results[index] = CirculationResult(BOOK_NOT_FOUND, book_id, user_id)
+                else:
+                    priority = request[2] if len(request) > 2 else PRIORITY_PATRON
+                    results[index] = self._check_out(book, book_id, user_id, priority)
+        return self._publish_many(results)
+
+    def remove_book(self, book_id):
+        book = self.books.pop(book_id, None)
+        if book is None:
             return False
+        self.total_copies -= book['total_copies']
+        self.loaned_copies -= len(book['checked_out_to'])
+        return True
 
     def return_book(self, book_id, user_id):
-        if book_id not in self.books:
-            print(" Book not found.")
-            return
+        return self.return_many([(book_id, user_id)])[0]
 
-        book = self.books[book_id]
-
-        if user_id in book['checked_out_to']:
-            book['checked_out_to'].remove(user_id)
-            book['available_copies'] += 1
-            print(f" {user_id} returned '{book['title']}'. Copies now: {book['available_copies']}")
-
-            # Notify next in queue
-            if book['reservation_queue']:
-                next_user = book['reservation_queue'].popleft()
-                book['available_copies'] -= 1
-                book['checked_out_to'].append(next_user)
-                print(f" Notified {next_user} — they now have the book '{book['title']}'. Copies left: {book['available_copies']}")
-            else:
-                print(" No reservations in queue.")
-        else:
-            print(" This user did not check out this book.")
+    def return_many(self, returns):
+        """
+        Process a batch of (book_id, user_id) returns, e.g. the overnight
+        book-drop. Returns are grouped by book: all of a title's returns are
+        taken in first, then its waitlist is promoted once for the freed
+        copies. Subscribers get all results in one delivery. Returns results
+        in input order.
+        """
+        results = [None] * len(returns)
+        by_book = {}
+        for index, (book_id, user_id) in enumerate(returns):
+            by_book.setdefault(book_id, []).append(index)
+
+        for book_id, indexes in by_book.items():
+            book = self.books.get(book_id)
+            if book is None:
+                for index in indexes:
+                    results[index] = CirculationResult(BOOK_NOT_FOUND, book_id, returns[index][1])
+                continue
+
+            holders = book['checked_out_to']
+            returned = []
+            for index in indexes:
+                user_id = returns[index][1]
+                if user_id in holders:
+                    holders.remove(user_id)
+                    book['available_copies'] += 1
+                    self.loaned_copies -= 1
+                    if self.store:
+                        self.store.remove_loan(book_id, user_id)
+                    returned.append(index)
+                else:
+                    results[index] = CirculationResult(NOT_BORROWED, book_id, user_id, book['title'],
+                                                       book['available_copies'])
+
+            # One promotion pass: each freed copy goes to the next live hold
+            promoted = self._promote(book_id, book, len(returned))
+            for position, index in enumerate(returned):
+                served = promoted[position:position + 1]
+                results[index] = CirculationResult(RETURNED, book_id, returns[index][1], book['title'],
+                                                   book['available_copies'],
+                                                   promoted_user=served[0][0] if served else None,
+                                                   served=served)
+        return self._publish_many(results)
+
+    def _promote(self, book_id, book, copies):
+        """
+        Lend up to copies shelf copies to the next live holds; returns the
+        holds served as (user_id, priority, expires_at).
+        """
+        queue = book['reservation_queue']
+        promoted = []
+        for _ in range(copies):
+            try:
+                hold = queue.popleft_hold()
+            except IndexError:
+                break
+            next_user = hold[0]
+            self._forget_hold(next_user, book_id)
+            book['available_copies'] -= 1
+            book['checked_out_to'].append(next_user)
+            self.loaned_copies += 1
+            if self.store:
+                self.store.remove_hold(book_id, next_user)
+                self.store.add_loan(book_id, next_user)
+            promoted.append(hold)
+        return promoted
+
+    def cancel_reservation(self, book_id, user_id):
+        """Take a user off the waitlist (used to undo a queued checkout)."""
+        book = self.books.get(book_id)
+        if book is None:
+            return self._publish(CirculationResult(BOOK_NOT_FOUND, book_id, user_id))
+        self._forget_hold(user_id, book_id)
+        if not book['reservation_queue'].discard(user_id):
+            return self._publish(CirculationResult(NOT_WAITING, book_id, user_id, book['title'],
+                                                   book['available_copies']))
+        if self.store:
+            self.store.remove_hold(book_id, user_id)
+        return self._publish(CirculationResult(HOLD_CANCELLED, book_id, user_id, book['title'],
+                                               book['available_copies']))
+
+    def undo_return(self, book_id, user_id, promoted_user=None, priority=PRIORITY_PATRON, expires_at=None):
+        """
+        Reverse a return: the user gets the copy back and, if the return
+        promoted someone from the waitlist, they go back to the front of
+        their priority class with the hold's original expiry (the served
+        hold in RETURNED results).
+        """
+        book = self.books.get(book_id)
+        if book is None:
+            return self._publish(CirculationResult(BOOK_NOT_FOUND, book_id, user_id))
+        if promoted_user is not None:
+            self._requeue(book_id, book, promoted_user, priority, expires_at)
+        book['checked_out_to'].append(user_id)
+        book['available_copies'] -= 1
+        self.loaned_copies += 1
+        if self.store:
+            self.store.add_loan(book_id, user_id)
+        return self._publish(CirculationResult(RETURN_UNDONE, book_id, user_id, book['title'],
+                                               book['available_copies'], promoted_user=promoted_user))
+
+    def undo_promotion(self, book_id, user_id, priority=PRIORITY_PATRON, expires_at=None):
+        """
+        Take back a copy lent from the waitlist and put the user's hold back
+        at the front of its priority class (used to undo adding copies). The
+        copy is left on the shelf.
+        """
+        book = self.books.get(book_id)
+        if book is None:
+            return self._publish(CirculationResult(BOOK_NOT_FOUND, book_id, user_id))
+        if not self._requeue(book_id, book, user_id, priority, expires_at):
+            return self._publish(CirculationResult(NOT_BORROWED, book_id, user_id, book['title'],
+                                                   book['available_copies']))
+        return self._publish(CirculationResult(HOLD_RESTORED, book_id, user_id, book['title'],
+                                               book['available_copies']))
+
+    def _requeue(self, book_id, book, user_id, priority, expires_at):
+        """Turn a promoted user's loan back into their hold; False if they no longer have a copy."""
+        if user_id not in book['checked_out_to']:
+            return False
+        book['checked_out_to'].remove(user_id)
+        ticket = book['reservation_queue'].appendleft(user_id, priority, expires_at)
+        self.user_holds.setdefault(user_id, set()).add(book_id)
+        book['available_copies'] += 1
+        self.loaned_copies -= 1
+        if self.store:
+            self.store.remove_loan(book_id, user_id)
+            self.store.add_hold(book_id, user_id, priority, ticket, expires_at)
+        return True
+
+    def has_activity(self, book_id):
+        """True if the book has copies out or anyone waiting."""
+        book = self.books.get(book_id)
+        return book is not None and (len(book['checked_out_to']) > 0 or len(book['reservation_queue']) > 0)
+
+    def restore(self, loans, holds):
+        """
+        Bulk-load persisted state: loans as {book_id: [user_id, ...]} and
+        holds as {book_id: [(priority, ticket, user_id, expires_at), ...]}.
+        Queues are heapified in one go rather than replaying checkouts.
+        """
+        for book_id, users in loans.items():
+            book = self.books.get(book_id)
+            if book is None:
+                continue
+            self.loaned_copies += len(users) - len(book['checked_out_to'])
+            book['available_copies'] += len(book['checked_out_to']) - len(users)
+            book['checked_out_to'] = Holders(users)
+        for book_id, entries in holds.items():
+            book = self.books.get(book_id)
+            if book is None:
+                continue
+            book['reservation_queue'] = Waitlist.from_entries(entries)
+            for entry in entries:
+                self.user_holds.setdefault(entry[2], set()).add(book_id)
 
     def view_book_status(self, book_id):
-        if book_id not in self.books:
-            print(" Book not found.")
-            return
-        book = self.books[book_id]
-        print(f"\n Book: {book['title']}")
-        print(f"Available copies: {book['available_copies']}")
-        print(f"Checked out to: {book['checked_out_to']}")
-        print(f"Waitlist queue: {list(book['reservation_queue'])}")
+        """Return a BookStatus for the title, or None if it is unknown."""
+        book = self.books.get(book_id)
+        if book is None:
+            return None
+        return BookStatus(book_id, book['title'], book['available_copies'],
+                          list(book['checked_out_to']), list(book['reservation_queue']))
@@ -0,0 +1,274 @@
+import heapq
+import multiprocessing
+import zlib
+from bisect import bisect_left, insort
+from itertools import islice
+
+from .BookDictionary import BookDictionary
+from .Bsearch import BinarySearchTree
+
+
+def shard_of(isbn, num_shards):
+    """Shard number for an ISBN. crc32 is stable across processes, unlike hash()."""
+    return zlib.crc32(str(isbn).encode("utf-8")) % num_shards
+
+
+def _sort_key(book):
+    return (book["title"].lower(), book["isbn"])
+
+
+def _balanced_order(rows):
+    """Yield sorted rows median-first so bulk BST inserts build a balanced tree."""
+    ranges = [(0, len(rows))]
+    while ranges:
+        lo, hi = ranges.pop()
+        if lo >= hi:
+            continue
+        mid = (lo + hi) // 2
+        yield rows[mid]
+        ranges.append((mid + 1, hi))
+        ranges.append((lo, mid))
+
+
+class CatalogShard:
+    """
+    One partition of the catalog.
+    Each shard owns its own BookDictionary (ISBN lookups), BinarySearchTree
+    (ordered ISBN index) and a sorted title index for prefix searches.
+    """
+    def __init__(self):
+        self.books = BookDictionary()
+        self.tree = BinarySearchTree()
+        self._titles = []   # sorted (lower-case title, isbn)
+
+    def __len__(self):
+        return len(self.books.books)
+
+    def add_book(self, isbn, title, author):
+        if not self.books.add_book(isbn, title, author):
+            return False
+        self.tree.insert(isbn, (title, author, isbn))
+        insort(self._titles, (title.lower(), isbn))
+        return True
+
+    def bulk_load(self, rows):
+        """Add many (isbn, title, author) rows; returns how many were new."""
+        new_rows = [row for row in rows if self.books.add_book(*row)]
+        for isbn, title, author in _balanced_order(sorted(new_rows)):
+            self.tree.insert(isbn, (title, author, isbn))
+        self._titles.extend((title.lower(), isbn) for isbn, title, _ in new_rows)
+        self._titles.sort()
+        return len(new_rows)
+
+    def update_book(self, isbn, title, author):
+        book = self.books.search_by_isbn(isbn)
+        if book is None:
+            return False
+        self._remove_title(book["title"], isbn)
+        self.books.update_book(isbn, title, author)
+        self.tree.insert(isbn, (title, author, isbn))
+        insort(self._titles, (title.lower(), isbn))
+        return True
+
+    def delete_book(self, isbn):
+        book = self.books.search_by_isbn(isbn)
+        if book is None:
+            return False
+        self._remove_title(book["title"], isbn)
+        self.books.delete_book(isbn)
+        self.tree.delete(isbn)
+        return True
+
+    def _remove_title(self, title, isbn):
+        entry = (title.lower(), isbn)
+        index = bisect_left(self._titles, entry)
+        if index < len(self._titles) and self._titles[index] == entry:
+            del self._titles[index]
+
+    def search_by_isbn(self, isbn):
+        return self.books.search_by_isbn(isbn)
+
+    def search_by_title(self, prefix, limit=None):
+        """Books whose title starts with prefix, in title order (uses the title index)."""
+        prefix = prefix.lower()
+        results = []
+        for title, isbn in islice(self._titles, bisect_left(self._titles, (prefix,)), None):
+            if not title.startswith(prefix) or (limit is not None and len(results) >= limit):
+                break
+            results.append(self.books.search_by_isbn(isbn))
+        return results
+
+    def search(self, text, limit=None):
+        """Books with text anywhere in the title or author, in title order."""
+        text = text.lower()
+        matches = (book for book in self.books.books.values()
+                   if text in book["title"].lower() or text in book["author"].lower())
+        if limit is None:
+            return sorted(matches, key=_sort_key)
+        return heapq.nsmallest(limit, matches, key=_sort_key)
+
+
+def _serve_shard(conn):
+    """Worker loop: own one CatalogShard and answer (method, args) requests."""
+    shard = CatalogShard()
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        method, args = message
+        try:
+            conn.send((True, getattr(shard, method)(*args)))
+        except Exception as e:
+            conn.send((False, e))
+    conn.close()
+
+
+class _LocalShard:
+    """Shard living in this process (used when the catalog is not parallel)."""
+    def __init__(self):
+        self.shard = CatalogShard()
+        self._reply = (True, None)
+
+    def send(self, method, args):
+        # Held until recv, like a worker's reply, so errors surface in the same place
+        try:
+            self._reply = (True, getattr(self.shard, method)(*args))
+        except Exception as e:
+            self._reply = (False, e)
+
+    def recv(self):
+        (ok, value), self._reply = self._reply, (True, None)
+        if not ok:
+            raise value
+        return value
+
+    def close(self):
+        pass
+
+
+class _ProcessShard:
+    """Shard living in a dedicated worker process, reached through a pipe."""
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve_shard, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, method, args):
+        self.conn.send((method, args))
+
+    def recv(self):
+        ok, value = self.conn.recv()
+        if not ok:
+            raise value
+        return value
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join()
+        self.conn.close()
+
+
+class ShardedCatalog:
+    """
+    Catalog partitioned by ISBN hash across num_shards shards.
+    Single-book operations are routed to the owning shard. Searches are
+    scattered to every shard and the per-shard results (already sorted and
+    limited) are merged. With parallel=True each shard is served by its own
+    worker process, so a full-catalog search runs on all cores at once.
+    Not wired into the GUI yet; the application still searches its single
+    BookDictionary and BST.
+    """
+    def __init__(self, num_shards=4, parallel=False):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.num_shards = num_shards
+        self.parallel = parallel
+        if parallel:
+            context = multiprocessing.get_context()
+            self._shards = [_ProcessShard(context) for _ in range(num_shards)]
+        else:
+            self._shards = [_LocalShard() for _ in range(num_shards)]
+        self._size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        """Stop the worker processes (no-op for an in-process catalog)."""
+        for shard in self._shards:
+            shard.close()
+        self._shards = []
+
+    def _call(self, isbn, method, *args):
+        shard = self._shards[shard_of(isbn, self.num_shards)]
+        shard.send(method, args)
+        return shard.recv()
+
+    def _scatter(self, method, *args):
+        # Send to every shard before waiting on any, so workers run concurrently
+        for shard in self._shards:
+            shard.send(method, args)
+        return self._gather()
+
+    def _gather(self):
+        # Read every shard's reply before raising, or the unread ones would
+        # be taken as the answers to the next request
+        results, error = [], None
+        for shard in self._shards:
+            try:
+                results.append(shard.recv())
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+
+    def add_book(self, isbn, title, author):
+        added = self._call(isbn, "add_book", isbn, title, author)
+        self._size += added
+        return added
+
+    def bulk_load(self, rows):
+        """Partition (isbn, title, author) rows and load each shard in one message."""
+        partitions = [[] for _ in range(self.num_shards)]
+        for row in rows:
+            partitions[shard_of(row[0], self.num_shards)].append(tuple(row))
+        for shard, partition in zip(self._shards, partitions):
+            shard.send("bulk_load", (partition,))
+        added = sum(self._gather())
+        self._size += added
+        return added
+
+    def update_book(self, isbn, title, author):
+        return self._call(isbn, "update_book", isbn, title, author)
+
+    def delete_book(self, isbn):
+        deleted = self._call(isbn, "delete_book", isbn)
+        self._size -= deleted
+        return deleted
+
+    def search_by_isbn(self, isbn):
+        return self._call(isbn, "search_by_isbn", isbn)
+
+    def search_by_title(self, prefix, limit=None):
+        return self._merge(self._scatter("search_by_title", prefix, limit), limit)
+
+    def search(self, text, limit=None):
+        return self._merge(self._scatter("search", text, limit), limit)
+
+    def shard_sizes(self):
+        return self._scatter("__len__")
+
+    def _merge(self, per_shard, limit):
+        merged = heapq.merge(*per_shard, key=_sort_key)
+        return list(merged if limit is None else islice(merged, limit))
@@ -0,0 +1,135 @@
+import re
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# Mersenne prime used for the universal hash family (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(title, author, k=3):
+    """
+    Build the shingle set for a book.
+    Title words are broken into character k-grams (so "Habit" and "Habits"
+    still overlap), author words are kept whole and tagged so an author
+    name never collides with a title fragment.
+    """
+    result = set()
+    for word in _TOKEN_RE.findall(title.lower()):
+        if len(word) <= k:
+            result.add(word)
+        else:
+            for i in range(len(word) - k + 1):
+                result.add(word[i:i + k])
+    for word in _TOKEN_RE.findall(author.lower()):
+        result.add("@" + word)
+    return result
+
+
+def _hash_params(num_perm, seed):
+    """Deterministic (a, b) pairs so every worker process uses the same hashes."""
+    params = []
+    state = seed
+    for _ in range(num_perm):
+        state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+        a = (state >> 3) % (_PRIME - 1) + 1
+        state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+        b = (state >> 3) % _PRIME
+        params.append((a, b))
+    return params
+
+
+def minhash_signature(shingle_set, params):
+    """Return the MinHash signature (one minimum per hash function)."""
+    # crc32 is stable across processes, unlike the salted built-in hash()
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingle_set]
+    if not hashes:
+        return (_MAX_HASH,) * len(params)
+    return tuple(
+        min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+        for a, b in params
+    )
+
+
+def _signature_chunk(args):
+    """Worker entry point: signatures for a chunk of (isbn, title, author) rows."""
+    rows, num_perm, seed, k = args
+    params = _hash_params(num_perm, seed)
+    return [(isbn, minhash_signature(shingles(title, author, k), params))
+            for isbn, title, author in rows]
+
+
+def compute_signatures(rows, num_perm=64, seed=1, k=3, workers=None, chunk_size=2000):
+    """
+    Compute MinHash signatures for every row.
+    Chunks are farmed out to a process pool; small inputs are handled inline
+    because spinning up worker processes costs more than the work itself.
+    """
+    rows = list(rows)
+    chunks = [(rows[i:i + chunk_size], num_perm, seed, k)
+              for i in range(0, len(rows), chunk_size)]
+    signatures = {}
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            signatures.update(_signature_chunk(chunk))
+        return signatures
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_signature_chunk, chunks):
+            signatures.update(result)
+    return signatures
+
+
+def lsh_candidates(signatures, bands=16, max_bucket=200):
+    """
+    Band the signatures and return candidate pairs that share a bucket.
+    Buckets larger than max_bucket (e.g. every "Vol. 1" in the catalog) are
+    skipped so a single hot bucket cannot turn the job quadratic again.
+    """
+    if not signatures:
+        return set()
+    num_perm = len(next(iter(signatures.values())))
+    rows_per_band = max(1, num_perm // bands)
+    candidates = set()
+    for band in range(bands):
+        start = band * rows_per_band
+        end = start + rows_per_band
+        if start >= num_perm:
+            break
+        buckets = defaultdict(list)
+        for isbn, sig in signatures.items():
+            buckets[sig[start:end]].append(isbn)
+        for members in buckets.values():
+            if len(members) < 2 or len(members) > max_bucket:
+                continue
+            members.sort()
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+    return candidates
+
+
+def estimated_jaccard(sig1, sig2):
+    """Fraction of agreeing signature slots, an estimate of Jaccard similarity."""
+    same = sum(1 for x, y in zip(sig1, sig2) if x == y)
+    return same / len(sig1)
+
+
+def find_similar_pairs(rows, threshold=0.5, num_perm=64, bands=16, workers=None):
+    """
+    Find similar book pairs without comparing every pair.
+    Args:
+        rows: iterable of (isbn, title, author)
+        threshold: minimum estimated Jaccard similarity to keep a pair
+    Returns:
+        list of (isbn1, isbn2, score) sorted by descending score
+    """
+    signatures = compute_signatures(rows, num_perm=num_perm, workers=workers)
+    pairs = []
+    for a, b in lsh_candidates(signatures, bands=bands):
+        score = estimated_jaccard(signatures[a], signatures[b])
+        if score >= threshold:
+            pairs.append((a, b, score))
+    pairs.sort(key=lambda p: (-p[2], p[0], p[1]))
+    return pairs
@@ -0,0 +1,198 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from .Bsearch import BinarySearchTree, TreeNode
+from .BookDictionary import BookDictionary
+from .linkedList import BookLinkedList, Node
+
+MAGIC = b"LIBSNAP\x00"
+FORMAT_VERSION = 1
+
+# magic, format version, byte order, database id, data version, book count,
+# BST root row, payload length, payload crc32
+_HEADER = struct.Struct("<8sIc32sqqqQI")
+_SECTION = struct.Struct("<Q")
+_SEPARATOR = "\x00"
+
+
+class SnapshotError(Exception):
+    """The snapshot is missing, corrupt, from another format or out of date."""
+
+
+def _encode_column(values):
+    for value in values:
+        if _SEPARATOR in value:
+            raise SnapshotError("text contains a NUL character")
+    return _SEPARATOR.join(values).encode("utf-8")
+
+
+def _decode_column(blob, count):
+    values = bytes(blob).decode("utf-8").split(_SEPARATOR) if count else []
+    if len(values) != count:
+        raise SnapshotError("column length does not match book count")
+    return values
+
+
+def save_snapshot(path, bst, linked_list, database_id, data_version):
+    """
+    Write the catalog indexes to path as flat arrays.
+    Books are stored once, in linked-list order, as three NUL-separated UTF-8
+    columns (isbn, title, author). The BST shape is stored as two int32 arrays
+    of child row numbers, so no node objects are pickled. The file is written
+    to a temporary name and renamed, so a crash never leaves a half snapshot.
+    """
+    if len(database_id.encode()) > 32:
+        raise SnapshotError("database id is longer than 32 bytes")
+    isbns, titles, authors = [], [], []
+    rows = {}
+    node = linked_list.head
+    while node:
+        if not isinstance(node.isbn, str):
+            raise SnapshotError("ISBN keys must be strings")
+        rows[node.isbn] = len(isbns)
+        isbns.append(node.isbn)
+        titles.append(node.title)
+        authors.append(node.author)
+        node = node.next
+
+    left = array("i", [-1]) * len(isbns)
+    right = array("i", [-1]) * len(isbns)
+    seen = 0
+    stack = [bst.root] if bst.root else []
+    while stack:
+        tree_node = stack.pop()
+        row = rows.get(tree_node.key)
+        if row is None:
+            raise SnapshotError(f"BST key {tree_node.key!r} is not in the catalog")
+        seen += 1
+        if tree_node.left:
+            left[row] = rows.get(tree_node.left.key, -1)
+            stack.append(tree_node.left)
+        if tree_node.right:
+            right[row] = rows.get(tree_node.right.key, -1)
+            stack.append(tree_node.right)
+    if seen != len(isbns):
+        raise SnapshotError("BST and linked list hold different books")
+    root = rows[bst.root.key] if bst.root else -1
+
+    payload = bytearray()
+    for section in (_encode_column(isbns), _encode_column(titles), _encode_column(authors),
+                    left.tobytes(), right.tobytes()):
+        payload += _SECTION.pack(len(section))
+        payload += section
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder[0].encode(), database_id.encode(),
+                          data_version, len(isbns), root, len(payload), zlib.crc32(payload))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(isbns)
+
+
+class CatalogSnapshot:
+    """Decoded snapshot columns, ready to be turned back into the live structures."""
+    def __init__(self, isbns, titles, authors, left, right, root):
+        self.isbns = isbns
+        self.titles = titles
+        self.authors = authors
+        self.left = left
+        self.right = right
+        self.root = root
+
+    def __len__(self):
+        return len(self.isbns)
+
+    def rows(self):
+        """(isbn, title, author) in catalog order."""
+        return zip(self.isbns, self.titles, self.authors)
+
+    def build_bst(self, log_fn=None):
+        """Rebuild the BST with its saved shape in O(n), without re-inserting."""
+        bst = BinarySearchTree(log_fn=log_fn)
+        nodes = [TreeNode(isbn, (title, author, isbn)) for isbn, title, author in self.rows()]
+        for node, left, right in zip(nodes, self.left, self.right):
+            if left >= 0:
+                node.left = nodes[left]
+            if right >= 0:
+                node.right = nodes[right]
+        bst.root = nodes[self.root] if self.root >= 0 else None
+        bst.size = len(nodes)
+        return bst
+
+    def build_book_dictionary(self):
+        book_dict = BookDictionary()
+        book_dict.books = {isbn: {"isbn": isbn, "title": title, "author": author, "available": True}
+                           for isbn, title, author in self.rows()}
+        return book_dict
+
+    def build_linked_list(self):
+        linked_list = BookLinkedList()
+        previous = None
+        for isbn, title, author in self.rows():
+            node = Node(title, author, isbn)
+            if previous is None:
+                linked_list.head = node
+            else:
+                previous.next = node
+            previous = node
+        linked_list.tail = previous
+        linked_list.size = len(self.isbns)
+        return linked_list
+
+
+def load_snapshot(path, database_id, data_version):
+    """
+    Memory-map a snapshot and decode it.
+    Raises SnapshotError unless the file is intact and was taken at exactly
+    (database_id, data_version); the caller should then rebuild from the
+    database. OSError is raised if the file cannot be opened.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _HEADER.size:
+            raise SnapshotError("file is too short")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            (magic, fmt, byteorder, snap_db, snap_version, count, root,
+             payload_len, crc) = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or fmt != FORMAT_VERSION:
+                raise SnapshotError("unknown snapshot format")
+            if byteorder != sys.byteorder[0].encode():
+                raise SnapshotError("snapshot was written on a machine with another byte order")
+            if snap_db.rstrip(b"\x00").decode() != database_id or snap_version != data_version:
+                raise SnapshotError("snapshot is older than the database")
+            if _HEADER.size + payload_len != size:
+                raise SnapshotError("file is truncated")
+
+            with memoryview(mm) as view:
+                payload = view[_HEADER.size:]
+                sections = []
+                try:
+                    if zlib.crc32(payload) != crc:
+                        raise SnapshotError("checksum mismatch")
+                    offset = 0
+                    for _ in range(5):
+                        (length,) = _SECTION.unpack_from(payload, offset)
+                        offset += _SECTION.size
+                        sections.append(payload[offset:offset + length])
+                        offset += length
+                    isbns, titles, authors = (_decode_column(section, count) for section in sections[:3])
+                    left, right = array("i"), array("i")
+                    left.frombytes(sections[3])
+                    right.frombytes(sections[4])
+                finally:
+                    # The map cannot be closed while slices of it are alive
+                    for section in sections:
+                        section.release()
+                    payload.release()
+
+    if len(left) != count or len(right) != count or not -1 <= root < count or (count and root < 0):
+        raise SnapshotError("BST arrays do not match book count")
+    return CatalogSnapshot(isbns, titles, authors, left, right, root)
@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+from .Stacks import ActivityStack
+
+Operation = Tuple
+
+
+class UndoManager:
+    """
+    Command log with undo/redo built on two ActivityStacks.
+    Every entry keeps the forward and inverse operations of one user action as
+    compact tuples such as ("add", isbn, title, author). Applying operations
+    is delegated to apply_fn, which always receives a whole list so it can
+    run it against the data structures and SQLite in a single transaction.
+    An optional history stack gets every recorded action plus an "UNDO" or
+    "REDO" entry for each step taken, so it keeps actions that were undone.
+    """
+    def __init__(self, apply_fn: Callable[[List[Operation]], None], max_size: int = 1000,
+                 history: Optional[ActivityStack] = None):
+        self.apply_fn = apply_fn
+        self.undo_stack = ActivityStack(max_size)
+        self.redo_stack = ActivityStack(max_size)
+        self.history = history
+        self._batch: Optional[list] = None
+
+    def record(self, action: str, details: str,
+               forward: List[Operation], inverse: List[Operation]) -> None:
+        """
+        Record an action that has already been applied.
+        Inside a batch() block the operations are collected into one entry.
+        """
+        if self._batch is not None:
+            self._batch[0].extend(forward)
+            self._batch[1].append(inverse)
+            return
+        self.undo_stack.push(action, details, (list(forward), list(inverse)))
+        self.redo_stack.clear_stack()
+        if self.history is not None:
+            self.history.push(action, details)
+
+    @contextmanager
+    def batch(self, action: str, details: str):
+        """
+        Group every record() inside the block into a single undo entry. If the
+        block raises, the actions recorded so far still become an entry.
+        """
+        if self._batch is not None:
+            # Nested batches fold into the outer one
+            yield
+            return
+        self._batch = ([], [])
+        try:
+            yield
+        except BaseException:
+            # What was recorded before the failure has been applied; keep it undoable
+            self._end_batch(action, f"{details} (interrupted)")
+            raise
+        self._end_batch(action, details)
+
+    def _end_batch(self, action: str, details: str) -> None:
+        forward, inverses = self._batch
+        self._batch = None
+        if forward:
+            # Later actions must be undone first
+            inverse = [op for ops in reversed(inverses) for op in ops]
+            self.record(action, details, forward, inverse)
+
+    def can_undo(self) -> bool:
+        return self.undo_stack.size > 0
+
+    def can_redo(self) -> bool:
+        return self.redo_stack.size > 0
+
+    def undo(self) -> Optional[str]:
+        """Apply the inverse of the latest action. Returns its details, or None."""
+        return self._move(self.undo_stack, self.redo_stack, use_inverse=True)
+
+    def redo(self) -> Optional[str]:
+        """Re-apply the latest undone action. Returns its details, or None."""
+        return self._move(self.redo_stack, self.undo_stack, use_inverse=False)
+
+    def _move(self, source: ActivityStack, target: ActivityStack, use_inverse: bool) -> Optional[str]:
+        node = source.pop_node()
+        if node is None:
+            return None
+        forward, inverse = node.payload
+        try:
+            self.apply_fn(inverse if use_inverse else forward)
+        except Exception:
+            # Leave the entry where it was so the user can retry
+            source.push_node(node)
+            raise
+        target.push(node.action, node.details, node.payload)
+        if self.history is not None:
+            self.history.push("UNDO" if use_inverse else "REDO", f"{node.action}: {node.details}")
+        return node.details
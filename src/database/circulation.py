@@ -0,0 +1,206 @@
+import time
+from itertools import groupby
+
+# A loan takes one shelf copy of the title, a return puts one of the user's back
+LEND_COPY = ("UPDATE copies SET borrower = ? WHERE id = "
+             "(SELECT id FROM copies WHERE isbn = ? AND borrower IS NULL LIMIT 1)")
+RELEASE_COPY = ("UPDATE copies SET borrower = NULL WHERE id = "
+                "(SELECT id FROM copies WHERE isbn = ? AND borrower = ? LIMIT 1)")
+
+
+def copy_totals(conn):
+    """{isbn: copies owned} for the titles not stocked with the usual single copy."""
+    return dict(conn.execute("SELECT isbn, total_copies FROM inventory WHERE total_copies != 1"))
+
+
+class CirculationStore:
+    """
+    SQLite persistence for loans, holds and copies.
+    Changes are queued by the checkout engine and written with executemany
+    when flush() runs, so a whole user action (or batch of actions) costs one
+    round of statements inside one transaction.
+    Every physical copy is a row of copies whose borrower is NULL while it is
+    on the shelf. Triggers keep a per-title inventory of copies owned and
+    available in step with it, in the same transaction, so availability is a
+    primary-key lookup instead of a count; adding a book stocks one copy.
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self._pending = []
+        self._copy_changes = []     # flushed after loans, in the order queued
+        self._ensure_tables()
+
+    def _ensure_tables(self):
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS loans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                isbn TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                loaned_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_loans_isbn_user ON loans (isbn, user_id);
+
+            CREATE TABLE IF NOT EXISTS holds (
+                isbn TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                ticket INTEGER NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (isbn, user_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_holds_user ON holds (user_id);
+
+            CREATE TABLE IF NOT EXISTS copies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                isbn TEXT NOT NULL,
+                borrower TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_copies_isbn_borrower ON copies (isbn, borrower);
+
+            CREATE TABLE IF NOT EXISTS inventory (
+                isbn TEXT PRIMARY KEY,
+                total_copies INTEGER NOT NULL,
+                available_copies INTEGER NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TRIGGER IF NOT EXISTS copies_stock_insert AFTER INSERT ON copies BEGIN
+                INSERT INTO inventory (isbn, total_copies, available_copies)
+                VALUES (NEW.isbn, 1, NEW.borrower IS NULL)
+                ON CONFLICT (isbn) DO UPDATE SET total_copies = total_copies + 1,
+                    available_copies = available_copies + (NEW.borrower IS NULL);
+            END;
+            CREATE TRIGGER IF NOT EXISTS copies_stock_delete AFTER DELETE ON copies BEGIN
+                UPDATE inventory SET total_copies = total_copies - 1,
+                    available_copies = available_copies - (OLD.borrower IS NULL)
+                WHERE isbn = OLD.isbn;
+            END;
+            CREATE TRIGGER IF NOT EXISTS copies_stock_lend AFTER UPDATE OF borrower ON copies BEGIN
+                UPDATE inventory
+                SET available_copies = available_copies + (NEW.borrower IS NULL) - (OLD.borrower IS NULL)
+                WHERE isbn = NEW.isbn;
+            END;
+            """
+        )
+        books = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books'").fetchone()
+        stocked = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'books_stock_insert'").fetchone()
+        if books and not stocked:
+            self._stock_books()
+        self.conn.commit()
+
+    def _stock_books(self):
+        """
+        Give every book a copy when books are first tracked: one on the shelf,
+        or one per loan for a title that is out. From then on triggers stock
+        one copy per added book and remove the copies of a deleted one.
+        """
+        self.conn.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS books_stock_insert AFTER INSERT ON books BEGIN
+                INSERT INTO copies (isbn) VALUES (NEW.isbn);
+            END;
+            CREATE TRIGGER IF NOT EXISTS books_stock_delete AFTER DELETE ON books BEGIN
+                DELETE FROM copies WHERE isbn = OLD.isbn;
+                DELETE FROM inventory WHERE isbn = OLD.isbn;
+            END;
+            """
+        )
+        unstocked = [isbn for isbn, in self.conn.execute(
+            "SELECT isbn FROM books WHERE isbn NOT IN (SELECT isbn FROM inventory)")]
+        loans = {}
+        for isbn, user_id in self.conn.execute("SELECT isbn, user_id FROM loans ORDER BY id"):
+            loans.setdefault(isbn, []).append(user_id)
+        self.conn.executemany("INSERT INTO copies (isbn, borrower) VALUES (?, ?)",
+                              ((isbn, user_id) for isbn in unstocked for user_id in loans.get(isbn, [None])))
+
+    def add_loan(self, isbn, user_id):
+        self._pending.append((
+            "INSERT INTO loans (isbn, user_id, loaned_at) VALUES (?, ?, ?)",
+            (isbn, user_id, time.time()),
+        ))
+        self._copy_changes.append((LEND_COPY, (user_id, isbn)))
+
+    def remove_loan(self, isbn, user_id):
+        # A user may hold several copies; return exactly one of them
+        self._pending.append((
+            "DELETE FROM loans WHERE id = "
+            "(SELECT id FROM loans WHERE isbn = ? AND user_id = ? LIMIT 1)",
+            (isbn, user_id),
+        ))
+        self._copy_changes.append((RELEASE_COPY, (isbn, user_id)))
+
+    def add_copies(self, isbn, count):
+        self._copy_changes.extend([("INSERT INTO copies (isbn) VALUES (?)", (isbn,))] * count)
+
+    def withdraw_copies(self, isbn, count):
+        # Newest shelf copies first
+        self._copy_changes.append((
+            "DELETE FROM copies WHERE id IN "
+            "(SELECT id FROM copies WHERE isbn = ? AND borrower IS NULL ORDER BY id DESC LIMIT ?)",
+            (isbn, count),
+        ))
+
+    def add_hold(self, isbn, user_id, priority, ticket, expires_at):
+        self._pending.append((
+            "INSERT OR REPLACE INTO holds (isbn, user_id, priority, ticket, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (isbn, user_id, priority, ticket, expires_at),
+        ))
+
+    def remove_hold(self, isbn, user_id):
+        self._pending.append((
+            "DELETE FROM holds WHERE isbn = ? AND user_id = ?",
+            (isbn, user_id),
+        ))
+
+    def flush(self):
+        """Write queued changes in the current transaction without committing."""
+        if not self._pending and not self._copy_changes:
+            return
+        # Copy changes touch only copies, so they can follow the loans and holds
+        # as long as their own order is kept; each kind then stays one executemany
+        pending = self._pending + self._copy_changes
+        self._pending, self._copy_changes = [], []
+        cursor = self.conn.cursor()
+        for sql, group in groupby(pending, key=lambda stmt: stmt[0]):
+            cursor.executemany(sql, [params for _, params in group])
+
+    def commit(self):
+        """Flush queued changes and commit them."""
+        try:
+            self.flush()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def discard_pending(self):
+        self._pending, self._copy_changes = [], []
+
+    def availability(self, isbn):
+        """(available, total) copies of a title from the inventory, or None if it has never been stocked."""
+        row = self.conn.execute("SELECT available_copies, total_copies FROM inventory WHERE isbn = ?",
+                                (isbn,)).fetchone()
+        return tuple(row) if row else None
+
+    def load(self, now=None):
+        """
+        Read every loan and unexpired hold, grouped by ISBN.
+        Returns:
+            loans: {isbn: [user_id, ...]}
+            holds: {isbn: [(priority, ticket, user_id, expires_at), ...]}
+        """
+        now = time.time() if now is None else now
+        self.conn.execute("DELETE FROM holds WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        self.conn.commit()
+
+        loans = {}
+        for isbn, user_id in self.conn.execute("SELECT isbn, user_id FROM loans ORDER BY id"):
+            loans.setdefault(isbn, []).append(user_id)
+
+        holds = {}
+        rows = self.conn.execute("SELECT isbn, priority, ticket, user_id, expires_at FROM holds")
+        for isbn, priority, ticket, user_id, expires_at in rows:
+            holds.setdefault(isbn, []).append((priority, ticket, user_id, expires_at))
+        return loans, holds
@@ -0,0 +1,209 @@
+import csv
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate, islice
+
+# Rows fetched from a cursor, and written, per step
+CHUNK_SIZE = 50000
+# Bytes buffered by the file object between writes to disk
+WRITE_BUFFER = 1 << 20
+
+COLUMNAR_MAGIC = b"LIBCOL1\x00"
+_FOOTER_LENGTH = struct.Struct("<Q")
+# Stored per text value: end offset of the value in the column's UTF-8 data
+_OFFSET_TYPE = "Q"
+_NUMBER_TYPES = {"int": "q", "float": "d"}
+
+# name -> (SELECT statement, [(column, type)])
+TABLES = {
+    "books": ("SELECT b.isbn, b.title, b.author, COALESCE(i.total_copies, 0), COALESCE(i.available_copies, 0) "
+              "FROM books b LEFT JOIN inventory i ON i.isbn = b.isbn ORDER BY b.id",
+              [("isbn", "text"), ("title", "text"), ("author", "text"), ("copies", "int"), ("available", "int")]),
+    "loans": ("SELECT isbn, user_id, loaned_at FROM loans ORDER BY id",
+              [("isbn", "text"), ("user_id", "text"), ("loaned_at", "float")]),
+}
+GRAPH_SCHEMA = [("book", "text"), ("similar_book", "text")]
+
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".col": "columnar"}
+
+
+class ExportError(Exception):
+    """A columnar file is not one this module wrote, or is damaged."""
+
+
+def detect_format(path):
+    """Writer name for path, from its extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXTENSIONS:
+        raise ValueError(f"Unknown export format for {os.path.basename(path)}; "
+                         f"use one of {', '.join(sorted(EXTENSIONS))}")
+    return EXTENSIONS[ext]
+
+
+def cursor_chunks(conn, sql, size=CHUNK_SIZE):
+    """Rows of sql, size at a time through fetchmany, so the result is never held whole."""
+    cursor = conn.execute(sql)
+    try:
+        while True:
+            rows = cursor.fetchmany(size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cursor.close()
+
+
+def graph_edges(graph):
+    """Each similarity edge of a Graphs once, as (book, similar_book) with book < similar_book."""
+    for book, neighbours in graph.graph.items():
+        for other in neighbours:
+            if book < other:
+                yield book, other
+
+
+def chunked(rows, size=CHUNK_SIZE):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_csv(path, schema, chunks, progress=None):
+    with open(path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(name for name, _ in schema)
+        return _drain(chunks, writer.writerows, progress)
+
+
+def write_jsonl(path, schema, chunks, progress=None):
+    names = [name for name, _ in schema]
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    with open(path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        def write(rows):
+            f.write("".join([encode(dict(zip(names, row))) + "\n" for row in rows]))
+        return _drain(chunks, write, progress)
+
+
+def write_columnar(path, schema, chunks, progress=None):
+    """
+    Parquet-like columnar file: each chunk becomes a row group in which
+    every column is stored contiguously and zlib-compressed, so a reader can
+    load one column without decoding the others. Text columns are an array
+    of end offsets followed by the UTF-8 data; numbers are a packed array.
+    A JSON footer lists the schema and where each column chunk starts; it is
+    followed by its length and the magic again, as in Parquet, so the file
+    is written front to back in one pass. NULL text is stored as "".
+    """
+    groups = []
+    with open(path, "wb", buffering=WRITE_BUFFER) as f:
+        f.write(COLUMNAR_MAGIC)
+
+        def write(rows):
+            columns = []
+            for i, (_, kind) in enumerate(schema):
+                blob = zlib.compress(_encode_column([row[i] for row in rows], kind), 1)
+                columns.append((f.tell(), len(blob)))
+                f.write(blob)
+            groups.append({"rows": len(rows), "columns": columns})
+        count = _drain(chunks, write, progress)
+
+        footer = json.dumps({"schema": schema, "byteorder": sys.byteorder, "row_groups": groups}).encode()
+        f.write(footer)
+        f.write(_FOOTER_LENGTH.pack(len(footer)))
+        f.write(COLUMNAR_MAGIC)
+    return count
+
+
+def _encode_column(values, kind):
+    if kind == "text":
+        encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+        return array(_OFFSET_TYPE, accumulate(map(len, encoded))).tobytes() + b"".join(encoded)
+    return array(_NUMBER_TYPES[kind], values).tobytes()
+
+
+def _drain(chunks, write, progress):
+    count = 0
+    for rows in chunks:
+        write(rows)
+        count += len(rows)
+        if progress is not None:
+            progress(count)
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "columnar": write_columnar}
+
+
+def export_table(conn, table, path, fmt=None, progress=None):
+    """
+    Stream one of TABLES from conn into path (CSV, JSONL or columnar, by
+    extension unless fmt is given). Returns the number of rows written;
+    progress(rows so far) is called after every chunk.
+    """
+    sql, schema = TABLES[table]
+    return WRITERS[fmt or detect_format(path)](path, schema, cursor_chunks(conn, sql), progress)
+
+
+def export_graph(graph, path, fmt=None, progress=None):
+    """Stream the similarity edges of a Graphs into path, like export_table."""
+    return WRITERS[fmt or detect_format(path)](path, GRAPH_SCHEMA, chunked(graph_edges(graph)), progress)
+
+
+class ColumnarFile:
+    """
+    Reader for write_columnar files. Only the footer is read on open; row
+    groups are decoded one at a time as they are iterated.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+                raise ExportError(f"{path} is not a columnar export")
+            tail = len(COLUMNAR_MAGIC) + _FOOTER_LENGTH.size
+            f.seek(-tail, os.SEEK_END)
+            length, = _FOOTER_LENGTH.unpack(f.read(_FOOTER_LENGTH.size))
+            if f.read() != COLUMNAR_MAGIC:
+                raise ExportError(f"{path} is truncated")
+            f.seek(-tail - length, os.SEEK_END)
+            footer = json.loads(f.read(length))
+        self.schema = [tuple(column) for column in footer["schema"]]
+        self.row_groups = footer["row_groups"]
+        self._swap = footer["byteorder"] != sys.byteorder
+
+    @property
+    def num_rows(self):
+        return sum(group["rows"] for group in self.row_groups)
+
+    def read_column(self, name):
+        """Every value of one column, row group by row group."""
+        index = [column for column, _ in self.schema].index(name)
+        with open(self.path, "rb") as f:
+            for group in self.row_groups:
+                yield from self._decode(f, group, index)
+
+    def rows(self):
+        with open(self.path, "rb") as f:
+            for group in self.row_groups:
+                yield from zip(*[self._decode(f, group, i) for i in range(len(self.schema))])
+
+    def _decode(self, f, group, index):
+        offset, length = group["columns"][index]
+        f.seek(offset)
+        blob = zlib.decompress(f.read(length))
+        count, kind = group["rows"], self.schema[index][1]
+        numbers = array(_OFFSET_TYPE if kind == "text" else _NUMBER_TYPES[kind])
+        width = numbers.itemsize * count
+        numbers.frombytes(blob[:width])
+        if self._swap:
+            numbers.byteswap()
+        if kind != "text":
+            return numbers.tolist()
+        data = blob[width:]
+        starts = [0] + numbers.tolist()[:-1]
+        return [data[start:end].decode("utf-8") for start, end in zip(starts, numbers)]
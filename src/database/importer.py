@@ -0,0 +1,233 @@
+import csv
+import json
+import os
+import time
+
+# Rows written (and committed) per executemany
+CHUNK_SIZE = 50000
+# Rejected rows kept, with their line numbers, for the report
+MAX_REPORTED_ERRORS = 20
+
+INSERT_BOOK = "INSERT OR IGNORE INTO books (isbn, title, author) VALUES (?, ?, ?)"
+
+
+def normalize_isbn(raw, strict=False):
+    """
+    ISBN without hyphens or spaces, or None if it is not 10 or 13 characters
+    of the right shape. With strict the check digit has to be right too.
+    """
+    isbn = raw.replace("-", "").replace(" ", "").upper()
+    if len(isbn) == 13 and isbn.isdigit():
+        if strict and sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(isbn)) % 10:
+            return None
+    elif len(isbn) == 10 and isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] == "X"):
+        if strict and sum((10 - i) * (10 if d == "X" else int(d)) for i, d in enumerate(isbn)) % 11:
+            return None
+    else:
+        return None
+    return isbn
+
+
+def read_csv(f):
+    """
+    (line, (isbn, title, author)) for each CSV row. A first row naming an
+    isbn column is a header and the columns are found by name; otherwise
+    they are isbn, title, author in that order.
+    """
+    reader = csv.reader(f)
+    columns = (0, 1, 2)
+    for row in reader:
+        if not row:
+            continue
+        names = [name.strip().lower() for name in row] if reader.line_num == 1 else ()
+        if "isbn" in names:
+            missing = {"isbn", "title", "author"} - set(names)
+            if missing:
+                raise ValueError(f"CSV header has no {', '.join(sorted(missing))} column")
+            columns = tuple(names.index(name) for name in ("isbn", "title", "author"))
+            continue
+        if len(row) <= max(columns):
+            yield reader.line_num, f"expected {max(columns) + 1} columns, got {len(row)}"
+        else:
+            yield reader.line_num, tuple(row[i] for i in columns)
+
+
+def read_jsonl(f):
+    """(line, (isbn, title, author)) for each JSON object, one per line."""
+    for line_num, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_num, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_num, "expected a JSON object"
+            continue
+        yield line_num, tuple(str(record.get(key) or "") for key in ("isbn", "title", "author"))
+
+
+def _subfields(data):
+    """Subfield code -> first value of a mnemonic MARC data field (after its indicators)."""
+    values = {}
+    for part in data[2:].split("$")[1:]:
+        if part:
+            values.setdefault(part[0], part[1:])
+    return values
+
+
+def read_marc_lite(f):
+    """
+    (line, (isbn, title, author)) for each record of a mnemonic MARC (.mrk)
+    file, as written by MarcEdit: one "=TAG  data" line per field, records
+    separated by blank lines or a new =LDR. Only 020 $a (ISBN), 245 $a $b
+    (title) and 100 $a (author) are read; ISBD punctuation is trimmed.
+    """
+    fields, start = None, None
+    for line_num, line in enumerate(f, 1):
+        line = line.rstrip("\r\n")
+        if fields is not None and (not line.strip() or line.startswith("=LDR")):
+            yield start, _marc_record(fields)
+            fields = None
+        if not line.strip():
+            continue
+        if fields is None:
+            fields, start = {}, line_num
+        tag = line[1:4]
+        if line.startswith("=") and tag in ("020", "100", "245"):
+            fields.setdefault(tag, _subfields(line[6:]))
+    if fields is not None:
+        yield start, _marc_record(fields)
+
+
+def _marc_record(fields):
+    isbn = fields.get("020", {}).get("a", "").split(" ")[0]
+    title = fields.get("245", {}).get("a", "").rstrip(" /:;,.")
+    subtitle = fields.get("245", {}).get("b", "").rstrip(" /:;,.")
+    author = fields.get("100", {}).get("a", "").rstrip(" ,.")
+    return isbn, f"{title}: {subtitle}" if subtitle else title, author
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl, "marc": read_marc_lite}
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl",
+              ".mrk": "marc", ".marc": "marc"}
+
+
+def detect_format(path):
+    """Reader name for path, from its extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXTENSIONS:
+        raise ValueError(f"Unknown import format for {os.path.basename(path)}; "
+                         f"use one of {', '.join(sorted(EXTENSIONS))}")
+    return EXTENSIONS[ext]
+
+
+class ImportReport:
+    """
+    Running totals of an import, passed to the progress callback after every
+    chunk and returned at the end.
+    Attributes:
+        read: Records parsed from the file
+        inserted: New books written
+        duplicates: Valid records whose ISBN was already in the catalog or earlier in the file
+        invalid: Records rejected by validation
+        errors: (line, message) for the first MAX_REPORTED_ERRORS rejected records
+        fraction: Share of the file read so far (None if unknown)
+        seconds: Time taken so far
+    """
+    __slots__ = ("read", "inserted", "duplicates", "invalid", "errors", "fraction", "seconds")
+
+    def __init__(self):
+        self.read = self.inserted = self.duplicates = self.invalid = 0
+        self.errors = []
+        self.fraction = None
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return (f"ImportReport(read={self.read}, inserted={self.inserted}, "
+                f"duplicates={self.duplicates}, invalid={self.invalid})")
+
+    def describe(self):
+        """Human-readable summary, for logs and dialogs."""
+        message = (f"Imported {self.inserted:,} of {self.read:,} records in {self.seconds:.1f}s "
+                   f"({self.duplicates:,} duplicate ISBNs skipped, {self.invalid:,} invalid)")
+        for line, error in self.errors:
+            message += f"\n  line {line}: {error}"
+        if self.invalid > len(self.errors):
+            message += f"\n  ... and {self.invalid - len(self.errors):,} more"
+        return message
+
+
+class BookImporter:
+    """
+    Streams records from one of the readers into the books table. Readers
+    yield (line, (isbn, title, author)), or (line, message) for a line they
+    could not parse. Records are validated as they arrive and written chunk_size at a
+    time with one executemany and one commit, so memory holds a single chunk
+    whatever the file size. Duplicate ISBNs, in the file or already in the
+    catalog, are left to the UNIQUE index (INSERT OR IGNORE): the first copy
+    wins and nothing has to be remembered between chunks.
+    """
+    def __init__(self, conn, chunk_size=CHUNK_SIZE, strict_isbn=False, progress=None):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.strict_isbn = strict_isbn
+        self.progress = progress        # progress(report) after every chunk
+        self.position = None            # optional () -> fraction of the input read
+
+    def run(self, records):
+        report = ImportReport()
+        started = time.perf_counter()
+        chunk = []
+        for line, record in records:
+            report.read += 1
+            row = record if isinstance(record, str) else self._validate(record)
+            if isinstance(row, str):
+                report.invalid += 1
+                if len(report.errors) < MAX_REPORTED_ERRORS:
+                    report.errors.append((line, row))
+                continue
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                self._write(chunk, report, started)
+                chunk = []
+        self._write(chunk, report, started)
+        return report
+
+    def _validate(self, record):
+        isbn, title, author = (value.strip() for value in record)
+        if not isbn:
+            return "missing ISBN"
+        normalized = normalize_isbn(isbn, self.strict_isbn)
+        if normalized is None:
+            return f"invalid ISBN {isbn!r}"
+        if not title or not author:
+            return f"missing {'title' if not title else 'author'} for ISBN {isbn}"
+        return normalized, title, author
+
+    def _write(self, chunk, report, started):
+        if chunk:
+            with self.conn:
+                inserted = self.conn.executemany(INSERT_BOOK, chunk).rowcount
+            report.inserted += inserted
+            report.duplicates += len(chunk) - inserted
+        if self.position is not None:
+            report.fraction = self.position()
+        report.seconds = time.perf_counter() - started
+        if self.progress is not None:
+            self.progress(report)
+
+
+def import_file(conn, path, fmt=None, **kwargs):
+    """
+    Import books from path (CSV, JSONL or mnemonic MARC, by extension unless
+    fmt is given) into the books table on conn. kwargs go to BookImporter.
+    """
+    reader = READERS[fmt or detect_format(path)]
+    size = os.path.getsize(path)
+    importer = BookImporter(conn, **kwargs)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        # The binary buffer runs a little ahead of the parser, which is close enough for progress
+        importer.position = lambda: f.buffer.tell() / size if size else 1.0
+        return importer.run(reader(f))
@@ -0,0 +1,198 @@
+import json
+import mmap
+import os
+import queue
+import threading
+import time
+
+SEGMENT_PREFIX = "journal-"
+SEGMENT_SUFFIX = ".jsonl"
+
+_STOP = object()
+
+
+def segment_paths(directory):
+    """Journal segment files in write order."""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(name for name in os.listdir(directory)
+                   if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX))
+    return [os.path.join(directory, name) for name in names]
+
+
+def _segment_number(path):
+    name = os.path.basename(path)
+    return int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+
+def _mapped_lines(path, reverse=False):
+    """Yield the raw lines of one segment through mmap, optionally newest first."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if not reverse:
+                pos = 0
+                while True:
+                    end = mm.find(b"\n", pos)
+                    if end == -1:
+                        break
+                    yield mm[pos:end]
+                    pos = end + 1
+            else:
+                end = len(mm)
+                if mm[end - 1:end] == b"\n":
+                    end -= 1
+                while end > 0:
+                    start = mm.rfind(b"\n", 0, end) + 1
+                    yield mm[start:end]
+                    end = start - 1
+
+
+def iter_journal(directory, reverse=False):
+    """
+    Scan every record in the journal without loading it into memory.
+    A partially written last line (e.g. after a crash) is skipped.
+    """
+    paths = segment_paths(directory)
+    if reverse:
+        paths.reverse()
+    for path in paths:
+        for line in _mapped_lines(path, reverse=reverse):
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def tail(directory, n):
+    """Return the n most recent records, oldest first."""
+    records = []
+    for record in iter_journal(directory, reverse=True):
+        records.append(record)
+        if len(records) >= n:
+            break
+    records.reverse()
+    return records
+
+
+class ActivityJournal:
+    """
+    Append-only JSONL activity journal.
+    Features:
+        - append() only enqueues; a background thread batches the writes
+        - Bounded queue, so memory stays constant however long the history gets
+        - Size-based rotation into journal-000001.jsonl, journal-000002.jsonl, ...
+        - Records are read back through mmap (see iter_journal / tail)
+    """
+    def __init__(self, directory, segment_bytes=4 * 1024 * 1024, max_pending=10000,
+                 batch_size=512):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.batch_size = batch_size
+        os.makedirs(directory, exist_ok=True)
+
+        existing = segment_paths(directory)
+        if existing:
+            self._segment = _segment_number(existing[-1])
+        else:
+            self._segment = 1
+        self._file = None
+        self._size = 0
+        self._open_segment()
+        if self._size >= self.segment_bytes:
+            self._rotate()
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="activity-journal", daemon=True)
+        self._thread.start()
+
+    def _segment_path(self):
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{self._segment:06d}{SEGMENT_SUFFIX}")
+
+    def _open_segment(self):
+        self._file = open(self._segment_path(), "ab", buffering=64 * 1024)
+        self._size = self._file.tell()
+        if self._size:
+            # Terminate a line left half-written by a crash before appending
+            with open(self._segment_path(), "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write(b"\n")
+                    self._size += 1
+
+    def _rotate(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._segment += 1
+        self._open_segment()
+
+    def append(self, action, details, created=None):
+        """Queue a record for writing. Blocks only if the writer falls far behind."""
+        if self._closed:
+            raise ValueError("journal is closed")
+        self._queue.put({
+            "ts": time.time() if created is None else created,
+            "action": action,
+            "details": details,
+        })
+
+    def flush(self):
+        """Wait until every queued record has reached the operating system."""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending records, sync the current segment and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(record is _STOP for record in batch)
+            try:
+                self._write([record for record in batch if record is not _STOP])
+            except OSError as e:
+                # Keep draining so append()/flush() never hang on a bad disk
+                self.last_error = e
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, records):
+        for record in records:
+            line = (json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+            if self._size and self._size + len(line) > self.segment_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._size += len(line)
+        self._file.flush()
+
+    def export_text(self, path):
+        """Stream the whole journal into a plain-text log file."""
+        self.flush()
+        count = 0
+        with open(path, "w", encoding="utf-8", buffering=64 * 1024) as out:
+            for record in iter_journal(self.directory):
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["ts"]))
+                out.write(f"[{stamp}] {record['action']}: {record['details']}\n")
+                count += 1
+        return count
@@ -1,8 +1,60 @@
 import sqlite3
+import time
+import uuid
+
+
+def _timed(metrics, sql, run, *args):
+    """Run one statement, observing its time in sql_query_seconds by verb."""
+    if metrics is None or not metrics.enabled:
+        return run(*args)
+    start = time.perf_counter()
+    try:
+        return run(*args)
+    finally:
+        verb = sql.split(None, 1)[0].lower() if sql.strip() else "empty"
+        metrics.observe("sql_query_seconds", time.perf_counter() - start, op=verb)
+
+
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        return _timed(self.connection.metrics, sql, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return _timed(self.connection.metrics, sql, super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return _timed(self.connection.metrics, "script", super().executescript, sql_script)
+
+
+class TimedConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that reports statement times to a metrics registry
+    (see data_struct.metrics). Covers conn.execute* as well as cursors made
+    with conn.cursor(), so callers that use the connection directly are
+    measured too. Only execution is timed, not fetching the rows.
+    """
+    metrics = None
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return _timed(self.metrics, sql, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return _timed(self.metrics, sql, super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return _timed(self.metrics, "script", super().executescript, sql_script)
+
 
 class SQLiteService:
-    def __init__(self, filename="app_data.db"):
-        self.conn = sqlite3.connect(filename)
+    def __init__(self, filename="app_data.db", metrics=None):
+        if metrics is None:
+            self.conn = sqlite3.connect(filename)
+        else:
+            self.conn = sqlite3.connect(filename, factory=TimedConnection)
+            self.conn.metrics = metrics
         self._ensure_table()
 
     def _ensure_table(self):
@@ -16,6 +68,50 @@ class SQLiteService:
         )
         self.conn.commit()
 
+    def ensure_books_table(self):
+        """Create the library's books table, whose changes are tracked (see track_changes)."""
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS books (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                isbn TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                author TEXT NOT NULL,
+                status TEXT DEFAULT 'Available'
+            )"""
+        )
+        self.conn.commit()
+        self.track_changes("books")
+
+    def track_changes(self, table):
+        """
+        Bump a persistent data version on every insert, update or delete in
+        table. Caches built from the database (e.g. index snapshots) record
+        data_version() and are only trusted while it still matches.
+        """
+        self.conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+            INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0);
+            CREATE TRIGGER IF NOT EXISTS {table}_version_insert AFTER INSERT ON {table}
+            BEGIN UPDATE meta SET value = value + 1 WHERE key = 'data_version'; END;
+            CREATE TRIGGER IF NOT EXISTS {table}_version_update AFTER UPDATE ON {table}
+            BEGIN UPDATE meta SET value = value + 1 WHERE key = 'data_version'; END;
+            CREATE TRIGGER IF NOT EXISTS {table}_version_delete AFTER DELETE ON {table}
+            BEGIN UPDATE meta SET value = value + 1 WHERE key = 'data_version'; END;
+            """
+        )
+        # A random id per database file, so a recreated database never matches an old cache
+        self.conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('database_id', ?)",
+                          (uuid.uuid4().hex,))
+        self.conn.commit()
+
+    def data_version(self):
+        """(database_id, version) for the tables registered with track_changes()."""
+        values = dict(self.conn.execute(
+            "SELECT key, value FROM meta WHERE key IN ('database_id', 'data_version')"))
+        return values["database_id"], int(values["data_version"])
+
     def create_item(self, title, details):
         cur = self.conn.cursor()
         cur.execute("INSERT INTO items (title, details) VALUES (?, ?)", (title, details))
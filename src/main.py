@@ -1,54 +1,147 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import argparse
 import sys
 import os
-import subprocess
-import importlib
+import re
+import time
+from importlib import metadata
 
-def install_requirements():
-    """Install required packages from requirements.txt if they're missing."""
+def check_requirements():
+    """
+    Report packages from requirements.txt that are not installed.
+    Only installed-package metadata is read; pip is never run at startup.
+    The application itself needs nothing beyond the standard library, so a
+    missing package is reported but does not stop the launch.
+    """
     requirements_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'requirements.txt')
-    
+    missing = []
     try:
-        print("Checking and installing requirements...")
-        # Just try to install everything - pip will skip already installed packages
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', requirements_path])
-        print("All required packages have been installed successfully!")
-        return True
+        with open(requirements_path) as f:
+            for line in f:
+                name = re.split(r"[<>=!~\[;\s#]", line.strip(), maxsplit=1)[0]
+                if not name:
+                    continue
+                try:
+                    metadata.version(name)
+                except metadata.PackageNotFoundError:
+                    missing.append(name)
+    except OSError:
+        return missing
+    if missing:
+        print(f"Missing packages: {', '.join(missing)}. Run: pip install -r requirements.txt")
+    return missing
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Library Management System")
+    parser.add_argument("--profile", nargs="?", const="", metavar="DIR",
+                        help="profile Tk callbacks and write flame-graph stacks and slow-callback "
+                             "reports to DIR on exit (default: profile-<timestamp>)")
+    parser.add_argument("--import", dest="import_path", metavar="FILE",
+                        help="bulk-import books from a CSV, JSONL or mnemonic MARC (.mrk) file "
+                             "into the database and exit without starting the GUI")
+    parser.add_argument("--export", nargs=2, metavar=("TABLE", "FILE"),
+                        help="stream the books or loans table to a CSV, JSONL or columnar (.col) "
+                             "file and exit without starting the GUI")
+    parser.add_argument("--format", choices=["csv", "jsonl", "marc", "columnar"],
+                        help="format of the --import (csv, jsonl, marc) or --export (csv, jsonl, "
+                             "columnar) file (default: from its extension)")
+    parser.add_argument("--strict-isbn", action="store_true",
+                        help="reject imported ISBNs whose check digit is wrong")
+    parser.add_argument("--database", metavar="PATH",
+                        help="database to import into or export from (default: the GUI's database)")
+    return parser.parse_args(argv)
+
+def _database_path(args):
+    if args.database is not None:
+        return args.database
+    from ui.gui_appl import IntegratedLibraryGUI
+    return IntegratedLibraryGUI.DB_PATH
+
+def run_import(args):
+    """Headless bulk import for --import; returns the process exit code"""
+    from database.importer import READERS, import_file
+    from database.sqlite import SQLiteService
+    if args.format not in (None, *READERS):
+        print(f"Cannot import {args.format} files", file=sys.stderr)
+        return 2
+
+    def progress(report):
+        print(f"\r{report.read:,} records read ({report.fraction:.0%}), "
+              f"{report.inserted:,} imported", end="", file=sys.stderr, flush=True)
+
+    storage = SQLiteService(_database_path(args))
+    try:
+        storage.ensure_books_table()
+        report = import_file(storage.conn, args.import_path, args.format,
+                             strict_isbn=args.strict_isbn, progress=progress)
+    except (OSError, ValueError) as e:
+        print(f"\nImport failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        storage.conn.close()
+    print(file=sys.stderr)
+    print(report.describe())
+    return 0
+
+def run_export(args):
+    """Headless streaming export for --export; returns the process exit code"""
+    import sqlite3
+    from database.exporter import TABLES, WRITERS, export_table
+    table, path = args.export
+    if table not in TABLES:
+        print(f"Unknown table {table!r}; choose from {', '.join(TABLES)}", file=sys.stderr)
+        return 2
+    if args.format not in (None, *WRITERS):
+        print(f"Cannot export {args.format} files", file=sys.stderr)
+        return 2
+
+    from database.circulation import CirculationStore
+    started = time.perf_counter()
+    conn = sqlite3.connect(_database_path(args))
+    try:
+        # Creates the copy inventory the books export reads, if the GUI has not yet
+        CirculationStore(conn)
+        count = export_table(conn, table, path, args.format,
+                             progress=lambda count: print(f"\r{count:,} rows", end="", file=sys.stderr, flush=True))
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"\nExport failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    print(file=sys.stderr)
+    print(f"Exported {count:,} {table} rows to {path} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+def main():
+    args = parse_args()
+    if args.import_path is not None:
+        sys.exit(run_import(args))
+    if args.export is not None:
+        sys.exit(run_export(args))
+    check_requirements()
+    try:
+        from ui.gui_appl import IntegratedLibraryGUI
+        profiler = None
+        if args.profile is not None:
+            # Installed before the first widget so every callback goes through it
+            from ui.profiling import CallbackProfiler
+            profiler = CallbackProfiler(args.profile or time.strftime("profile-%Y%m%d-%H%M%S")).install()
+        app = IntegratedLibraryGUI(profiler=profiler)
+        app.mainloop()
     except Exception as e:
-        print(f"Error installing requirements: {str(e)}")
+        print(f"Error starting application: {str(e)}")
         try:
-            # Try to show error in GUI if possible
             root = tk.Tk()
             root.withdraw()
-            messagebox.showerror("Installation Error", 
-                               f"Failed to install required packages.\nError: {str(e)}\n\nPlease run: pip install -r requirements.txt")
+            messagebox.showerror("Error", f"Failed to start application.\nError: {str(e)}")
             root.destroy()
         except:
-            # If GUI fails, just print to console
+            # If GUI fails, error was already printed to console
             pass
-        return False
-
-# Add the project root to Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-def main():
-    # First check and install requirements
-    if install_requirements():
-        try:
-            from ui.gui_appl import IntegratedLibraryGUI
-            app = IntegratedLibraryGUI()
-            app.mainloop()
-        except Exception as e:
-            print(f"Error starting application: {str(e)}")
-            try:
-                root = tk.Tk()
-                root.withdraw()
-                messagebox.showerror("Error", f"Failed to start application.\nError: {str(e)}")
-                root.destroy()
-            except:
-                # If GUI fails, error was already printed to console
-                pass
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,289 @@
+import tkinter as tk
+from collections import deque
+
+
+def layout_bst(root, max_nodes=2000):
+    """
+    Position up to max_nodes nodes of the tree rooted at root.
+    Nodes are taken breadth-first, so the top of the tree is always shown;
+    children beyond the cap become collapsed markers standing in for their
+    whole subtree. x is the in-order rank among shown nodes and markers
+    (so nothing overlaps however deep the tree is) and y is the depth.
+    Returns {key: (x, y, parent_key, hidden_node)} where hidden_node is the
+    root of a collapsed subtree, or None for an ordinary node.
+    Runs in O(max_nodes), independent of the size of the tree.
+    """
+    if root is None:
+        return {}
+    shown = {}              # id(node) -> (node, depth, parent_key, collapsed)
+    frontier = deque([(root, 0, None)])
+    while frontier:
+        node, depth, parent_key = frontier.popleft()
+        collapsed = len(shown) >= max_nodes
+        shown[id(node)] = (node, depth, parent_key, collapsed)
+        if not collapsed:
+            for child in (node.left, node.right):
+                if child is not None:
+                    frontier.append((child, depth + 1, node.key))
+
+    layout = {}
+    rank = 0
+    stack = []
+    node = root
+    # Iterative in-order walk limited to shown nodes; markers are leaves
+    while stack or node is not None:
+        while node is not None and id(node) in shown:
+            stack.append(node)
+            node = None if shown[id(node)][3] else node.left
+        node = stack.pop()
+        _, depth, parent_key, collapsed = shown[id(node)]
+        layout[node.key] = (rank, depth, parent_key, node if collapsed else None)
+        rank += 1
+        node = None if collapsed else node.right
+    return layout
+
+
+def subtree_size(node):
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            count += 1
+            stack.append(node.left)
+            stack.append(node.right)
+    return count
+
+
+class BSTCanvasView:
+    """
+    Scalable BST renderer for a tk.Canvas.
+    - The layout is computed once per show() and cached for panning/zooming
+    - Only nodes inside the visible viewport get canvas items
+    - Items are diffed on every redraw instead of clearing the canvas
+    - Zoomed out, nodes are drawn as dots without labels
+    - At most max_nodes nodes are laid out; click a "+N" marker to focus on
+      that subtree, right-click to go back up to the whole tree
+    Drag to pan, mouse wheel to zoom.
+    """
+    SPACING = 50
+    LEVEL_HEIGHT = 60
+    RADIUS = 18
+    LABEL_SCALE = 0.5       # below this zoom level labels are dropped
+    MIN_SCALE, MAX_SCALE = 0.02, 2.0
+
+    def __init__(self, canvas, max_nodes=2000):
+        self.canvas = canvas
+        self.max_nodes = max_nodes
+        self.scale = 1.0
+        self.active = False
+        self.focus_key = None
+        self._bst = None
+        self._layout = {}
+        self._sizes = {}
+        self._drawn = {}        # key -> (state, item ids)
+        self._sync_pending = False
+
+        canvas.bind("<ButtonPress-1>", self._on_press, add="+")
+        canvas.bind("<B1-Motion>", self._on_drag, add="+")
+        canvas.bind("<ButtonRelease-1>", self._on_release, add="+")
+        canvas.bind("<Button-3>", lambda event: self.focus_up(), add="+")
+        canvas.bind("<MouseWheel>", lambda e: self._zoom(e, 1.2 if e.delta > 0 else 1 / 1.2), add="+")
+        canvas.bind("<Button-4>", lambda e: self._zoom(e, 1.2), add="+")
+        canvas.bind("<Button-5>", lambda e: self._zoom(e, 1 / 1.2), add="+")
+        canvas.bind("<Configure>", lambda e: self._schedule_sync(), add="+")
+
+    def show(self, bst):
+        """Lay the tree out again (after a change) and redraw what is visible."""
+        first = not self.active
+        if first:
+            self.canvas.delete("all")
+            self._drawn = {}
+        self.active = True
+        self._bst = bst
+        focus = bst.root
+        if self.focus_key is not None:
+            focus = self._find(self.focus_key)
+            if focus is None:
+                self.focus_key, focus = None, bst.root
+        self._layout = layout_bst(focus, self.max_nodes)
+        self._sizes = {}
+        self._update_scrollregion()
+        if first:
+            self._center_on_root()
+        self._sync()
+
+    def clear(self):
+        """Give the canvas back to the other visualizations."""
+        if not self.active:
+            return
+        self.active = False
+        self.canvas.delete("all")
+        self._drawn = {}
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+
+    def focus_up(self):
+        """Show the whole tree again after focusing on a collapsed subtree."""
+        if self.active and self.focus_key is not None:
+            self.focus_key = None
+            self.canvas.delete("all")
+            self._drawn = {}
+            self.show(self._bst)
+            self._center_on_root()
+
+    def _find(self, key):
+        node = self._bst.root
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
+
+    def _update_scrollregion(self):
+        if not self._layout:
+            width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+            self.canvas.configure(scrollregion=(0, 0, width, height))
+            return
+        pad = self.SPACING
+        width = len(self._layout) * self.SPACING * self.scale
+        depth = max(y for _, y, _, _ in self._layout.values()) + 1
+        height = depth * self.LEVEL_HEIGHT * self.scale
+        self.canvas.configure(scrollregion=(-pad, -pad, width + pad, height + pad))
+
+    def _center_on_root(self):
+        if not self._layout:
+            return
+        root_key = next(key for key, (_, _, parent, _) in self._layout.items() if parent is None)
+        x = self._layout[root_key][0] * self.SPACING * self.scale
+        left, _, right, _ = (float(v) for v in str(self.canvas.cget("scrollregion")).split())
+        view = self.canvas.winfo_width()
+        if right > left:
+            self.canvas.xview_moveto(max(0.0, (x - view / 2 - left) / (right - left)))
+        self.canvas.yview_moveto(0)
+        self._schedule_sync()
+
+    def _point(self, key):
+        x, y, _, _ = self._layout[key]
+        return x * self.SPACING * self.scale, y * self.LEVEL_HEIGHT * self.scale + self.RADIUS
+
+    def _visible_box(self):
+        left = self.canvas.canvasx(0)
+        top = self.canvas.canvasy(0)
+        margin = self.SPACING * self.scale
+        return (left - margin, top - margin,
+                left + self.canvas.winfo_width() + margin, top + self.canvas.winfo_height() + margin)
+
+    def _schedule_sync(self):
+        if self.active and not self._sync_pending:
+            self._sync_pending = True
+            self.canvas.after_idle(self._sync)
+
+    def _sync(self):
+        """Create, move or delete canvas items so they match the visible part of the layout."""
+        self._sync_pending = False
+        if not self.active:
+            return
+        if not self._layout:
+            self.canvas.delete("all")
+            self._drawn = {}
+            self.canvas.create_text(self.canvas.canvasx(self.canvas.winfo_width() / 2),
+                                    self.canvas.canvasy(self.canvas.winfo_height() / 2),
+                                    text="Empty BST", tags="message")
+            return
+        self.canvas.delete("message")
+        x0, y0, x1, y1 = self._visible_box()
+        if self.focus_key is not None:
+            self.canvas.create_text(x0 + self.SPACING * self.scale + 10, y0 + self.SPACING * self.scale + 10,
+                                    anchor=tk.NW, tags="message",
+                                    text=f"Subtree of {self.focus_key} (right-click for the whole tree)")
+        labelled = self.scale >= self.LABEL_SCALE
+        wanted = {}
+        for key, (_, _, parent, hidden) in self._layout.items():
+            x, y = self._point(key)
+            parent_point = self._point(parent) if parent is not None else None
+            inside = x0 <= x <= x1 and y0 <= y <= y1
+            if not inside and parent_point is not None:
+                # Keep edges that cross the viewport
+                px, py = parent_point
+                inside = (min(x, px) <= x1 and max(x, px) >= x0 and min(y, py) <= y1 and max(y, py) >= y0)
+            if inside:
+                wanted[key] = (x, y, parent_point, hidden is not None, labelled)
+
+        for key in list(self._drawn):
+            if key not in wanted:
+                self.canvas.delete(*self._drawn.pop(key)[1])
+        for key, state in wanted.items():
+            drawn = self._drawn.get(key)
+            if drawn is not None and drawn[0] == state:
+                continue
+            if drawn is not None:
+                self.canvas.delete(*drawn[1])
+            self._drawn[key] = (state, self._draw(key, *state))
+
+    def _draw(self, key, x, y, parent_point, collapsed, labelled):
+        items = []
+        r = self.RADIUS * self.scale if labelled else max(2, 4 * self.scale)
+        if parent_point is not None:
+            px, py = parent_point
+            items.append(self.canvas.create_line(px, py + r, x, y - r, fill="#888888"))
+        tag = ("bst_collapsed", f"key={key}") if collapsed else ("bst_node",)
+        fill = "#f5d76e" if collapsed else "lightblue"
+        items.append(self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=fill,
+                                             outline="" if not labelled else "black", tags=tag))
+        if labelled:
+            text = f"+{self._hidden_count(key)}" if collapsed else str(key)
+            items.append(self.canvas.create_text(x, y, text=text[:10], tags=tag,
+                                                 font=("Helvetica", max(6, int(9 * self.scale)))))
+        return tuple(items)
+
+    def _hidden_count(self, key):
+        # Counted lazily, only for markers that are actually on screen
+        if key not in self._sizes:
+            self._sizes[key] = subtree_size(self._layout[key][3])
+        return self._sizes[key]
+
+    def _on_press(self, event):
+        if not self.active:
+            return
+        self._press = (event.x, event.y)
+        self.canvas.scan_mark(event.x, event.y)
+
+    def _on_drag(self, event):
+        if not self.active:
+            return
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self._schedule_sync()
+
+    def _on_release(self, event):
+        if not self.active:
+            return
+        press = getattr(self, "_press", None)
+        if press is None or abs(event.x - press[0]) > 3 or abs(event.y - press[1]) > 3:
+            return  # it was a drag
+        item = self.canvas.find_withtag("current")
+        tags = self.canvas.gettags(item[0]) if item else ()
+        if "bst_collapsed" in tags:
+            key_tag = next(tag for tag in tags if tag.startswith("key="))
+            key = key_tag[4:]
+            self.focus_key = next((k for k in self._layout if str(k) == key), None)
+            self.canvas.delete("all")
+            self._drawn = {}
+            self.show(self._bst)
+            self._center_on_root()
+
+    def _zoom(self, event, factor):
+        if not self.active:
+            return
+        scale = min(self.MAX_SCALE, max(self.MIN_SCALE, self.scale * factor))
+        if scale == self.scale:
+            return
+        # Keep the point under the mouse where it is
+        cx, cy = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        ratio = scale / self.scale
+        self.scale = scale
+        self._update_scrollregion()
+        left, top, right, bottom = (float(v) for v in str(self.canvas.cget("scrollregion")).split())
+        self.canvas.xview_moveto(max(0.0, (cx * ratio - event.x - left) / max(1.0, right - left)))
+        self.canvas.yview_moveto(max(0.0, (cy * ratio - event.y - top) / max(1.0, bottom - top)))
+        self._sync()
@@ -1,11 +1,15 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+import csv
 import sys
 import os
-import subprocess
-import importlib
 import sqlite3
+import threading
+import queue
+import time
 from datetime import datetime
+from collections import Counter, deque
+from itertools import groupby, islice
 
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,10 +17,24 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from data_struct.Bsearch import BinarySearchTree
 from data_struct.BookDictionary import BookDictionary
 from data_struct.linkedList import BookLinkedList
-from data_struct.queue import LibrarySystem
+from data_struct.queue import (LibrarySystem, PRIORITY_STAFF, PRIORITY_COURSE_RESERVE, PRIORITY_PATRON,
+                               CHECKED_OUT, WAITLISTED)
 from data_struct.Stacks import ActivityStack
+from data_struct.undo import UndoManager
 from data_struct.graph import Graphs
+from data_struct.snapshot import save_snapshot, load_snapshot, SnapshotError
+from data_struct.metrics import Metrics, SIZE_BUCKETS
+from data_struct.query_cache import QueryCache
+from data_struct.fuzzy import FuzzyCatalog
 from database.sqlite import SQLiteService
+from database.journal import ActivityJournal
+from database.circulation import CirculationStore, copy_totals
+from database.importer import detect_format, import_file
+from database import exporter
+from .queue_panel import QueueStatusPanel
+from .bst_view import BSTCanvasView
+from .metrics_panel import MetricsPanel
+from .live_search import LiveSearchPanel
 
 class ModernStyle:
     # Color scheme
@@ -101,7 +119,39 @@ class ModernStyle:
     }
 
 class IntegratedLibraryGUI(tk.Tk):
-    def __init__(self):
+    HOLD_PRIORITIES = {
+        "Patron": PRIORITY_PATRON,
+        "Course Reserve": PRIORITY_COURSE_RESERVE,
+        "Staff": PRIORITY_STAFF,
+    }
+    MAX_HOLDS_PER_USER = 10
+    HOLD_DAYS = 14
+
+    # Lines kept in the activity log widget; full history lives in the journal
+    LOG_WIDGET_LINES = 1000
+
+    # Binary snapshot of the catalog indexes, used for fast warm starts
+    SNAPSHOT_PATH = "library_snapshot.bin"
+    SNAPSHOT_INTERVAL_MS = 5 * 60 * 1000
+
+    DB_PATH = "integrated_library.db"
+    # Books handed to the treeview per event-loop turn while filling it
+    TREE_FILL_CHUNK = 500
+    # Progress is reported every this many books during the background load
+    LOAD_PROGRESS_STEP = 5000
+    # Memory budget for cached search results and recommendations
+    QUERY_CACHE_BYTES = 16 * 1024 * 1024
+    # Operations that change what a search or recommendation can return
+    CACHE_INVALIDATING_OPS = {"add", "delete", "update", "connect", "disconnect"}
+    # Closest matches listed by Fuzzy Search
+    FUZZY_RESULTS = 10
+    # Authors listed in the Statistics report
+    TOP_AUTHORS = 10
+    # Most copies the Checkout tab adds or withdraws at once
+    MAX_STOCK_CHANGE = 1000
+
+    def __init__(self, profiler=None):
+        self._started = time.perf_counter()
         super().__init__()
         self.title("📚 Library Management System")
         self.geometry("1400x900")
@@ -119,44 +169,144 @@ class IntegratedLibraryGUI(tk.Tk):
         self.style.configure("Title.TLabel",
                            font=("Helvetica", 14, "bold"))
         
+        # Durable activity history, written in the background
+        self.journal = ActivityJournal("activity_journal")
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Off unless LIBRARY_METRICS is set or switched on in the Metrics tab
+        self.metrics = self._new_metrics(bool(os.environ.get("LIBRARY_METRICS")))
+        # Set by main.py --profile; see ui/profiling.py
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.on_slow = self._on_slow_callback
+
+        # Database first: the checkout engine writes through to it
+        self.storage = self._init_database()
+        self.circulation = CirculationStore(self.storage.conn)
+        self._snapshot_version = None
+
         # Initialize all data structures
-        self.bst = BinarySearchTree(log_fn=self._log)
+        self.bst = BinarySearchTree(log_fn=self._trace, metrics=self.metrics)
         self.book_dict = BookDictionary()
         self.linked_list = BookLinkedList()
-        self.queue_system = LibrarySystem()
-        self.activity_stack = ActivityStack()
-        self.book_graph = Graphs()  # Initialize graph
-        self.storage = self._init_database()
+        self.queue_system = self._new_queue_system()
+        self.activity_stack = ActivityStack(max_size=5000)
+        self.undo_manager = UndoManager(self._apply_ops, max_size=5000, history=self.activity_stack)
+        self.book_graph = Graphs(metrics=self.metrics)  # Initialize graph
+        # Repeated searches and recommendations; every catalog write bumps its generation
+        self.query_cache = QueryCache(self.QUERY_CACHE_BYTES)
+        # Trigram index for Fuzzy Search, built on its first use
+        self.fuzzy_index = None
+        # Columnar snapshot behind the Statistics report, built on its first use
+        self.analytics = None
+        self._analytics_available = True
+
+        # Widgets on lazily built tabs stay None until the tab is first shown
+        self.log_text = self.stats_text = None
+        self.viz_canvas = self.viz_type = None
+        self.queue_panel = self.metrics_panel = self.live_search = None
+        self._log_backlog = deque(maxlen=self.LOG_WIDGET_LINES)
+        self._books_fill = None
+        self.loading = False
 
         # Create main interface
         self.create_main_interface()
 
-        # Load existing data
-        self._load_existing_data()
+        # The window paints right away; the catalog loads on a background thread
+        self._start_background_load()
+        self.after(self.SNAPSHOT_INTERVAL_MS, self._periodic_snapshot)
+
+    @staticmethod
+    def _new_metrics(enabled):
+        metrics = Metrics(enabled)
+        metrics.describe("bst_lookup_depth", "Nodes visited per BST lookup", SIZE_BUCKETS)
+        metrics.describe("recommendation_nodes_visited", "Books reached per recommendation BFS", SIZE_BUCKETS)
+        metrics.describe("search_seconds", "Search latency by strategy")
+        metrics.describe("sql_query_seconds", "SQL statement execution time by verb")
+        metrics.describe("catalog_load_seconds", "Time to build the catalog indexes by source")
+        metrics.describe("startup_ready_seconds", "Launch to catalog ready")
+        metrics.describe("slow_callbacks_total", "Tk callbacks over the --profile threshold")
+        return metrics
+
+    def _new_queue_system(self):
+        """Checkout engine with the library's hold policy"""
+        system = LibrarySystem(max_holds_per_user=self.MAX_HOLDS_PER_USER, hold_days=self.HOLD_DAYS,
+                               store=self.circulation)
+        system.subscribe(self._on_circulation_events, batch=True)
+        return system
+
+    def _on_circulation_events(self, results):
+        """Log checkout engine outcomes and refresh the affected queue and book rows"""
+        book_ids = {result.book_id for result in results}
+        if self.queue_panel is not None:
+            self.queue_panel.update_books(book_ids)
+        if self.analytics is not None:
+            self.analytics.apply(results)
+        for book_id in book_ids:
+            if self.books_tree.exists(book_id):
+                self.books_tree.set(book_id, "Available", self._availability_text(book_id))
+        if len(results) == 1:
+            self._log(results[0].describe())
+            return
+        counts = Counter(result.status for result in results)
+        summary = ", ".join(f"{count} {status.replace('_', ' ')}" for status, count in counts.most_common())
+        self._log(f"Processed {len(results)} circulation events: {summary}")
 
     def _init_database(self):
         """Initialize database with proper book schema"""
-        storage = SQLiteService("integrated_library.db")
-        # Create books table if not exists
-        storage.conn.execute("""
-            CREATE TABLE IF NOT EXISTS books (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                isbn TEXT UNIQUE NOT NULL,
-                title TEXT NOT NULL,
-                author TEXT NOT NULL,
-                status TEXT DEFAULT 'Available'
-            )
-        """)
-        storage.conn.commit()
+        storage = SQLiteService(self.DB_PATH, metrics=self.metrics)
+        # Any change to books invalidates the catalog snapshot
+        storage.ensure_books_table()
         return storage
 
-    def _log(self, msg):
+    def _log(self, msg, journal=True):
         """Enhanced logging with timestamp"""
+        if journal:
+            self.journal.append("LOG", msg)
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_msg = f"[{timestamp}] {msg}"
+        if self.log_text is None:
+            # Shown once the Visualizer tab is opened
+            self._log_backlog.append(log_msg)
+            return
         self.log_text.insert(tk.END, log_msg + "\n")
+        # Keep the widget bounded; older lines are still in the journal
+        lines = int(self.log_text.index("end-1c").split(".")[0])
+        if lines > self.LOG_WIDGET_LINES:
+            self.log_text.delete("1.0", f"{lines - self.LOG_WIDGET_LINES + 1}.0")
         self.log_text.see(tk.END)
 
+    def _trace(self, msg):
+        """Step-by-step data structure tracing, shown in the log but not journaled"""
+        self._log(msg, journal=False)
+
+    def _on_slow_callback(self, label, seconds):
+        """A Tk callback blocked the event loop for longer than the profiler's threshold"""
+        self.metrics.inc("slow_callbacks_total")
+        self._log(f"Slow callback: {label} blocked the UI for {seconds * 1000:.0f} ms", journal=False)
+
+    def _on_close(self):
+        """Save the catalog snapshot, write any profile and flush the activity journal before the window goes away"""
+        try:
+            self._save_snapshot()
+        finally:
+            try:
+                self._write_profile()
+                self.journal.close()
+            finally:
+                self.destroy()
+
+    def _write_profile(self):
+        """Write the --profile reports; the outcome goes to the log and the journal"""
+        if self.profiler is None:
+            return
+        try:
+            path = os.path.abspath(self.profiler.write())
+        except OSError as e:
+            self._log(f"Could not write profile: {e}")
+            return
+        self._log(f"Profile written to {path}")
+
     def create_main_interface(self):
         """Create the main tabbed interface"""
         # Create header
@@ -172,16 +322,43 @@ class IntegratedLibraryGUI(tk.Tk):
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
-        # Create tabs
-        self.create_book_management_tab()
-        self.create_search_operations_tab()
-        self.create_checkout_system_tab()
-        self.create_data_structures_tab()
+        # Variables read by code outside their own tab
+        self.search_var = tk.StringVar()
+        self.checkout_book_var = tk.StringVar()
+        self.user_var = tk.StringVar()
 
-    def create_book_management_tab(self):
-        """Main book management operations"""
+        # Only the Books tab is built now; the others on first selection
+        self._lazy_tabs = {}
+        self._add_tab("📚 Books", self.create_book_management_tab, lazy=False)
+        self._add_tab("🔍 Search", self.create_search_operations_tab)
+        self._add_tab("📋 Checkout", self.create_checkout_system_tab)
+        self._add_tab("🔧 Visualizer", self.create_data_structures_tab)
+        self._add_tab("📈 Metrics", self.create_metrics_tab)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+    def _add_tab(self, text, builder, lazy=True):
         frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="📚 Books")
+        self.notebook.add(frame, text=text)
+        if lazy:
+            self._lazy_tabs[builder.__name__] = (frame, builder)
+        else:
+            builder(frame)
+
+    def _ensure_tab(self, builder):
+        """Build a lazy tab now if it has not been shown yet"""
+        pending = self._lazy_tabs.pop(builder.__name__, None)
+        if pending is not None:
+            frame, builder = pending
+            builder(frame)
+
+    def _on_tab_changed(self, event=None):
+        selected = self.notebook.nametowidget(self.notebook.select())
+        for frame, builder in list(self._lazy_tabs.values()):
+            if frame is selected:
+                self._ensure_tab(builder)
+
+    def create_book_management_tab(self, frame):
+        """Main book management operations"""
 
         # Input section with modern styling
         input_frame = ttk.LabelFrame(frame, text="Add/Edit Book", padding=15)
@@ -230,6 +407,30 @@ class IntegratedLibraryGUI(tk.Tk):
         clear_btn.pack(side=tk.LEFT, padx=5)
         clear_btn.config(command=self.clear_fields)
 
+        undo_btn = tk.Button(button_frame, text="Undo", **ModernStyle.BUTTON_STYLE)
+        undo_btn.pack(side=tk.LEFT, padx=5)
+        undo_btn.config(command=self.undo_last)
+
+        redo_btn = tk.Button(button_frame, text="Redo", **ModernStyle.BUTTON_STYLE)
+        redo_btn.pack(side=tk.LEFT, padx=5)
+        redo_btn.config(command=self.redo_last)
+
+        import_btn = tk.Button(button_frame, text="Import Books...", **ModernStyle.INFO_BUTTON)
+        import_btn.pack(side=tk.LEFT, padx=5)
+        import_btn.config(command=self.import_books)
+
+        export_btn = tk.Button(button_frame, text="Export...", **ModernStyle.INFO_BUTTON)
+        export_btn.pack(side=tk.LEFT, padx=5)
+        export_menu = tk.Menu(export_btn, tearoff=0)
+        export_menu.add_command(label="Books...", command=lambda: self.export_data("books"))
+        export_menu.add_command(label="Loans...", command=lambda: self.export_data("loans"))
+        export_menu.add_command(label="Similarity graph...", command=lambda: self.export_data("graph"))
+        export_btn.config(command=lambda: export_menu.tk_popup(
+            export_btn.winfo_rootx(), export_btn.winfo_rooty() + export_btn.winfo_height()))
+
+        self.bind_all("<Control-z>", lambda e: self.undo_last())
+        self.bind_all("<Control-y>", lambda e: self.redo_last())
+
         # Books display with modern styling
         display_frame = ttk.LabelFrame(frame, text="Book Collection", padding=15)
         display_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
@@ -245,7 +446,7 @@ class IntegratedLibraryGUI(tk.Tk):
                        font=('Helvetica', 10, 'bold'))
 
         # Treeview for books
-        columns = ("ISBN", "Title", "Author", "Status")
+        columns = ("ISBN", "Title", "Author", "Available")
         self.books_tree = ttk.Treeview(display_frame, columns=columns, show="headings",
                                       height=15, style="Modern.Treeview")
 
@@ -288,6 +489,11 @@ class IntegratedLibraryGUI(tk.Tk):
                               **ModernStyle.INFO_BUTTON)
         connect_btn.pack(side=tk.LEFT, padx=5)
 
+        auto_connect_btn = tk.Button(similar_frame, text="Auto-Connect All",
+                                     command=self.auto_connect_similar_books,
+                                     **ModernStyle.BUTTON_STYLE)
+        auto_connect_btn.pack(side=tk.LEFT, padx=5)
+
         # Recommendations Section
         recommendations_frame = ttk.LabelFrame(input_frame, text="Book Recommendations", padding=10)
         recommendations_frame.pack(fill=tk.X, pady=10)
@@ -295,10 +501,8 @@ class IntegratedLibraryGUI(tk.Tk):
         self.recommendations_text = tk.Text(recommendations_frame, height=5, width=40)
         self.recommendations_text.pack(fill=tk.X, pady=5)
 
-    def create_search_operations_tab(self):
+    def create_search_operations_tab(self, frame):
         """Search operations using different data structures"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="🔍 Search")
 
         # Search controls with modern styling
         search_frame = ttk.LabelFrame(frame, text="Search Options", padding=15)
@@ -309,7 +513,6 @@ class IntegratedLibraryGUI(tk.Tk):
         grid.pack(fill=tk.X, pady=10)
 
         ttk.Label(grid, text="Search Term:", style="Modern.TLabel").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-        self.search_var = tk.StringVar()
         search_entry = ttk.Entry(grid, textvariable=self.search_var, width=40, style="Modern.TEntry")
         search_entry.grid(row=0, column=1, padx=5, pady=5)
 
@@ -334,6 +537,10 @@ class IntegratedLibraryGUI(tk.Tk):
         linked_btn.pack(side=tk.LEFT, padx=5)
         linked_btn.config(command=self.linked_search)
 
+        fuzzy_btn = tk.Button(button_frame, text="Fuzzy Search", **ModernStyle.BUTTON_STYLE)
+        fuzzy_btn.pack(side=tk.LEFT, padx=5)
+        fuzzy_btn.config(command=self.fuzzy_search)
+
         # Search results with modern styling
         results_frame = ttk.LabelFrame(frame, text="Search Results", padding=15)
         results_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
@@ -349,10 +556,26 @@ class IntegratedLibraryGUI(tk.Tk):
         )
         self.search_results.pack(fill=tk.BOTH, expand=True)
 
-    def create_checkout_system_tab(self):
+        # Search-as-you-type against a prefix index kept on a worker thread
+        self.live_search = LiveSearchPanel(search_frame, self.search_var, self.search_type,
+                                           self.search_results, self._live_search_lookup,
+                                           self._read_catalog_rows)
+        self.live_search.pack(fill=tk.X)
+
+    def _live_search_lookup(self, isbn):
+        book = self.book_dict.search_by_isbn(isbn)
+        return (book['title'], book['author']) if book else None
+
+    def _read_catalog_rows(self):
+        """Every (isbn, title, author) row, on a private connection so it can run off the Tk thread"""
+        conn = sqlite3.connect(self.DB_PATH)
+        try:
+            return conn.execute("SELECT isbn, title, author FROM books").fetchall()
+        finally:
+            conn.close()
+
+    def create_checkout_system_tab(self, frame):
         """Checkout system using queue"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="📋 Checkout")
 
         # Checkout controls with modern styling
         checkout_frame = ttk.LabelFrame(frame, text="Checkout/Return Books", padding=15)
@@ -370,7 +593,6 @@ class IntegratedLibraryGUI(tk.Tk):
         isbn_tooltip.pack(side=tk.LEFT, padx=2)
         self.create_tooltip(isbn_tooltip, "Enter the 13-digit ISBN number of the book")
         
-        self.checkout_book_var = tk.StringVar()
         checkout_entry = ttk.Entry(grid, textvariable=self.checkout_book_var, width=30, style="Modern.TEntry")
         checkout_entry.grid(row=0, column=2, padx=5, pady=5)
 
@@ -382,7 +604,6 @@ class IntegratedLibraryGUI(tk.Tk):
         username_tooltip.pack(side=tk.LEFT, padx=2)
         self.create_tooltip(username_tooltip, "Enter the borrower's username (e.g., 'john_smith')")
 
-        self.user_var = tk.StringVar()
         user_entry = ttk.Entry(grid, textvariable=self.user_var, width=30, style="Modern.TEntry")
         user_entry.grid(row=1, column=2, padx=5, pady=5)
 
@@ -390,6 +611,21 @@ class IntegratedLibraryGUI(tk.Tk):
         ttk.Label(grid, text="Example: john_smith", foreground="gray", style="Modern.TLabel").grid(
             row=2, column=2, padx=5, sticky=tk.W)
 
+        # Hold priority used if the user has to join the waitlist
+        ttk.Label(grid, text="Hold Priority:", style="Modern.TLabel").grid(
+            row=3, column=0, columnspan=2, padx=5, pady=5, sticky=tk.W)
+        self.priority_type = ttk.Combobox(grid, values=list(self.HOLD_PRIORITIES), width=15,
+                                          state="readonly", style="Modern.TCombobox")
+        self.priority_type.grid(row=3, column=2, padx=5, pady=5, sticky=tk.W)
+        self.priority_type.set("Patron")
+
+        # Copies bought or withdrawn by the stock buttons
+        ttk.Label(grid, text="Copies:", style="Modern.TLabel").grid(
+            row=4, column=0, columnspan=2, padx=5, pady=5, sticky=tk.W)
+        self.copies_var = tk.StringVar(value="1")
+        ttk.Spinbox(grid, from_=1, to=self.MAX_STOCK_CHANGE, textvariable=self.copies_var, width=8).grid(
+            row=4, column=2, padx=5, pady=5, sticky=tk.W)
+
         # Checkout buttons with modern styling
         button_frame = ttk.Frame(checkout_frame)
         button_frame.pack(pady=10)
@@ -402,23 +638,28 @@ class IntegratedLibraryGUI(tk.Tk):
         return_btn.pack(side=tk.LEFT, padx=5)
         return_btn.config(command=self.return_book)
 
+        batch_btn = tk.Button(button_frame, text="Process Batch File...", **ModernStyle.INFO_BUTTON)
+        batch_btn.pack(side=tk.LEFT, padx=5)
+        batch_btn.config(command=self.process_batch_file)
+
+        add_copies_btn = tk.Button(button_frame, text="Add Copies", **ModernStyle.BUTTON_STYLE)
+        add_copies_btn.pack(side=tk.LEFT, padx=5)
+        add_copies_btn.config(command=lambda: self.change_stock(1))
+
+        withdraw_btn = tk.Button(button_frame, text="Withdraw Copies", **ModernStyle.DANGER_BUTTON)
+        withdraw_btn.pack(side=tk.LEFT, padx=5)
+        withdraw_btn.config(command=lambda: self.change_stock(-1))
+
         # Queue display
         queue_frame = ttk.LabelFrame(frame, text="Current Checkouts and Waitlist", padding=15)
         queue_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
-        self.queue_display = scrolledtext.ScrolledText(
-            queue_frame,
-            height=15,
-            wrap=tk.WORD,
-            font=("Helvetica", 10),
-            bg=ModernStyle.LIGHT
-        )
-        self.queue_display.pack(fill=tk.BOTH, expand=True)
+        self.queue_panel = QueueStatusPanel(queue_frame)
+        self.queue_panel.pack(fill=tk.BOTH, expand=True)
+        self.queue_panel.load(self.queue_system)
 
-    def create_data_structures_tab(self):
+    def create_data_structures_tab(self, frame):
         """Data structures visualization and logs"""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text="🔧 Visualizer")
 
         # Create visualization canvas with modern styling
         canvas_frame = ttk.LabelFrame(frame, text="Data Structure Visualization", padding=15)
@@ -433,6 +674,7 @@ class IntegratedLibraryGUI(tk.Tk):
             borderwidth=1
         )
         self.viz_canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.bst_view = BSTCanvasView(self.viz_canvas)
         
         # Control panel for visualization with modern styling
         control_frame = ttk.Frame(canvas_frame)
@@ -507,6 +749,20 @@ class IntegratedLibraryGUI(tk.Tk):
         save_btn.pack(side=tk.LEFT, padx=5)
         save_btn.config(command=self.save_log)
 
+        for line in self._log_backlog:
+            self.log_text.insert(tk.END, line + "\n")
+        self._log_backlog.clear()
+        self.log_text.see(tk.END)
+        self.refresh_statistics()
+
+    def create_metrics_tab(self, frame):
+        """Live counters and latency histograms"""
+        metrics_frame = ttk.LabelFrame(frame, text="Performance Metrics", padding=15)
+        metrics_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        self.metrics_panel = MetricsPanel(metrics_frame, self.metrics)
+        self.metrics_panel.pack(fill=tk.BOTH, expand=True)
+        self.metrics_panel.refresh()
+
     def create_tooltip(self, widget, text):
         """Create a tooltip for a widget"""
         def show_tooltip(event):
@@ -550,6 +806,8 @@ class IntegratedLibraryGUI(tk.Tk):
 
     def add_book(self):
         """Add a new book"""
+        if self._busy_loading():
+            return
         isbn = self.isbn_var.get().strip()
         title = self.title_var.get().strip()
         author = self.author_var.get().strip()
@@ -559,18 +817,11 @@ class IntegratedLibraryGUI(tk.Tk):
             return
         
         try:
-            # Add to database and data structures
-            self.storage.conn.execute(
-                "INSERT INTO books (isbn, title, author) VALUES (?, ?, ?)",
-                (isbn, title, author)
-            )
-            self.storage.conn.commit()
-            
-            # Update all data structures
-            self.bst.insert(isbn, {"title": title, "author": author})
-            self.book_dict.add_book(isbn, title, author)
-            self.linked_list.add_book(title, author, isbn)
-            self.book_graph.add_book_node(title)  # Add to graph
+            # Add to database and all data structures
+            forward = [("add", isbn, title, author)]
+            self._apply_ops(forward)
+            self.undo_manager.record("ADD", f"Added book: {title} (ISBN: {isbn})",
+                                     forward, [("delete", isbn, title, author)])
             
             self._log(f"Added book: {title} (ISBN: {isbn})")
             self.refresh_books_display()
@@ -578,7 +829,7 @@ class IntegratedLibraryGUI(tk.Tk):
             self.clear_fields()
             
             # Update visualization if BST is selected
-            if self.viz_type.get() == "BST":
+            if self._showing_viz("BST"):
                 self.update_visualization()
             
         except sqlite3.IntegrityError:
@@ -586,8 +837,148 @@ class IntegratedLibraryGUI(tk.Tk):
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    def import_books(self):
+        """
+        Bulk-load a CSV, JSONL or mnemonic MARC file on a worker thread, then
+        rebuild the catalog structures from the table in one pass instead of
+        inserting the new books one by one. Changes are refused meanwhile.
+        Imported books are not an undo step.
+        """
+        if self._busy_loading():
+            return
+        path = filedialog.askopenfilename(
+            title="Import books",
+            filetypes=[("Catalog files", "*.csv *.jsonl *.ndjson *.json *.mrk *.marc"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            fmt = detect_format(path)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.loading = True
+        self.status_var.set("Importing books...")
+        results = queue.Queue()
+
+        def worker():
+            conn = sqlite3.connect(self.DB_PATH)
+            try:
+                results.put(("done", import_file(
+                    conn, path, fmt,
+                    progress=lambda report: results.put(("progress", report.read, report.fraction)))))
+            except Exception as e:
+                results.put(("error", e))
+            finally:
+                conn.close()
+
+        threading.Thread(target=worker, name="catalog-import", daemon=True).start()
+        self.after(50, self._poll_import, results)
+
+    def _poll_import(self, results):
+        message = None
+        while True:
+            try:
+                message = results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "progress":
+                _, read, fraction = message
+                self.status_var.set(f"Importing books... {read:,} records ({fraction:.0%})")
+            else:
+                break
+        if message is None or message[0] == "progress":
+            self.after(50, self._poll_import, results)
+            return
+
+        if message[0] == "error":
+            self.loading = False
+            self.status_var.set("Ready")
+            self._log(f"Import failed: {message[1]}")
+            messagebox.showerror("Error", f"Import failed: {message[1]}")
+            return
+        report = message[1]
+        self._log(report.describe())
+        # The new rows are indexed by the same bulk build as a cold start
+        self._start_background_load(startup=False)
+        messagebox.showinfo("Import Complete", report.describe())
+
+    def export_data(self, what):
+        """
+        Stream books, loans or the similarity graph to CSV, JSONL or a columnar
+        file on a worker thread. Tables are read through the worker's own
+        connection a chunk at a time; changes are refused until it finishes,
+        so the export is consistent and never holds up a write.
+        """
+        if self._busy_loading():
+            return
+        if what == "graph" and getattr(self, "_similarity_job", None) is not None:
+            messagebox.showinfo("Info", "Wait for the similarity job to finish before exporting the graph")
+            return
+        path = filedialog.asksaveasfilename(
+            title=f"Export {what}", initialfile=f"{what}.csv", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Columnar", "*.col")])
+        if not path:
+            return
+        try:
+            fmt = exporter.detect_format(path)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.loading = True
+        self.status_var.set(f"Exporting {what}...")
+        results = queue.Queue()
+        def progress(count):
+            results.put(("progress", count))
+
+        def worker():
+            started = time.perf_counter()
+            try:
+                if what == "graph":
+                    count = exporter.export_graph(self.book_graph, path, fmt, progress)
+                else:
+                    conn = sqlite3.connect(self.DB_PATH)
+                    try:
+                        count = exporter.export_table(conn, what, path, fmt, progress)
+                    finally:
+                        conn.close()
+                results.put(("done", count, time.perf_counter() - started))
+            except Exception as e:
+                results.put(("error", e))
+
+        threading.Thread(target=worker, name="export", daemon=True).start()
+        self.after(50, self._poll_export, results, what, path)
+
+    def _poll_export(self, results, what, path):
+        message = None
+        while True:
+            try:
+                message = results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "progress":
+                self.status_var.set(f"Exporting {what}... {message[1]:,} rows")
+            else:
+                break
+        if message is None or message[0] == "progress":
+            self.after(50, self._poll_export, results, what, path)
+            return
+
+        self.loading = False
+        self.status_var.set("Ready")
+        if message[0] == "error":
+            self._log(f"Export of {what} failed: {message[1]}")
+            messagebox.showerror("Error", f"Export failed: {message[1]}")
+            return
+        _, count, seconds = message
+        self._log(f"Exported {count:,} {what} rows to {path} in {seconds:.1f}s")
+        messagebox.showinfo("Export Complete", f"Exported {count:,} rows to {os.path.basename(path)}")
+
     def update_book(self):
         """Update selected book"""
+        if self._busy_loading():
+            return
         selection = self.books_tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Please select a book to update")
@@ -601,18 +992,25 @@ class IntegratedLibraryGUI(tk.Tk):
             messagebox.showerror("Error", "Please fill in all fields")
             return
 
-        try:
-            # Update in database
-            cursor = self.storage.conn.cursor()
-            cursor.execute("UPDATE books SET title=?, author=? WHERE isbn=?",
-                           (title, author, isbn))
-            self.storage.conn.commit()
+        old = self.book_dict.search_by_isbn(isbn)
+        if not old:
+            messagebox.showerror("Error", "Book not found")
+            return
 
-            # Update in data structures (simplified approach)
-            self._reload_data_structures()
+        try:
+            # Update database and data structures in place
+            forward = [("update", isbn, title, author)]
+            inverse = ("update", isbn, old["title"], old["author"])
+            if title != old["title"] and title in self.book_graph.graph:
+                # The rename merges two graph nodes; keep both as they are so undo can split them
+                inverse += (self.book_graph.node_edges((old["title"], title)),)
+            self._apply_ops(forward)
+            self.undo_manager.record("UPDATE", f"Updated book: {title} by {author} (ISBN: {isbn})",
+                                     forward, [inverse])
 
             self._log(f"Updated book: {title} by {author} (ISBN: {isbn})")
             self.refresh_books_display()
+            self.refresh_similar_books_combo()
             self.status_var.set("Book updated successfully")
 
         except Exception as e:
@@ -620,6 +1018,8 @@ class IntegratedLibraryGUI(tk.Tk):
 
     def delete_book(self):
         """Delete selected book"""
+        if self._busy_loading():
+            return
         selection = self.books_tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Please select a book to delete!")
@@ -627,48 +1027,28 @@ class IntegratedLibraryGUI(tk.Tk):
         
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this book?"):
             item = self.books_tree.item(selection[0])
-            isbn = item['values'][0]
-            title = item['values'][1]
+            # Treeview turns numeric-looking values into ints
+            isbn = str(item['values'][0])
             
             try:
-                # Start transaction
-                cursor = self.storage.conn.cursor()
-                
-                # First verify the book exists
-                cursor.execute("SELECT * FROM books WHERE isbn = ?", (isbn,))
-                if not cursor.fetchone():
+                book = self.book_dict.search_by_isbn(isbn)
+                if not book:
                     raise Exception("Book not found in database")
-                
-                # Delete from database
-                cursor.execute("DELETE FROM books WHERE isbn = ?", (isbn,))
-                
-                # Delete from data structures
-                try:
-                    self.bst.delete(isbn)
-                except Exception as e:
-                    self._log(f"Warning: BST deletion failed for ISBN {isbn}: {str(e)}")
-                    
-                try:
-                    if not self.book_dict.delete_book(isbn):
-                        self._log(f"Warning: Dictionary deletion failed for ISBN {isbn}")
-                except Exception as e:
-                    self._log(f"Warning: Dictionary deletion error for ISBN {isbn}: {str(e)}")
-                    
-                try:
-                    result = self.linked_list.delete_book(isbn)
-                    if result == "Book not found":
-                        self._log(f"Warning: Linked list deletion failed for ISBN {isbn}")
-                except Exception as e:
-                    self._log(f"Warning: Linked list deletion error for ISBN {isbn}: {str(e)}")
-
-                # Remove from graph
-                try:
-                    self.book_graph.remove_book(title)
-                except Exception as e:
-                    self._log(f"Warning: Graph deletion error for title {title}: {str(e)}")
-                
-                # Commit database changes
-                self.storage.conn.commit()
+                title, author = book["title"], book["author"]
+                if self.queue_system.has_activity(isbn):
+                    raise Exception("Book has active loans or holds")
+
+                # Keep the graph edges and the copy count so undo can restore them
+                edges = [(title, other) for other in self.book_graph.get_similar_books(title)]
+                inverse = [("add", isbn, title, author)]
+                counts = self.queue_system.availability(isbn)
+                if counts and counts[1] > 1:
+                    # Re-adding stocks one copy
+                    inverse.append(("stock", isbn, counts[1] - 1))
+                inverse.append(("connect", edges))
+                forward = [("delete", isbn, title, author)]
+                self._apply_ops(forward)
+                self.undo_manager.record("DELETE", f"Deleted book: {title} (ISBN: {isbn})", forward, inverse)
                 
                 self._log(f"Deleted book: {title} (ISBN: {isbn})")
                 self.refresh_books_display()
@@ -679,193 +1059,349 @@ class IntegratedLibraryGUI(tk.Tk):
                 self.update_visualization()
                 
             except Exception as e:
-                # Rollback on error
-                self.storage.conn.rollback()
                 error_msg = str(e)
                 self._log(f"Error deleting book: {error_msg}")
                 messagebox.showerror("Error", f"Failed to delete book: {error_msg}")
-                # Try to recover data structure consistency
-                self._reload_data_structures()
 
     def bst_search(self):
         """Search using BST"""
-        search_term = self.search_var.get().strip()
-        if not search_term:
-            messagebox.showwarning("Warning", "Please enter a search term")
-            return
+        self._run_search("bst", "BST", self._bst_search_text)
 
-        self.search_results.delete(1.0, tk.END)
-        self.search_results.insert(tk.END, "BST Search Results:\n" + "=" * 50 + "\n")
-
-        found_count = 0
-        for key, (title, author, isbn) in self.bst.inorder():
-            if (self.search_type.get() == "Title" and search_term.lower() in title.lower()) or \
-                    (self.search_type.get() == "Author" and search_term.lower() in author.lower()) or \
-                    (self.search_type.get() == "ISBN" and search_term in isbn):
-                self.search_results.insert(tk.END, f"ID: {key}\nTitle: {title}\nAuthor: {author}\nISBN: {isbn}\n\n")
-                found_count += 1
+    def dict_search(self):
+        """Search using dictionary"""
+        self._run_search("dict", "Dictionary", self._dict_search_text)
 
-        if found_count == 0:
-            self.search_results.insert(tk.END, "No books found matching your search.\n")
-        else:
-            self.search_results.insert(tk.END, f"Found {found_count} book(s).")
+    def linked_search(self):
+        """Search using linked list"""
+        self._run_search("linked_list", "Linked List", self._linked_search_text)
 
-        self._log(f"BST search for '{search_term}' returned {found_count} results")
+    def fuzzy_search(self):
+        """Typo-tolerant search using the trigram index"""
+        self._run_search("fuzzy", "Fuzzy", self._fuzzy_search_text)
 
-    def dict_search(self):
-        """Search using dictionary"""
+    def _run_search(self, strategy, name, search_fn):
+        """
+        Show the results of search_fn(field, term) -> (text, log message).
+        Results come from the query cache while the catalog is unchanged.
+        """
         search_term = self.search_var.get().strip()
         if not search_term:
             messagebox.showwarning("Warning", "Please enter a search term")
             return
 
+        started = time.perf_counter()
+        field = self.search_type.get()
+        text, message = self.query_cache.get_or_compute(
+            (strategy, field, search_term), lambda: search_fn(field, search_term))
         self.search_results.delete(1.0, tk.END)
-        self.search_results.insert(tk.END, "Dictionary Search Results:\n" + "=" * 50 + "\n")
+        self.search_results.insert(tk.END, f"{name} Search Results:\n" + "=" * 50 + "\n" + text)
+        self.metrics.observe("search_seconds", time.perf_counter() - started, strategy=strategy)
+        if message:
+            self._log(message)
+
+    def _bst_search_text(self, field, search_term):
+        if field == "ISBN" and len(search_term) == 13:
+            # A full ISBN can only match itself: one O(log n) lookup instead of a walk
+            book = self.bst.search(search_term)
+            matches = [(search_term, book)] if book is not None else []
+        else:
+            matches = self.bst.inorder()
+        lines = []
+        for key, (title, author, isbn) in matches:
+            if (field == "Title" and search_term.lower() in title.lower()) or \
+                    (field == "Author" and search_term.lower() in author.lower()) or \
+                    (field == "ISBN" and search_term in isbn):
+                lines.append(f"ID: {key}\nTitle: {title}\nAuthor: {author}\nISBN: {isbn}\n\n")
+
+        found_count = len(lines)
+        if found_count == 0:
+            lines.append("No books found matching your search.\n")
+        else:
+            lines.append(f"Found {found_count} book(s).")
+        return "".join(lines), f"BST search for '{search_term}' returned {found_count} results"
 
-        if self.search_type.get() == "ISBN":
+    def _dict_search_text(self, field, search_term):
+        if field == "ISBN":
             book = self.book_dict.search_by_isbn(search_term)
             if book:
-                self.search_results.insert(tk.END,
-                                           f"Title: {book['title']}\nAuthor: {book['author']}\nISBN: {book['isbn']}\nStatus: {'Available' if book['available'] else 'Checked Out'}\n")
-                self._log(f"Dictionary search found book by ISBN: {search_term}")
-            else:
-                self.search_results.insert(tk.END, "No book found with that ISBN.\n")
-        elif self.search_type.get() == "Title":
+                return (f"Title: {book['title']}\nAuthor: {book['author']}\nISBN: {book['isbn']}\n"
+                        f"Status: {'Available' if book['available'] else 'Checked Out'}\n",
+                        f"Dictionary search found book by ISBN: {search_term}")
+            return "No book found with that ISBN.\n", None
+        if field == "Title":
             books = self.book_dict.search_by_title(search_term)
             if books:
-                for book in books:
-                    self.search_results.insert(tk.END,
-                                               f"Title: {book['title']}\nAuthor: {book['author']}\nISBN: {book['isbn']}\n\n")
-                self._log(f"Dictionary search found {len(books)} books by title")
-            else:
-                self.search_results.insert(tk.END, "No books found with that title.\n")
-        else:
-            self.search_results.insert(tk.END, "Dictionary search only supports ISBN and Title searches.\n")
-
-    def linked_search(self):
-        """Search using linked list"""
-        search_term = self.search_var.get().strip()
-        if not search_term:
-            messagebox.showwarning("Warning", "Please enter a search term")
-            return
-
-        self.search_results.delete(1.0, tk.END)
-        self.search_results.insert(tk.END, "Linked List Search Results:\n" + "=" * 50 + "\n")
-
-        if self.search_type.get() == "Title":
-            book = self.linked_list.search_by_title(search_term)
-            if book:
-                self.search_results.insert(tk.END,
-                                           f"Title: {book.title}\nAuthor: {book.author}\nISBN: {book.isbn}\nAvailable: {book.available}\n")
-                self._log(f"Linked list search found book: {search_term}")
-            else:
-                self.search_results.insert(tk.END, "No book found with that title.\n")
-        else:
-            self.search_results.insert(tk.END, "Linked list search only supports Title searches.\n")
+                return ("".join(f"Title: {book['title']}\nAuthor: {book['author']}\nISBN: {book['isbn']}\n\n"
+                                for book in books),
+                        f"Dictionary search found {len(books)} books by title")
+            return "No books found with that title.\n", None
+        return "Dictionary search only supports ISBN and Title searches.\n", None
+
+    def _linked_search_text(self, field, search_term):
+        if field != "Title":
+            return "Linked list search only supports Title searches.\n", None
+        book = self.linked_list.search_by_title(search_term)
+        if book:
+            return (f"Title: {book.title}\nAuthor: {book.author}\nISBN: {book.isbn}\nAvailable: {book.available}\n",
+                    f"Linked list search found book: {search_term}")
+        return "No book found with that title.\n", None
+
+    def _fuzzy_search_text(self, field, search_term):
+        if field not in FuzzyCatalog.FIELDS:
+            return "Fuzzy search only supports Title and Author searches.\n", None
+        if self.fuzzy_index is None:
+            started = time.perf_counter()
+            self.fuzzy_index = FuzzyCatalog()
+            self.fuzzy_index.bulk_load((book['isbn'], book['title'], book['author'])
+                                       for book in self.book_dict.get_all_books())
+            self._log(f"Built fuzzy index for {len(self.fuzzy_index)} books "
+                      f"in {time.perf_counter() - started:.2f}s")
+        lines = []
+        for isbn, distance, similarity in self.fuzzy_index.search(field, search_term, self.FUZZY_RESULTS):
+            book = self.book_dict.search_by_isbn(isbn)
+            lines.append(f"Title: {book['title']}\nAuthor: {book['author']}\nISBN: {isbn}\n"
+                         f"Edits: {distance}  Similarity: {similarity:.0%}\n\n")
+        if not lines:
+            return "No close matches found.\n", None
+        return "".join(lines), f"Fuzzy search for '{search_term}' returned {len(lines)} close matches"
 
     def checkout_book(self):
         """Checkout a book"""
+        if self._busy_loading():
+            return
         book_id = self.checkout_book_var.get().strip()
         user_id = self.user_var.get().strip()
         
         if not all([book_id, user_id]):
-            messagebox.showerror("Error", "Book ID and User ID are required!")
+            messagebox.showerror("Error", "ISBN and Username are required!")
             return
         
+        priority = self.HOLD_PRIORITIES[self.priority_type.get()]
         try:
-            result = self.queue_system.check_out_book(user_id, book_id)
-            if result:
-                self._log(f"Book {book_id} checked out to {user_id}")
-            else:
-                self._log(f"Book {book_id} not available - {user_id} added to queue")
-                
-            self.clear_fields()
-            self.view_queue_status()
-            
-            # Update visualization if Queue is selected
-            if self.viz_type.get() == "Queue":
-                self.update_visualization()
-                
+            result = self.queue_system.check_out_book(user_id, book_id, priority)
+            self.circulation.commit()
         except Exception as e:
+            self._abandon_circulation()
             messagebox.showerror("Error", str(e))
+            return
+
+        forward = [("checkout", book_id, user_id, priority)]
+        if result.status == CHECKED_OUT:
+            self.undo_manager.record("CHECKOUT", result.describe(),
+                                     forward, [("return", book_id, user_id)])
+        elif result.status == WAITLISTED:
+            self.undo_manager.record("HOLD", result.describe(),
+                                     forward, [("cancel_hold", book_id, user_id)])
+        self.status_var.set(result.describe())
+        self.clear_fields()
+
+        # Update visualization if Queue is selected
+        if self._showing_viz("Queue"):
+            self.update_visualization()
 
     def return_book(self):
         """Return a book"""
+        if self._busy_loading():
+            return
         book_id = self.checkout_book_var.get().strip()
         user_id = self.user_var.get().strip()
         
         if not all([book_id, user_id]):
-            messagebox.showerror("Error", "Book ID and User ID are required!")
+            messagebox.showerror("Error", "ISBN and Username are required!")
             return
         
         try:
-            self.queue_system.return_book(book_id, user_id)
-            self._log(f"Book {book_id} returned by {user_id}")
-            self.clear_fields()
-            self.view_queue_status()
-            
-            # Update visualization if Queue is selected
-            if self.viz_type.get() == "Queue":
-                self.update_visualization()
-                
+            result = self.queue_system.return_book(book_id, user_id)
+            self.circulation.commit()
         except Exception as e:
+            self._abandon_circulation()
             messagebox.showerror("Error", str(e))
+            return
 
-    def view_queue_status(self):
-        """Display queue status"""
-        self.queue_display.delete(1.0, tk.END)
-        self.queue_display.insert(tk.END, "Queue Status:\n" + "=" * 50 + "\n")
-
-        for book_id, book_info in self.queue_system.books.items():
-            self.queue_display.insert(tk.END, f"Book ID: {book_id}\n")
-            self.queue_display.insert(tk.END, f"Title: {book_info['title']}\n")
-            self.queue_display.insert(tk.END, f"Available Copies: {book_info['available_copies']}\n")
-            self.queue_display.insert(tk.END, f"Checked Out To: {book_info['checked_out_to']}\n")
-            self.queue_display.insert(tk.END, f"Reservation Queue: {list(book_info['reservation_queue'])}\n")
-            self.queue_display.insert(tk.END, "-" * 30 + "\n")
+        if result:
+            self.undo_manager.record("RETURN", result.describe(),
+                                     [("return", book_id, user_id)],
+                                     [self._unreturn_op(result)])
+        self.status_var.set(result.describe())
+        self.clear_fields()
+
+        # Update visualization if Queue is selected
+        if self._showing_viz("Queue"):
+            self.update_visualization()
+
+    def _abandon_circulation(self):
+        """
+        A circulation change failed to commit: drop its queued statements and
+        rebuild the in-memory state from the database, which still has the
+        state from before the change.
+        """
+        self.circulation.discard_pending()
+        self.storage.conn.rollback()
+        self._reload_data_structures()
+
+    @staticmethod
+    def _unreturn_op(result):
+        """Inverse of a RETURNED result, putting any promoted user back on their original hold"""
+        return ("unreturn", result.book_id, result.user_id) + tuple(result.served[0] if result.served else ())
+
+    def change_stock(self, sign):
+        """Add copies of the title in the ISBN field (sign 1) or withdraw shelf copies (sign -1)"""
+        if self._busy_loading():
+            return
+        book_id = self.checkout_book_var.get().strip()
+        try:
+            count = int(self.copies_var.get())
+        except ValueError:
+            count = 0
+        if not book_id or not 1 <= count <= self.MAX_STOCK_CHANGE:
+            messagebox.showerror("Error", f"ISBN and a number of copies (1-{self.MAX_STOCK_CHANGE}) are required!")
+            return
+        counts = self.queue_system.availability(book_id)
+        if counts is None:
+            messagebox.showerror("Error", f"Book {book_id} not found")
+            return
+        if sign < 0 and count > counts[0]:
+            messagebox.showerror("Error", f"Only {counts[0]} copies are on the shelf")
+            return
 
-    def refresh_statistics(self):
-        """Refresh statistics display"""
-        self.stats_text.delete(1.0, tk.END)
+        try:
+            result = self.queue_system.add_copies(book_id, sign * count)
+            self.circulation.commit()
+        except Exception as e:
+            self._abandon_circulation()
+            messagebox.showerror("Error", str(e))
+            return
+        if not result:
+            messagebox.showerror("Error", result.describe())
+            return
+        details = (f"{'Added' if sign > 0 else 'Withdrew'} {count} copies of {book_id}: "
+                   f"{result.total_copies} owned, {result.available_copies} on the shelf")
+        # Copies lent straight to the waitlist go back to their holds before they are withdrawn
+        inverse = [("unpromote", book_id) + hold for hold in reversed(result.served)]
+        inverse.append(("stock", book_id, -sign * count))
+        self.undo_manager.record("STOCK", details, [("stock", book_id, sign * count)], inverse)
+        self.status_var.set(details)
+
+    def process_batch_file(self):
+        """
+        Apply a kiosk/book-drop batch file in one go. Each CSV row is
+        action,isbn,username[,priority] with action "checkout" or "return".
+        Returns are processed before checkouts, everything is committed once
+        and the whole batch is a single undo step.
+        """
+        if self._busy_loading():
+            return
+        path = filedialog.askopenfilename(title="Select circulation batch",
+                                          filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
 
-        # Get counts
-        cursor = self.storage.conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM books")
-        total_books = cursor.fetchone()[0]
+        checkouts, returns = [], []
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.reader(f):
+                    if len(row) < 3 or row[0].strip().lower() not in ("checkout", "return"):
+                        continue
+                    action, isbn, user_id = (value.strip() for value in row[:3])
+                    if action.lower() == "return":
+                        returns.append((isbn, user_id))
+                    else:
+                        priority = self.HOLD_PRIORITIES.get(row[3].strip(), PRIORITY_PATRON) if len(row) > 3 else PRIORITY_PATRON
+                        checkouts.append((user_id, isbn, priority))
+        except (OSError, csv.Error) as e:
+            messagebox.showerror("Error", f"Failed to read batch file: {str(e)}")
+            return
 
-        cursor.execute("SELECT COUNT(*) FROM books WHERE status='Available'")
-        available_books = cursor.fetchone()[0]
+        forward = [("return_many", returns), ("checkout_many", checkouts)]
+        try:
+            with self.queue_system.deferred_events():
+                returned = self.queue_system.return_many(returns)
+                checked_out = self.queue_system.check_out_many(checkouts)
+            self.circulation.commit()
+        except Exception as e:
+            self._abandon_circulation()
+            messagebox.showerror("Error", f"Batch failed: {str(e)}")
+            return
 
-        cursor.execute("SELECT COUNT(*) FROM books WHERE status='Checked Out'")
-        checked_out_books = cursor.fetchone()[0]
+        # Inverse of the whole batch, newest first
+        inverse = []
+        for result in reversed(checked_out):
+            if result.status == CHECKED_OUT:
+                inverse.append(("return", result.book_id, result.user_id))
+            elif result.status == WAITLISTED:
+                inverse.append(("cancel_hold", result.book_id, result.user_id))
+        for result in reversed(returned):
+            if result:
+                inverse.append(self._unreturn_op(result))
+        self.undo_manager.record("BATCH", f"Batch of {len(returns)} returns and {len(checkouts)} checkouts",
+                                 forward, inverse)
 
-        # BST statistics
-        bst_nodes = len(list(self.bst.inorder()))
+        self.status_var.set(f"Processed {len(returns)} returns and {len(checkouts)} checkouts")
+        if self._showing_viz("Queue"):
+            self.update_visualization()
 
-        # Linked list statistics
-        linked_list_books = len(self.linked_list.get_all_books())
+    def view_queue_status(self):
+        """Redraw the visible page of the queue panel (circulation events keep its index current)"""
+        if self.queue_panel is not None:
+            self.queue_panel.render_page()
 
-        # Dictionary statistics
-        dict_books = len(self.book_dict.get_all_books())
+    def refresh_statistics(self):
+        """Refresh statistics display"""
+        if self.stats_text is None:
+            return
+        self.stats_text.delete(1.0, tk.END)
+        analytics = self._catalog_analytics()
+        cache = self.query_cache.stats()
+
+        if analytics is not None:
+            totals = analytics.availability()
+            catalog = (f"Titles: {totals['titles']:,} ({totals['titles_available']:,} with a copy on the shelf)\n"
+                       f"Copies: {totals['copies']:,} ({totals['available']:,} available, "
+                       f"{totals['checked_out']:,} checked out, {totals['ratio']:.0%} availability)\n")
+            top = analytics.top_authors(self.TOP_AUTHORS)
+            if top:
+                catalog += "\nTop Authors:\n" + "".join(
+                    f"  {author}: {titles:,} titles, {available:,}/{copies:,} available\n"
+                    for author, titles, copies, available in top)
+        else:
+            # Without NumPy only the checkout engine's running totals are shown
+            available, copies = self.queue_system.availability()
+            catalog = (f"Titles: {len(self.queue_system.books):,}\n"
+                       f"Copies: {copies:,} ({available:,} available, {copies - available:,} checked out)\n")
 
         stats = f"""Library Statistics:
 {"=" * 50}
-Total Books in Database: {total_books}
-Available Books: {available_books}
-Checked Out Books: {checked_out_books}
-
+{catalog}
 Data Structure Statistics:
-BST Nodes: {bst_nodes}
-Linked List Books: {linked_list_books}
-Dictionary Books: {dict_books}
+BST Nodes: {len(self.bst)}
+Linked List Books: {self.linked_list.size}
+Dictionary Books: {len(self.book_dict.books)}
+Query Cache: {cache['entries']} results, {cache['bytes'] / 1024:.0f} KB, {cache['hit_rate']:.0%} hits
 
 System Status: All data structures synchronized
 Last Updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 """
         self.stats_text.insert(tk.END, stats)
 
+    def _catalog_analytics(self):
+        """The columnar snapshot for reports, built from the catalog on first use (None without NumPy)"""
+        if self.analytics is None and self._analytics_available:
+            # NumPy costs ~100 ms to import, so it is only loaded once Statistics is shown
+            try:
+                from data_struct.analytics import CatalogAnalytics
+            except ImportError:     # NumPy is optional; Statistics then falls back to SQL counts
+                self._analytics_available = False
+                return None
+            started = time.perf_counter()
+            self.analytics = CatalogAnalytics.build(
+                ((isbn, book['author']) for isbn, book in self.book_dict.books.items()), self.queue_system.books)
+            self._log(f"Built analytics snapshot of {len(self.analytics)} books "
+                      f"in {time.perf_counter() - started:.2f}s")
+        return self.analytics
+
     def show_bst_traversal(self):
         """Show BST inorder traversal"""
+        self._ensure_tab(self.create_data_structures_tab)
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.insert(tk.END, "BST Inorder Traversal:\n" + "=" * 50 + "\n")
 
@@ -874,6 +1410,7 @@ Last Updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
     def show_linked_list(self):
         """Show linked list contents"""
+        self._ensure_tab(self.create_data_structures_tab)
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.insert(tk.END, "Linked List Contents:\n" + "=" * 50 + "\n")
 
@@ -887,69 +1424,379 @@ Last Updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
         self._log("Activity log cleared")
 
     def save_log(self):
-        """Save activity log to file"""
+        """Export the full activity journal to a text file"""
         try:
-            with open("library_activity.log", "w") as f:
-                f.write(self.log_text.get(1.0, tk.END))
-            messagebox.showinfo("Success", "Activity log saved to library_activity.log")
+            count = self.journal.export_text("library_activity.log")
+            messagebox.showinfo("Success", f"{count} journal entries saved to library_activity.log")
             self._log("Activity log saved to file")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save log: {str(e)}")
 
     def refresh_books_display(self):
-        """Refresh the books treeview"""
-        for item in self.books_tree.get_children():
-            self.books_tree.delete(item)
-
-        cursor = self.storage.conn.cursor()
-        cursor.execute("SELECT isbn, title, author, status FROM books ORDER BY title")
-
-        for row in cursor.fetchall():
-            self.books_tree.insert("", tk.END, values=row)
+        """Refresh the books treeview, filling it a chunk per event-loop turn so the window stays live"""
+        self.books_tree.delete(*self.books_tree.get_children())
+        rows = self.storage.conn.execute(
+            "SELECT isbn, title, author FROM books ORDER BY title").fetchall()
+        self._books_fill = rows
+        self._fill_books_tree(rows, 0)
+
+    def _availability_text(self, isbn):
+        counts = self.queue_system.availability(isbn)
+        return f"{counts[0]} of {counts[1]}" if counts else ""
+
+    def _fill_books_tree(self, rows, start):
+        if rows is not self._books_fill:
+            return  # superseded by a newer refresh
+        end = start + self.TREE_FILL_CHUNK
+        for row in rows[start:end]:
+            # Rows are keyed by ISBN so circulation events can update their availability in place
+            self.books_tree.insert("", tk.END, iid=row[0], values=(*row, self._availability_text(row[0])))
+        if end < len(rows):
+            self.after(1, self._fill_books_tree, rows, end)
+        else:
+            self._books_fill = None
+
+    def _build_catalog(self, version, conn, progress=None):
+        """
+        Build fresh catalog structures from the snapshot if it matches version,
+        otherwise from the books table on conn. Touches no widgets and no live
+        state, so it can run on the loader thread; _install_catalog swaps the
+        result in on the Tk thread.
+        """
+        started = time.perf_counter()
+        catalog = {"notes": [], "snapshot_version": None}
+        snapshot = None
+        if os.path.exists(self.SNAPSHOT_PATH):
+            try:
+                snapshot = load_snapshot(self.SNAPSHOT_PATH, *version)
+            except (OSError, SnapshotError) as e:
+                catalog["notes"].append(f"Ignoring catalog snapshot: {e}")
+
+        if snapshot is not None:
+            # Indexes come back with their saved shape, no row-by-row inserts
+            bst = snapshot.build_bst()
+            book_dict = snapshot.build_book_dictionary()
+            linked_list = snapshot.build_linked_list()
+            books = snapshot.rows()
+            catalog["source"] = "snapshot"
+            catalog["snapshot_version"] = version
+        else:
+            bst, book_dict, linked_list = BinarySearchTree(), BookDictionary(), BookLinkedList()
+            books = conn.execute("SELECT isbn, title, author FROM books")
+            catalog["source"] = "database"
+
+        queue_system = self._new_queue_system()
+        book_graph = Graphs(metrics=self.metrics)
+        # Most titles have the single copy they were added with; only the others are read
+        copies = copy_totals(conn)
+        count = 0
+        for isbn, title, author in books:
+            if snapshot is None:
+                bst.insert(isbn, (title, author, isbn))
+                book_dict.add_book(isbn, title, author)
+                linked_list.add_book(title, author, isbn)
+            queue_system.add_book(isbn, title, copies.get(isbn, 1))
+            book_graph.add_book_node(title)  # Add to graph
+            count += 1
+            if progress is not None and count % self.LOAD_PROGRESS_STEP == 0:
+                progress(count)
+
+        catalog.update(bst=bst, book_dict=book_dict, linked_list=linked_list,
+                       queue_system=queue_system, book_graph=book_graph, count=count,
+                       seconds=time.perf_counter() - started)
+        return catalog
+
+    def _install_catalog(self, catalog):
+        """Make freshly built structures live and refresh the views (Tk thread)"""
+        for note in catalog["notes"]:
+            self._log(note)
+        self.bst = catalog["bst"]
+        self.bst.log = self._trace
+        self.bst.metrics = self.metrics
+        self.book_dict = catalog["book_dict"]
+        self.linked_list = catalog["linked_list"]
+        self.queue_system = catalog["queue_system"]
+        self.book_graph = catalog["book_graph"]
+        self._snapshot_version = catalog["snapshot_version"]
+        self.query_cache.bump()
+        self.fuzzy_index = self.analytics = None
+        if self.live_search is not None:
+            self.live_search.worker.rebuild()
+
+        # Loans and holds are restored in bulk, not replayed one by one
+        loans, holds = self.circulation.load()
+        self.queue_system.restore(loans, holds)
+        if self.queue_panel is not None:
+            self.queue_panel.load(self.queue_system)
+
+        self.refresh_books_display()
+        self.refresh_similar_books_combo()  # Update similar books dropdown
+        self.refresh_statistics()
+        self.metrics.set("catalog_load_seconds", catalog["seconds"], source=catalog["source"])
+        self._log(f"Loaded {catalog['count']} books from {catalog['source']}")
 
     def _load_existing_data(self):
-        """Load existing data from database"""
+        """Load existing data from the catalog snapshot if it is current, otherwise from the database"""
         try:
-            cursor = self.storage.conn.cursor()
-            cursor.execute("SELECT id, isbn, title, author, status FROM books")
-            books = cursor.fetchall()
+            self._install_catalog(self._build_catalog(self.storage.data_version(), self.storage.conn))
+        except Exception as e:
+            self._log(f"Error loading data: {str(e)}")
 
-            for book_id, isbn, title, author, status in books:
-                # Add to data structures
-                self.bst.insert(isbn, (title, author, isbn))
-                self.book_dict.add_book(isbn, title, author)
-                self.linked_list.add_book(title, author, isbn)
-                self.queue_system.add_book(str(book_id), title, 1)
-                self.book_graph.add_book_node(title)  # Add to graph
+    def _start_background_load(self, startup=True):
+        """Load the catalog on a worker thread; changes are refused until it is installed"""
+        self.loading = True
+        self.status_var.set("Loading catalog...")
+        version = self.storage.data_version()
+        results = queue.Queue()
 
-            self.refresh_books_display()
-            self.refresh_similar_books_combo()  # Update similar books dropdown
-            self.refresh_statistics()
-            self._log(f"Loaded {len(books)} books from database")
+        def worker():
+            # sqlite3 connections belong to one thread, so the loader opens its own
+            conn = sqlite3.connect(self.DB_PATH)
+            try:
+                results.put(("done", self._build_catalog(
+                    version, conn, progress=lambda count: results.put(("progress", count)))))
+            except Exception as e:
+                results.put(("error", e))
+            finally:
+                conn.close()
 
-        except Exception as e:
-            self._log(f"Error loading data: {str(e)}")
+        threading.Thread(target=worker, name="catalog-loader", daemon=True).start()
+        self.after(20, self._poll_catalog_load, results, startup)
+
+    def _poll_catalog_load(self, results, startup=True):
+        """Pick up loader progress and the finished catalog on the Tk thread"""
+        message = None
+        while True:
+            try:
+                message = results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "progress":
+                self.status_var.set(f"Loading catalog... {message[1]:,} books")
+            else:
+                break
+        if message is None or message[0] == "progress":
+            self.after(20, self._poll_catalog_load, results, startup)
+            return
+
+        if message[0] == "error":
+            self._log(f"Error loading data: {message[1]}")
+        else:
+            self._install_catalog(message[1])
+        self.loading = False
+        self.status_var.set("Ready")
+        if startup:
+            elapsed = time.perf_counter() - self._started
+            self.metrics.set("startup_ready_seconds", elapsed)
+            self._log(f"Catalog ready {elapsed:.2f}s after launch", journal=False)
+
+    def _busy_loading(self):
+        """Tell the user (and return True) while the catalog is loading, importing or exporting"""
+        if self.loading:
+            messagebox.showinfo("Please wait", "The catalog is busy. Try again when the status bar says Ready.")
+        return self.loading
+
+    def _save_snapshot(self):
+        """Write the catalog snapshot if the books changed since the last one"""
+        if self.loading:
+            return  # the live structures are not the catalog yet
+        version = self.storage.data_version()
+        if version == self._snapshot_version:
+            return
+        try:
+            count = save_snapshot(self.SNAPSHOT_PATH, self.bst, self.linked_list, *version)
+        except (OSError, SnapshotError) as e:
+            self._log(f"Could not save catalog snapshot: {e}")
+            return
+        self._snapshot_version = version
+        self._log(f"Saved catalog snapshot ({count} books)", journal=False)
+
+    def _periodic_snapshot(self):
+        self._save_snapshot()
+        self.after(self.SNAPSHOT_INTERVAL_MS, self._periodic_snapshot)
 
     def _reload_data_structures(self):
         """Reload all data structures from database"""
         # Clear existing data structures
-        self.bst = BinarySearchTree(log_fn=self._log)
+        self.bst = BinarySearchTree(log_fn=self._trace, metrics=self.metrics)
         self.book_dict = BookDictionary()
         self.linked_list = BookLinkedList()
-        self.queue_system = LibrarySystem()
-        self.book_graph = Graphs()  # Reset graph
+        self.queue_system = self._new_queue_system()
+        self.book_graph = Graphs(metrics=self.metrics)  # Reset graph
+        self.analytics = None
 
         # Reload from database
         self._load_existing_data()
 
+    def _op_sql(self, op):
+        """SQL statement and parameters for an operation, or None if it is memory-only"""
+        kind = op[0]
+        if kind == "add":
+            return "INSERT INTO books (isbn, title, author) VALUES (?, ?, ?)", (op[1], op[2], op[3])
+        if kind == "delete":
+            return "DELETE FROM books WHERE isbn = ?", (op[1],)
+        if kind == "update":
+            return "UPDATE books SET title=?, author=? WHERE isbn=?", (op[2], op[3], op[1])
+        return None
+
+    def _apply_to_structures(self, op):
+        """Apply a single operation to the in-memory data structures"""
+        kind = op[0]
+        if kind in self.CACHE_INVALIDATING_OPS:
+            self.query_cache.bump()
+        if self.live_search is not None and kind in ("add", "update"):
+            self.live_search.worker.add(op[1], op[2], op[3])
+        elif self.live_search is not None and kind == "delete":
+            self.live_search.worker.remove(op[1])
+        if self.fuzzy_index is not None and kind in ("add", "update"):
+            self.fuzzy_index.add(op[1], op[2], op[3])
+        elif self.fuzzy_index is not None and kind == "delete":
+            self.fuzzy_index.remove(op[1])
+        if self.analytics is not None and kind in ("add", "update"):
+            self.analytics.add(op[1], op[3])
+        elif self.analytics is not None and kind == "delete":
+            self.analytics.remove(op[1])
+        if kind == "add":
+            _, isbn, title, author = op
+            self.bst.insert(isbn, (title, author, isbn))
+            self.book_dict.add_book(isbn, title, author)
+            self.linked_list.add_book(title, author, isbn)
+            self.queue_system.add_book(isbn, title, 1)
+            self.book_graph.add_book_node(title)
+        elif kind == "delete":
+            _, isbn, title, author = op
+            self.bst.delete(isbn)
+            self.book_dict.delete_book(isbn)
+            self.linked_list.delete_book(isbn)
+            self.queue_system.remove_book(isbn)
+            self.book_graph.remove_book(title)
+        elif kind == "update":
+            # ("update", isbn, title, author[, graph nodes from before a merging rename])
+            _, isbn, title, author, *split = op
+            old = self.book_dict.search_by_isbn(isbn)
+            old_title = old["title"] if old else title
+            self.bst.insert(isbn, (title, author, isbn))
+            self.book_dict.update_book(isbn, title, author)
+            self.linked_list.update_book(isbn, title, author)
+            if isbn in self.queue_system.books:
+                self.queue_system.books[isbn]['title'] = title
+            if split:
+                self.book_graph.split_book(old_title, split[0])
+            else:
+                self.book_graph.rename_book(old_title, title)
+        elif kind == "checkout":
+            self.queue_system.check_out_book(op[2], op[1], op[3])
+        elif kind == "checkout_many":
+            self.queue_system.check_out_many(op[1])
+        elif kind == "return_many":
+            self.queue_system.return_many(op[1])
+        elif kind == "cancel_hold":
+            self.queue_system.cancel_reservation(op[1], op[2])
+        elif kind == "stock":
+            result = self.queue_system.add_copies(op[1], op[2])
+            if not result:
+                raise ValueError(result.describe())
+        elif kind == "unpromote":
+            # ("unpromote", isbn, user, priority, expires_at)
+            self.queue_system.undo_promotion(*op[1:])
+        elif kind == "return":
+            self.queue_system.return_book(op[1], op[2])
+        elif kind == "unreturn":
+            # ("unreturn", isbn, user[, promoted_user, priority, expires_at])
+            self.queue_system.undo_return(*op[1:])
+        elif kind == "connect":
+            self.book_graph.add_edges(op[1])
+        elif kind == "disconnect":
+            self.book_graph.remove_edges(op[1])
+        else:
+            raise ValueError(f"Unknown operation: {kind}")
+
+    def _apply_ops(self, ops):
+        """
+        Apply a list of operations to SQLite and the data structures in one
+        transaction. Consecutive statements of the same kind go through
+        executemany; the in-memory structures are only touched once every
+        statement has succeeded.
+        """
+        statements = [stmt for stmt in map(self._op_sql, ops) if stmt]
+        try:
+            cursor = self.storage.conn.cursor()
+            for sql, group in groupby(statements, key=lambda stmt: stmt[0]):
+                cursor.executemany(sql, [params for _, params in group])
+        except Exception:
+            self.storage.conn.rollback()
+            raise
+
+        try:
+            # One log line per transaction rather than one per circulation event
+            with self.queue_system.deferred_events():
+                for op in ops:
+                    self._apply_to_structures(op)
+            # Loan/hold changes queued by the checkout engine join the same transaction
+            self.circulation.commit()
+        except Exception:
+            self.circulation.discard_pending()
+            self.storage.conn.rollback()
+            # Structures may be half-updated, rebuild them from the database
+            self._reload_data_structures()
+            raise
+
+    def undo_last(self):
+        """Undo the most recent action"""
+        if self._busy_loading():
+            return
+        try:
+            details = self.undo_manager.undo()
+        except Exception as e:
+            messagebox.showerror("Error", f"Undo failed: {str(e)}")
+            return
+        if details is None:
+            self.status_var.set("Nothing to undo")
+            return
+        self._log(f"Undo: {details}")
+        self.status_var.set(f"Undone: {details}")
+        self._refresh_views()
+
+    def redo_last(self):
+        """Redo the most recently undone action"""
+        if self._busy_loading():
+            return
+        try:
+            details = self.undo_manager.redo()
+        except Exception as e:
+            messagebox.showerror("Error", f"Redo failed: {str(e)}")
+            return
+        if details is None:
+            self.status_var.set("Nothing to redo")
+            return
+        self._log(f"Redo: {details}")
+        self.status_var.set(f"Redone: {details}")
+        self._refresh_views()
+
+    def _refresh_views(self):
+        """Refresh every view that depends on the catalog or circulation state"""
+        self.refresh_books_display()
+        self.refresh_similar_books_combo()
+        self.view_queue_status()
+        self.update_visualization()
+
+    def _showing_viz(self, kind):
+        """True if the Visualizer tab exists and is showing the given structure"""
+        return self.viz_type is not None and self.viz_type.get() == kind
+
     def update_visualization(self, event=None):
         """Update the visualization based on selected data structure"""
-        self.viz_canvas.delete("all")
+        if self.viz_canvas is None:
+            return
         viz_type = self.viz_type.get()
-        
         if viz_type == "BST":
+            # The BST view keeps its canvas items and only redraws what changed
             self._visualize_bst()
-        elif viz_type == "Stack":
+            return
+
+        self.bst_view.clear()
+        self.viz_canvas.delete("all")
+        if viz_type == "Stack":
             self._visualize_stack()
         elif viz_type == "Queue":
             self._visualize_queue()
@@ -957,48 +1804,19 @@ Last Updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
             self._visualize_linked_list()
 
     def _visualize_bst(self):
-        """Visualize Binary Search Tree"""
-        def draw_node(node, x, y, dx):
-            if not node:
-                return
-            # Draw node
-            self.viz_canvas.create_oval(x-20, y-20, x+20, y+20, fill='lightblue')
-            self.viz_canvas.create_text(x, y, text=str(node.key))
-            
-            # Draw left child
-            if node.left:
-                new_x = x - dx
-                new_y = y + 60
-                self.viz_canvas.create_line(x, y+20, new_x, new_y-20)
-                draw_node(node.left, new_x, new_y, dx/2)
-                
-            # Draw right child
-            if node.right:
-                new_x = x + dx
-                new_y = y + 60
-                self.viz_canvas.create_line(x, y+20, new_x, new_y-20)
-                draw_node(node.right, new_x, new_y, dx/2)
-        
-        # Start drawing from root
-        if self.bst.root:
-            draw_node(self.bst.root, 300, 50, 150)
-        else:
-            self.viz_canvas.create_text(300, 150, text="Empty BST")
+        """Visualize Binary Search Tree (cached layout, viewport culling, capped node count)"""
+        self.bst_view.show(self.bst)
 
     def _visualize_stack(self):
         """Visualize Stack"""
         y = 250  # Start from bottom
-        current = self.activity_stack.top
-        count = 0
         
-        while current and count < 6:  # Show top 6 items
+        for current in islice(self.activity_stack, 6):  # Show top 6 items
             # Draw box
             self.viz_canvas.create_rectangle(200, y-30, 400, y, fill='lightgreen')
             # Draw text
             self.viz_canvas.create_text(300, y-15, text=f"{current.action}: {current.details[:20]}...")
             y -= 40
-            current = current.next
-            count += 1
         
         if not self.activity_stack.top:
             self.viz_canvas.create_text(300, 150, text="Empty Stack")
@@ -1055,6 +1873,8 @@ Last Updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
     def connect_similar_books(self):
         """Connect two books as similar in the graph"""
+        if self._busy_loading():
+            return
         selected = self.books_tree.selection()
         if not selected:
             messagebox.showwarning("Warning", "Please select a book first!")
@@ -1072,10 +1892,63 @@ Last Updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
             messagebox.showwarning("Warning", "Cannot connect a book to itself!")
             return
 
-        self.book_graph.add_edge(current_book, similar_book)
+        added = self.book_graph.add_edges([(current_book, similar_book)])
+        if added:
+            self.query_cache.bump()
+            self.undo_manager.record("CONNECT", f"Connected {current_book} ↔ {similar_book}",
+                                     [("connect", added)], [("disconnect", added)])
         self._log(f"Connected similar books: {current_book} ↔ {similar_book}")
         self.show_recommendations(current_book)
 
+    def auto_connect_similar_books(self):
+        """Generate similarity edges for the whole catalog using MinHash/LSH"""
+        if self._busy_loading():
+            return
+        if getattr(self, "_similarity_job", None) is not None:
+            messagebox.showinfo("Info", "Similarity job is already running")
+            return
+
+        rows = self.storage.conn.execute("SELECT isbn, title, author FROM books").fetchall()
+        titles = {isbn: title for isbn, title, _ in rows}
+        results = queue.Queue()
+
+        def worker():
+            try:
+                # Imported here: it pulls in multiprocessing, which startup does not need
+                from data_struct.similarity import find_similar_pairs
+                results.put(find_similar_pairs(rows))
+            except Exception as e:
+                results.put(e)
+
+        self._similarity_job = threading.Thread(target=worker, daemon=True)
+        self._similarity_job.start()
+        self.status_var.set(f"Computing similar books across {len(rows)} titles...")
+        self.after(100, self._poll_similarity_job, results, titles)
+
+    def _poll_similarity_job(self, results, titles):
+        """Pick up the similarity job result on the Tk thread"""
+        try:
+            result = results.get_nowait()
+        except queue.Empty:
+            self.after(100, self._poll_similarity_job, results, titles)
+            return
+
+        self._similarity_job = None
+        if isinstance(result, Exception):
+            self._log(f"Similarity job failed: {result}")
+            self.status_var.set("Similarity job failed")
+            return
+
+        added = self.book_graph.add_edges((titles[a], titles[b]) for a, b, _ in result)
+        if added:
+            self.query_cache.bump()
+            # The whole job is one undo step
+            self.undo_manager.record("CONNECT", f"Auto-connected {len(added)} similar book pairs",
+                                     [("connect", added)], [("disconnect", added)])
+        self._log(f"Auto-connected {len(added)} similar book pairs ({len(result)} candidates)")
+        self.status_var.set(f"Added {len(added)} similarity edges")
+        self.refresh_similar_books_combo()
+
     def on_book_selected(self, event=None):
         """Handle book selection from dropdown"""
         selected_book = self.similar_var.get()
@@ -1084,7 +1957,8 @@ Last Updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
     def show_recommendations(self, title):
         """Show book recommendations in the text widget"""
-        recommendations = self.book_graph.get_recommendations(title)
+        recommendations = self.query_cache.get_or_compute(
+            ("recommend", title), lambda: tuple(self.book_graph.get_recommendations(title)))
         self.recommendations_text.delete(1.0, tk.END)
         
         if recommendations:
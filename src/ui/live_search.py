@@ -0,0 +1,129 @@
+import queue
+import tkinter as tk
+from tkinter import ttk
+
+from data_struct.prefix_index import SearchWorker
+
+
+class LiveSearchPanel(ttk.Frame):
+    """
+    Search-as-you-type for the Search tab.
+    Keystrokes on search_var are debounced by DEBOUNCE_MS, answered by a
+    SearchWorker and shown PAGE_SIZE rows at a time in results_text, so the
+    cost of drawing does not grow with the number of matches.
+    lookup(isbn) returns (title, author) or None for a book that is gone.
+    """
+    DEBOUNCE_MS = 150
+    POLL_MS = 30
+    PAGE_SIZE = 100
+
+    def __init__(self, master, search_var, field_widget, results_text, lookup, load_rows, **kwargs):
+        super().__init__(master, **kwargs)
+        self.search_var = search_var
+        self.field_widget = field_widget
+        self.results_text = results_text
+        self.lookup = lookup
+        self.worker = SearchWorker(load_rows)
+        self.ids = []
+        self.page = 0
+        self._shown = None          # (field, text) of the result on screen
+        self._debounce_job = None
+        self._poll_job = None
+
+        self.enabled_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self, text="Live search", variable=self.enabled_var,
+                        command=self._toggle).pack(side=tk.LEFT, padx=5)
+        ttk.Button(self, text="◀ Prev", command=self.prev_page).pack(side=tk.LEFT, padx=5)
+        ttk.Button(self, text="Next ▶", command=self.next_page).pack(side=tk.LEFT, padx=5)
+        self.status_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.status_var).pack(side=tk.LEFT, padx=10)
+
+        search_var.trace_add("write", lambda *args: self._on_change())
+        field_widget.bind("<<ComboboxSelected>>", lambda event: self._on_change(), add="+")
+
+    @property
+    def enabled(self):
+        return self.enabled_var.get()
+
+    def next_page(self):
+        if (self.page + 1) * self.PAGE_SIZE < len(self.ids):
+            self.page += 1
+            self.render_page()
+
+    def prev_page(self):
+        if self.page > 0:
+            self.page -= 1
+            self.render_page()
+
+    def render_page(self):
+        """Draw the current page of matches (at most PAGE_SIZE rows)."""
+        start = self.page * self.PAGE_SIZE
+        lines = []
+        for isbn in self.ids[start:start + self.PAGE_SIZE]:
+            book = self.lookup(isbn)
+            if book is not None:
+                lines.append(f"{book[0]} — {book[1]} (ISBN: {isbn})\n")
+        field, text = self._shown
+        pages = max(1, -(-len(self.ids) // self.PAGE_SIZE))
+        header = f"Live Search: {field} matching '{text}' — page {self.page + 1} of {pages}\n" + "=" * 50 + "\n"
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, header + ("".join(lines) or "No books found.\n"))
+
+    def _toggle(self):
+        if self.enabled:
+            if not self.worker.started:
+                self.status_var.set("Indexing catalog...")
+            self.worker.start()
+            self._schedule_poll()
+            self._on_change()
+        else:
+            self.worker.cancel()
+            self._cancel_debounce()
+            self.status_var.set("")
+
+    def _on_change(self):
+        if not self.enabled:
+            return
+        # Whatever is running is already out of date
+        self.worker.cancel()
+        self._cancel_debounce()
+        self._debounce_job = self.after(self.DEBOUNCE_MS, self._submit)
+
+    def _cancel_debounce(self):
+        if self._debounce_job is not None:
+            self.after_cancel(self._debounce_job)
+            self._debounce_job = None
+
+    def _submit(self):
+        self._debounce_job = None
+        text = self.search_var.get()
+        if not text.strip():
+            self.ids, self._shown = [], None
+            self.results_text.delete(1.0, tk.END)
+            return
+        self.worker.submit(self.field_widget.get(), text)
+        self._schedule_poll()
+
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                message = self.worker.results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "ready":
+                self.status_var.set(f"Indexed {message[1]:,} books in {message[2]:.1f}s")
+            elif message[0] == "error":
+                self.status_var.set(f"Live search failed: {message[1]}")
+            elif message[1] == self.worker.latest:
+                _, _, field, text, ids, seconds, narrowed = message
+                self.ids, self.page, self._shown = ids, 0, (field, text)
+                self.render_page()
+                how = "narrowed" if narrowed else "indexed"
+                self.status_var.set(f"{len(ids):,} matches in {seconds * 1000:.0f} ms ({how})")
+        if self.enabled:
+            self._schedule_poll()
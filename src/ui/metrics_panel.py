@@ -0,0 +1,112 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+
+class MetricsPanel(ttk.Frame):
+    """
+    Live table of everything in a Metrics registry.
+    Collection can be switched on and off from the panel. While the panel is
+    on screen it re-reads the registry every REFRESH_MS and updates rows in
+    place; when it is hidden no timer work is done at all.
+    """
+    COLUMNS = ("Metric", "Labels", "Type", "Count", "Value / Mean", "p50", "p95", "Max")
+    REFRESH_MS = 1000
+
+    def __init__(self, master, metrics, export_path="library_metrics.prom", **kwargs):
+        super().__init__(master, **kwargs)
+        self.metrics = metrics
+        self.export_path = export_path
+        self._refresh_job = None
+
+        controls = ttk.Frame(self)
+        controls.pack(side=tk.TOP, fill=tk.X, pady=5)
+        self.enabled_var = tk.BooleanVar(value=metrics.enabled)
+        ttk.Checkbutton(controls, text="Collect metrics", variable=self.enabled_var,
+                        command=self._toggle).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Refresh", command=self.refresh).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Export Prometheus...", command=self.export).pack(side=tk.LEFT, padx=5)
+        self.status_var = tk.StringVar()
+        ttk.Label(controls, textvariable=self.status_var).pack(side=tk.LEFT, padx=10)
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings", height=15)
+        widths = (220, 160, 80, 70, 110, 90, 90, 90)
+        for col, width in zip(self.COLUMNS, widths):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, stretch=col in ("Metric", "Labels"),
+                             anchor=tk.W if col in ("Metric", "Labels", "Type") else tk.E)
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.bind("<Map>", lambda event: self._schedule())
+        self.bind("<Unmap>", lambda event: self._cancel())
+
+    def refresh(self):
+        """Bring the table in line with the registry, touching only changed rows."""
+        wanted = {}
+        for row in self.metrics.rows():
+            name, labels = row[0], row[1]
+            wanted[f"{name}|{labels}"] = self._format(row)
+        for iid in self.tree.get_children():
+            if iid not in wanted:
+                self.tree.delete(iid)
+        for index, (iid, values) in enumerate(wanted.items()):
+            if not self.tree.exists(iid):
+                self.tree.insert("", index, iid=iid, values=values)
+            elif self.tree.item(iid, "values") != values:
+                self.tree.item(iid, values=values)
+        state = "on" if self.metrics.enabled else "off"
+        self.status_var.set(f"Collection {state}, {len(wanted)} series")
+
+    def reset(self):
+        self.metrics.reset()
+        self.refresh()
+
+    def export(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".prom", initialfile=self.export_path,
+            filetypes=[("Prometheus text", "*.prom"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.metrics.write_prometheus(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to export metrics: {e}")
+            return
+        self.export_path = path
+        self.status_var.set(f"Exported to {path}")
+
+    def _toggle(self):
+        self.metrics.enabled = self.enabled_var.get()
+        self.refresh()
+
+    def _schedule(self):
+        if self._refresh_job is None:
+            self._refresh_job = self.after(self.REFRESH_MS, self._tick)
+
+    def _cancel(self):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+
+    def _tick(self):
+        self._refresh_job = None
+        if self.winfo_ismapped():
+            self.refresh()
+            self._schedule()
+
+    def _format(self, row):
+        name, labels, kind, count, value, p50, p95, peak = row
+        return tuple(str(v) for v in (name, labels, kind, "" if count is None else count,
+                                      *(self._number(name, v) for v in (value, p50, p95, peak))))
+
+    def _number(self, name, value):
+        if value is None:
+            return ""
+        if name.endswith("_seconds"):
+            return f"{value * 1000:.3f} ms" if value < 1 else f"{value:.3f} s"
+        if isinstance(value, float) and not value.is_integer():
+            return f"{value:.2f}"
+        return f"{int(value):,}"
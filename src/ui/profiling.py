@@ -0,0 +1,211 @@
+import os
+import sys
+import threading
+import time
+import tkinter
+from collections import Counter
+from tkinter import commondialog
+
+
+def callback_label(func):
+    """Readable name for a Tk callback, looking through after()'s wrapper."""
+    code = getattr(func, "__code__", None)
+    if code is not None and code.co_name == "callit" and func.__closure__:
+        cells = dict(zip(code.co_freevars, func.__closure__))
+        if "func" in cells:
+            return callback_label(cells["func"].cell_contents)
+    func = getattr(func, "__func__", func)
+    name = getattr(func, "__qualname__", None) or type(func).__qualname__
+    code = getattr(func, "__code__", None)
+    if "<lambda>" in name and code is not None:
+        name += f"@{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+    return name
+
+
+def frame_stack(frame, stop=None):
+    """
+    Frames of a stack, outermost first, as flame-graph frame names.
+    The walk ends below the first frame running the code object stop.
+    """
+    names = []
+    while frame is not None and frame.f_code is not stop:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+class _Call:
+    __slots__ = ("label", "start", "paused", "pausing", "samples")
+
+    def __init__(self, label):
+        self.label = label
+        self.start = time.perf_counter()
+        self.paused = 0.0
+        self.pausing = 0        # > 0 while waiting in a modal dialog
+        self.samples = Counter()
+
+
+class CallbackProfiler:
+    """
+    Opt-in profiler for the GUI (python main.py --profile).
+    install() swaps tkinter's CallWrapper, through which every command=,
+    bind() and after() callback is invoked, for one that times the call.
+    A sampler thread records the Tk thread's stack every `interval` seconds
+    while a callback runs, with the callback as the root frame, plus the
+    stacks of background threads (catalog loader, similarity worker), so
+    time spent in the engine and in SQL shows up under the callback that
+    caused it. Any callback that keeps the event loop busy for longer than
+    `threshold` seconds is reported to on_slow. Time spent waiting in a
+    modal dialog is not counted against the callback that opened it.
+
+    write() produces, in output_dir:
+        stacks.folded  - collapsed stacks for flamegraph.pl / speedscope
+        callbacks.txt  - calls, total and worst time per callback
+        slow.txt       - every slow call with its hottest stacks
+    """
+    def __init__(self, output_dir, threshold=0.05, interval=0.001, on_slow=None):
+        self.output_dir = output_dir
+        self.threshold = threshold
+        self.interval = interval
+        self.on_slow = on_slow
+        self.stacks = Counter()
+        self.calls = {}         # label -> [count, total seconds, max seconds]
+        self.slow = []          # (wall clock, label, seconds, [(stack, samples)])
+        self._active = []       # _Call stack on the Tk thread (callbacks can nest)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._saved = None
+        self._tk_thread = None
+        self._wrapper_code = None
+
+    def install(self):
+        profiler = self
+        original_call = tkinter.CallWrapper.__call__
+        original_show = commondialog.Dialog.show
+        original_wait = tkinter.Misc.wait_window
+
+        class ProfilingCallWrapper(tkinter.CallWrapper):
+            def __call__(self, *args):
+                call = profiler._enter(callback_label(self.func))
+                try:
+                    return original_call(self, *args)
+                finally:
+                    profiler._exit(call)
+
+        def show(dialog, **options):
+            with profiler.paused():
+                return original_show(dialog, **options)
+
+        def wait_window(widget, window=None):
+            with profiler.paused():
+                return original_wait(widget, window)
+
+        self._wrapper_code = ProfilingCallWrapper.__call__.__code__
+        self._saved = (tkinter.CallWrapper, original_show, original_wait, sys.getswitchinterval())
+        tkinter.CallWrapper = ProfilingCallWrapper
+        commondialog.Dialog.show = show
+        tkinter.Misc.wait_window = wait_window
+        # The sampler needs the GIL often enough to see short callbacks
+        sys.setswitchinterval(min(self.interval, sys.getswitchinterval()))
+        self._tk_thread = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def uninstall(self):
+        if self._saved is None:
+            return
+        wrapper, show, wait_window, switch_interval = self._saved
+        tkinter.CallWrapper = wrapper
+        commondialog.Dialog.show = show
+        tkinter.Misc.wait_window = wait_window
+        sys.setswitchinterval(switch_interval)
+        self._saved = None
+        self._stop.set()
+        self._sampler.join()
+
+    def paused(self):
+        """Context manager: time inside it is not charged to the running callback."""
+        return _Pause(self)
+
+    def _enter(self, label):
+        call = _Call(label)
+        self._active.append(call)
+        return call
+
+    def _exit(self, call):
+        elapsed = time.perf_counter() - call.start - call.paused
+        with self._lock:
+            self._active.remove(call)
+            stats = self.calls.setdefault(call.label, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            self.stacks.update(call.samples)
+        if elapsed > self.threshold:
+            self.slow.append((time.time(), call.label, elapsed, call.samples.most_common(3)))
+            if self.on_slow is not None:
+                self.on_slow(call.label, elapsed)
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            with self._lock:
+                active = self._active[-1] if self._active else None
+                if active is not None and not active.pausing:
+                    frame = frames.get(self._tk_thread)
+                    if frame is not None:
+                        stack = frame_stack(frame, self._wrapper_code)
+                        active.samples[";".join([active.label] + stack)] += 1
+                for ident, frame in frames.items():
+                    if ident in (self._tk_thread, threading.get_ident()):
+                        continue
+                    self.stacks[";".join([f"thread {names.get(ident, ident)}"] + frame_stack(frame))] += 1
+
+    def write(self):
+        """Write the report files; returns output_dir."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        with self._lock:
+            stacks = list(self.stacks.items())
+            calls = sorted(self.calls.items(), key=lambda item: item[1][1], reverse=True)
+        with open(os.path.join(self.output_dir, "stacks.folded"), "w", encoding="utf-8") as f:
+            for stack, count in sorted(stacks):
+                f.write(f"{stack} {count}\n")
+        with open(os.path.join(self.output_dir, "callbacks.txt"), "w", encoding="utf-8") as f:
+            f.write(f"{'callback':<60} {'calls':>8} {'total ms':>10} {'max ms':>9}\n")
+            for label, (count, total, worst) in calls:
+                f.write(f"{label:<60} {count:>8} {total * 1000:>10.1f} {worst * 1000:>9.1f}\n")
+        with open(os.path.join(self.output_dir, "slow.txt"), "w", encoding="utf-8") as f:
+            f.write(f"Callbacks that blocked the event loop for more than {self.threshold * 1000:.0f} ms\n\n")
+            for wall, label, elapsed, hottest in self.slow:
+                stamp = time.strftime("%H:%M:%S", time.localtime(wall))
+                f.write(f"[{stamp}] {label}: {elapsed * 1000:.1f} ms\n")
+                for stack, count in hottest:
+                    f.write(f"    {count:>5} samples  {stack.replace(';', ' > ')}\n")
+                f.write("\n")
+        return self.output_dir
+
+
+class _Pause:
+    __slots__ = ("profiler", "call", "start")
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def __enter__(self):
+        active = self.profiler._active
+        self.call = active[-1] if active else None
+        if self.call is not None:
+            self.call.pausing += 1
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        if self.call is not None:
+            self.call.paused += time.perf_counter() - self.start
+            self.call.pausing -= 1
+        return False
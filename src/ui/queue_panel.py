@@ -0,0 +1,105 @@
+import tkinter as tk
+from tkinter import ttk
+from bisect import bisect_left, insort
+from itertools import islice
+
+
+class QueueStatusPanel(ttk.Frame):
+    """
+    Paged view of the titles that have copies out or people waiting.
+    The panel keeps a sorted index of active book ids and is told which
+    books changed, so a checkout touches one row instead of redrawing the
+    whole catalog. Only the current page (page_size rows) is ever rendered.
+    """
+    COLUMNS = ("ISBN", "Title", "Available", "Checked Out To", "Waitlist")
+    PREVIEW_USERS = 3
+
+    def __init__(self, master, page_size=50, **kwargs):
+        super().__init__(master, **kwargs)
+        self.page_size = page_size
+        self.page = 0
+        self._active = []       # sorted book ids with loans or holds
+        self._system = None
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings", height=12)
+        widths = (140, 220, 80, 260, 260)
+        for col, width in zip(self.COLUMNS, widths):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, stretch=col in ("Title", "Checked Out To", "Waitlist"))
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        pager = ttk.Frame(self)
+        pager.pack(side=tk.BOTTOM, fill=tk.X, pady=5)
+        ttk.Button(pager, text="◀ Prev", command=self.prev_page).pack(side=tk.LEFT, padx=5)
+        ttk.Button(pager, text="Next ▶", command=self.next_page).pack(side=tk.LEFT, padx=5)
+        self.page_var = tk.StringVar()
+        ttk.Label(pager, textvariable=self.page_var).pack(side=tk.LEFT, padx=10)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def load(self, system):
+        """Rebuild the index from scratch (after a full data load)."""
+        self._system = system
+        self._active = sorted(book_id for book_id in system.books if system.has_activity(book_id))
+        self.page = 0
+        self.render_page()
+
+    def update_books(self, book_ids):
+        """Refresh only the given books, keeping the index in step."""
+        if self._system is None:
+            return
+        membership_changed = False
+        for book_id in book_ids:
+            active = self._system.has_activity(book_id)
+            index = bisect_left(self._active, book_id)
+            present = index < len(self._active) and self._active[index] == book_id
+            if active and not present:
+                insort(self._active, book_id)
+                membership_changed = True
+            elif present and not active:
+                del self._active[index]
+                membership_changed = True
+            elif present and self.tree.exists(book_id):
+                # Same row, new numbers: a single item update
+                self.tree.item(book_id, values=self._row(book_id))
+        if membership_changed:
+            self.render_page()
+
+    def render_page(self):
+        """Draw the current page (at most page_size rows)."""
+        pages = max(1, -(-len(self._active) // self.page_size))
+        self.page = min(self.page, pages - 1)
+        self.tree.delete(*self.tree.get_children())
+        start = self.page * self.page_size
+        for book_id in self._active[start:start + self.page_size]:
+            self.tree.insert("", tk.END, iid=book_id, values=self._row(book_id))
+        self.page_var.set(f"Page {self.page + 1} of {pages} ({len(self._active)} titles with loans or holds)")
+
+    def next_page(self):
+        if (self.page + 1) * self.page_size < len(self._active):
+            self.page += 1
+            self.render_page()
+
+    def prev_page(self):
+        if self.page > 0:
+            self.page -= 1
+            self.render_page()
+
+    def _row(self, book_id):
+        book = self._system.books[book_id]
+        holders = book['checked_out_to']
+        waitlist = book['reservation_queue']
+        return (book_id, book['title'], book['available_copies'],
+                self._preview(len(holders), islice(holders, self.PREVIEW_USERS)),
+                self._preview(len(waitlist), [waitlist.peek()] if waitlist.peek() else []))
+
+    def _preview(self, total, users):
+        users = list(users)
+        if not total:
+            return "-"
+        text = ", ".join(users)
+        if total > len(users):
+            text += f" (+{total - len(users)} more)" if users else f"{total} waiting"
+        return text
@@ -0,0 +1,81 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from src.data_struct.queue import LibrarySystem
+
+if numpy is not None:
+    from src.data_struct.analytics import CatalogAnalytics
+
+BOOKS = [
+    ("978-1", "Frank Herbert"),
+    ("978-2", "Ursula K. Le Guin"),
+    ("978-3", "Frank Herbert"),
+    ("978-4", "Iain M. Banks"),
+    ("978-5", "Ursula K. Le Guin"),
+    ("978-6", "Frank Herbert"),
+]
+
+
+@unittest.skipUnless(numpy, "NumPy is not installed")
+class TestCatalogAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.system = LibrarySystem()
+        for isbn, _ in BOOKS:
+            self.system.add_book(isbn, f"Book {isbn}", 2)
+        self.system.check_out_book("U1", "978-1")
+        self.system.check_out_book("U2", "978-1")
+        self.system.check_out_book("U1", "978-4")
+        self.analytics = CatalogAnalytics.build(BOOKS, self.system.books)
+
+    def test_group_by_counts(self):
+        self.assertEqual(self.analytics.count_by("author"),
+                         [("Frank Herbert", 3), ("Ursula K. Le Guin", 2), ("Iain M. Banks", 1)])
+        self.assertEqual(self.analytics.count_by("author", n=1), [("Frank Herbert", 3)])
+        self.assertEqual(self.analytics.count_by("status"), [("Available", 5), ("Checked Out", 1)])
+
+    def test_availability(self):
+        self.assertEqual(self.analytics.availability(),
+                         {"titles": 6, "titles_available": 5, "copies": 12, "available": 9,
+                          "checked_out": 3, "ratio": 0.75})
+
+    def test_top_authors(self):
+        self.assertEqual(self.analytics.top_authors(2),
+                         [("Frank Herbert", 3, 6, 4), ("Ursula K. Le Guin", 2, 4, 4)])
+        self.assertEqual(len(self.analytics.top_authors(10)), 3)
+
+    def test_circulation_events_update_availability(self):
+        self.system.subscribe(self.analytics.apply, batch=True)
+        self.system.return_many([("978-1", "U1"), ("978-4", "U1")])
+        self.system.check_out_book("U3", "978-2")
+        self.assertEqual(self.analytics.count_by("status"), [("Available", 6)])
+        self.assertEqual(self.analytics.availability()["available"], 10)
+
+    def test_add_update_and_remove(self):
+        self.analytics.add("978-7", "Iain M. Banks", copies=3)
+        self.analytics.add("978-2", "Iain M. Banks")        # author corrected
+        # Tied on titles: the author catalogued first comes first
+        self.assertEqual(self.analytics.top_authors(2), [("Frank Herbert", 3, 6, 4), ("Iain M. Banks", 3, 7, 6)])
+        for isbn in ("978-1", "978-3", "978-5", "978-6"):
+            self.assertTrue(self.analytics.remove(isbn))
+        self.assertFalse(self.analytics.remove("978-1"))
+        # More dead rows than live ones: the columns have been compacted
+        self.assertEqual(self.analytics._size, 3)
+        self.assertEqual(self.analytics.count_by("author"), [("Iain M. Banks", 3)])
+        self.analytics.add("978-8", "Frank Herbert")
+        self.assertEqual(len(self.analytics), 4)
+        self.assertEqual(self.analytics.availability()["copies"], 8)
+
+    def test_growth_past_initial_capacity(self):
+        analytics = CatalogAnalytics()
+        for i in range(3000):
+            analytics.add(str(i), f"Author {i % 7}")
+        self.assertEqual(len(analytics), 3000)
+        self.assertEqual(analytics.count_by("author")[0], ("Author 0", 429))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -48,6 +48,17 @@ class TestBinarySearchTree(unittest.TestCase):
         self.bst.delete(3)
         self.assertIsNone(self.bst.search(3))
         
+    def test_size_tracks_inserts_and_deletes(self):
+        for key, data in self.test_data:
+            self.bst.insert(key, data)
+        self.bst.insert(5, "Book 5, revised")
+        self.assertEqual(len(self.bst), 7)
+
+        self.bst.delete(3)      # two children: only the successor's node goes
+        self.bst.delete(100)
+        self.assertEqual(len(self.bst), 6)
+        self.assertEqual(len(self.bst), len(list(self.bst.inorder())))
+
     def test_inorder_traversal(self):
         # Insert test data
         for key, data in self.test_data:
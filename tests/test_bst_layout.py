@@ -0,0 +1,45 @@
+import unittest
+from src.data_struct.Bsearch import BinarySearchTree, TreeNode
+from src.ui.bst_view import layout_bst, subtree_size
+
+class TestBSTLayout(unittest.TestCase):
+    def build(self, keys):
+        bst = BinarySearchTree()
+        for key in keys:
+            bst.insert(key, (f"Title {key}", "Author", key))
+        return bst
+
+    def test_inorder_positions_never_overlap(self):
+        bst = self.build([50, 30, 70, 20, 40, 60, 80])
+        layout = layout_bst(bst.root)
+        self.assertEqual([layout[k][0] for k in sorted(layout)], list(range(7)))
+        self.assertEqual(layout[50][1:3], (0, None))
+        self.assertEqual(layout[40][1:3], (2, 30))
+        self.assertTrue(all(entry[3] is None for entry in layout.values()))
+
+    def test_node_cap_collapses_subtrees(self):
+        bst = self.build([50, 30, 70, 20, 40, 60, 80, 10, 25])
+        layout = layout_bst(bst.root, max_nodes=3)
+        shown = {key for key, entry in layout.items() if entry[3] is None}
+        collapsed = {key: entry[3] for key, entry in layout.items() if entry[3] is not None}
+        self.assertEqual(shown, {50, 30, 70})
+        self.assertEqual(set(collapsed), {20, 40, 60, 80})
+        self.assertEqual(subtree_size(collapsed[20]), 3)
+
+    def test_degenerate_tree_is_laid_out_iteratively(self):
+        bst = BinarySearchTree()
+        node = None
+        # Build a 5000-deep chain directly; recursive insert would hit the recursion limit
+        for key in range(5000):
+            new = TreeNode(key, None)
+            if node is None:
+                bst.root = new
+            else:
+                node.right = new
+            node = new
+        layout = layout_bst(bst.root, max_nodes=2000)
+        self.assertEqual(len(layout), 2001)
+        self.assertEqual(subtree_size(layout[2000][3]), 3000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import sqlite3
+import unittest
+from src.data_struct.queue import LibrarySystem, PRIORITY_STAFF
+from src.database.circulation import CirculationStore, copy_totals
+from src.database.sqlite import SQLiteService
+
+class TestCirculationStore(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.store = CirculationStore(self.conn)
+
+    def make_library(self):
+        library = LibrarySystem(store=self.store)
+        library.add_book("B001", "Test Book 1", 1)
+        library.add_book("B002", "Test Book 2", 2)
+        return library
+
+    def restart(self):
+        library = LibrarySystem(store=self.store)
+        library.add_book("B001", "Test Book 1", 1)
+        library.add_book("B002", "Test Book 2", 2)
+        library.restore(*self.store.load())
+        return library
+
+    def test_state_survives_restart(self):
+        library = self.make_library()
+        library.check_out_book("USER1", "B001")
+        library.check_out_book("USER2", "B001")
+        library.check_out_book("USER3", "B001", PRIORITY_STAFF)
+        library.check_out_book("USER1", "B002")
+        self.store.commit()
+
+        library = self.restart()
+        book = library.books["B001"]
+        self.assertEqual(list(book["checked_out_to"]), ["USER1"])
+        self.assertEqual(list(book["reservation_queue"]), ["USER3", "USER2"])
+        self.assertEqual(book["available_copies"], 0)
+        self.assertEqual(library.books["B002"]["available_copies"], 1)
+        self.assertEqual(library.hold_count("USER2"), 1)
+
+        # Promotion is persisted as well
+        library.return_book("B001", "USER1")
+        self.store.commit()
+        library = self.restart()
+        book = library.books["B001"]
+        self.assertEqual(list(book["checked_out_to"]), ["USER3"])
+        self.assertEqual(list(book["reservation_queue"]), ["USER2"])
+
+        # New holds queue behind the restored ones
+        library.check_out_book("USER4", "B001")
+        self.assertEqual(list(library.books["B001"]["reservation_queue"]), ["USER2", "USER4"])
+
+    def test_undone_return_keeps_hold_priority(self):
+        library = self.make_library()
+        library.check_out_book("USER1", "B001")
+        library.check_out_book("USER2", "B001")
+        served = library.return_book("B001", "USER1").served[0]
+        library.check_out_book("USER3", "B001", PRIORITY_STAFF)
+        library.undo_return("B001", "USER1", *served)
+        self.store.commit()
+
+        library = self.restart()
+        book = library.books["B001"]
+        self.assertEqual(list(book["checked_out_to"]), ["USER1"])
+        self.assertEqual(list(book["reservation_queue"]), ["USER3", "USER2"])
+        self.assertEqual(book["reservation_queue"].priority_of("USER2"), served[1])
+
+    def test_uncommitted_changes_are_not_persisted(self):
+        library = self.make_library()
+        library.check_out_book("USER1", "B001")
+        self.store.discard_pending()
+        library = self.restart()
+        self.assertEqual(len(library.books["B001"]["checked_out_to"]), 0)
+
+    def test_expired_holds_are_purged(self):
+        self.store.add_hold("B001", "OLD", 2, 1, 1.0)
+        self.store.add_hold("B001", "NEW", 2, 2, None)
+        self.store.commit()
+        loans, holds = self.store.load()
+        self.assertEqual([entry[2] for entry in holds["B001"]], ["NEW"])
+
+    def test_multiple_copies_per_user(self):
+        library = self.make_library()
+        library.check_out_book("USER1", "B002")
+        library.check_out_book("USER1", "B002")
+        library.return_book("B002", "USER1")
+        self.store.commit()
+        library = self.restart()
+        self.assertEqual(library.books["B002"]["checked_out_to"].count("USER1"), 1)
+
+
+class TestCopyInventory(unittest.TestCase):
+    def setUp(self):
+        self.storage = SQLiteService(":memory:")
+        self.storage.ensure_books_table()
+        self.conn = self.storage.conn
+        self.conn.executemany("INSERT INTO books (isbn, title, author) VALUES (?, ?, ?)",
+                              [("B001", "Test Book 1", "A"), ("B002", "Test Book 2", "B")])
+        # A loan from before copies were tracked
+        self.conn.execute("CREATE TABLE loans (id INTEGER PRIMARY KEY AUTOINCREMENT, isbn TEXT NOT NULL, "
+                          "user_id TEXT NOT NULL, loaned_at REAL NOT NULL)")
+        self.conn.execute("INSERT INTO loans (isbn, user_id, loaned_at) VALUES ('B002', 'USER9', 0)")
+        self.conn.commit()
+        self.store = CirculationStore(self.conn)
+
+    def library(self):
+        library = LibrarySystem(store=self.store)
+        totals = copy_totals(self.conn)
+        for isbn, title in self.conn.execute("SELECT isbn, title FROM books"):
+            library.add_book(isbn, title, totals.get(isbn, 1))
+        library.restore(*self.store.load())
+        return library
+
+    def test_existing_books_are_stocked(self):
+        self.assertEqual(self.store.availability("B001"), (1, 1))
+        self.assertEqual(self.store.availability("B002"), (0, 1))
+        self.conn.execute("INSERT INTO books (isbn, title, author) VALUES ('B003', 'Test Book 3', 'C')")
+        self.assertEqual(self.store.availability("B003"), (1, 1))
+        self.conn.execute("DELETE FROM books WHERE isbn = 'B001'")
+        self.assertIsNone(self.store.availability("B001"))
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM copies WHERE isbn = 'B001'").fetchone()[0], 0)
+
+    def test_engine_and_inventory_agree(self):
+        library = self.library()
+        library.add_copies("B001", 2)
+        library.check_out_book("USER1", "B001")
+        library.check_out_book("USER2", "B002")       # waitlisted behind USER9
+        library.add_copies("B002", 1)                  # and served by the new copy
+        library.return_book("B001", "USER1")
+        library.check_out_book("USER3", "B001")
+        library.add_copies("B001", -1)
+        self.store.commit()
+        for isbn in ("B001", "B002"):
+            self.assertEqual(self.store.availability(isbn), library.availability(isbn))
+        self.assertEqual(copy_totals(self.conn), {"B001": 2, "B002": 2})
+        self.assertEqual(self.library().availability(), (1, 4))
+
+        self.assertEqual(self.conn.execute("SELECT borrower FROM copies WHERE isbn = 'B002' ORDER BY id")
+                         .fetchall(), [("USER9",), ("USER2",)])
+
+    def test_undeleted_book_gets_its_copies_back(self):
+        library = self.library()
+        library.add_copies("B001", 3)
+        self.store.commit()
+        # What undoing a delete applies: re-add the book, then stock the copies beyond the first
+        self.conn.execute("DELETE FROM books WHERE isbn = 'B001'")
+        library.remove_book("B001")
+        self.conn.execute("INSERT INTO books (isbn, title, author) VALUES ('B001', 'Test Book 1', 'A')")
+        library.add_book("B001", "Test Book 1", 1)
+        library.add_copies("B001", 3)
+        self.store.commit()
+        self.assertEqual(self.store.availability("B001"), (4, 4))
+        # So an older withdrawal can still be undone
+        self.assertTrue(library.add_copies("B001", -3))
+
+    def test_uncommitted_stock_changes_are_discarded(self):
+        library = self.library()
+        library.add_copies("B001", 5)
+        self.store.discard_pending()
+        self.store.commit()
+        self.assertEqual(self.store.availability("B001"), (1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
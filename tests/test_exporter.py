@@ -0,0 +1,97 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from src.data_struct.graph import Graphs
+from src.database.circulation import CirculationStore
+from src.database.exporter import (ColumnarFile, ExportError, GRAPH_SCHEMA, chunked,
+                                   export_graph, export_table, write_columnar)
+from src.database.sqlite import SQLiteService
+
+BOOKS = [
+    ("9780000000001", "The Lord of the Rings", "J. R. R. Tolkien"),
+    ("9780000000002", "Les Misérables", "Victor Hugo"),
+    ("9780000000003", 'Say "Hello", World', "Anon"),
+]
+
+
+class TestExporter(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.storage = SQLiteService(":memory:")
+        self.storage.ensure_books_table()
+        self.conn = self.storage.conn
+        CirculationStore(self.conn)
+        self.conn.executemany("INSERT INTO books (isbn, title, author) VALUES (?, ?, ?)", BOOKS)
+        # A second copy of the first book; the only copy of the third is out
+        self.conn.execute("INSERT INTO copies (isbn) VALUES ('9780000000001')")
+        self.conn.execute("UPDATE copies SET borrower = 'U3' WHERE isbn = '9780000000003'")
+        self.conn.executemany("INSERT INTO loans (isbn, user_id, loaned_at) VALUES (?, ?, ?)",
+                              [("9780000000001", "U1", 1700000000.5), ("9780000000002", "U2", 1700000001.25)])
+        self.conn.commit()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_books_to_csv(self):
+        progress = []
+        self.assertEqual(export_table(self.conn, "books", self.path("books.csv"), progress=progress.append), 3)
+        with open(self.path("books.csv"), newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["isbn", "title", "author", "copies", "available"])
+        self.assertEqual(rows[1:], [[*book, *counts] for book, counts in zip(BOOKS, [("2", "2"), ("1", "1"), ("1", "0")])])
+        self.assertEqual(progress, [3])
+
+    def test_loans_to_jsonl(self):
+        export_table(self.conn, "loans", self.path("loans.jsonl"))
+        with open(self.path("loans.jsonl"), encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[1], {"isbn": "9780000000002", "user_id": "U2", "loaned_at": 1700000001.25})
+
+    def test_columnar_round_trip(self):
+        export_table(self.conn, "books", self.path("books.col"))
+        export_table(self.conn, "loans", self.path("loans.col"))
+        books = ColumnarFile(self.path("books.col"))
+        self.assertEqual(books.num_rows, 3)
+        self.assertEqual(list(books.read_column("title")), [title for _, title, _ in BOOKS])
+        self.assertEqual(list(books.rows())[2], BOOKS[2] + (1, 0))
+        loans = ColumnarFile(self.path("loans.col"))
+        self.assertEqual(list(loans.read_column("loaned_at")), [1700000000.5, 1700000001.25])
+
+    def test_columnar_row_groups(self):
+        rows = [(f"book {i}", f"book {i + 1}") for i in range(25)]
+        self.assertEqual(write_columnar(self.path("edges.col"), GRAPH_SCHEMA, chunked(rows, 10)), 25)
+        edges = ColumnarFile(self.path("edges.col"))
+        self.assertEqual([group["rows"] for group in edges.row_groups], [10, 10, 5])
+        self.assertEqual(list(edges.rows()), rows)
+
+    def test_columnar_rejects_damaged_files(self):
+        export_table(self.conn, "books", self.path("books.col"))
+        with open(self.path("books.col"), "rb") as f:
+            data = f.read()
+        with open(self.path("cut.col"), "wb") as f:
+            f.write(data[:-3])
+        with self.assertRaises(ExportError):
+            ColumnarFile(self.path("cut.col"))
+
+    def test_graph_edges_written_once(self):
+        graph = Graphs()
+        for title in ("Dune", "Emma", "Ulysses"):
+            graph.add_book_node(title)
+        graph.add_edges([("Dune", "Emma"), ("Ulysses", "Dune")])
+        self.assertEqual(export_graph(graph, self.path("graph.csv")), 2)
+        with open(self.path("graph.csv"), newline="", encoding="utf-8") as f:
+            self.assertEqual(sorted(map(tuple, csv.reader(f))),
+                             [("Dune", "Emma"), ("Dune", "Ulysses"), ("book", "similar_book")])
+
+    def test_unknown_extension(self):
+        with self.assertRaises(ValueError):
+            export_table(self.conn, "books", self.path("books.xlsx"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import random
+import unittest
+
+from src.data_struct import fuzzy
+from src.data_struct.fuzzy import FuzzyCatalog, FuzzyIndex, normalize, substring_distance
+
+BOOKS = [
+    ("9780000000001", "The Lord of the Rings", "J. R. R. Tolkien"),
+    ("9780000000002", "The Hobbit", "J. R. R. Tolkien"),
+    ("9780000000003", "Lord of the Flies", "William Golding"),
+    ("9780000000004", "Dune", "Frank Herbert"),
+    ("9780000000005", "Dune Messiah", "Frank Herbert"),
+    ("9780000000006", "Les Misérables", "Victor Hugo"),
+]
+
+
+class TestDistance(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize("  Les  Misérables!"), "les miserables")
+
+    def test_substring_distance(self):
+        self.assertEqual(substring_distance("lord of the rngs", "the lord of the rings"), 1)
+        self.assertEqual(substring_distance("dune", "dune messiah"), 0)
+        self.assertEqual(substring_distance("kitten", "sitting"), 2)
+        self.assertEqual(substring_distance("dune", ""), 4)
+
+    def test_bit_parallel_distance_matches_table(self):
+        def table(query, text):
+            previous = [0] * (len(text) + 1)
+            for i, q in enumerate(query, 1):
+                current = [i]
+                for j, t in enumerate(text, 1):
+                    current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (q != t)))
+                previous = current
+            return min(previous)
+        rng = random.Random(5)
+        for _ in range(2000):
+            query = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 12)))
+            text = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 20)))
+            self.assertEqual(substring_distance(query, text), table(query, text), (query, text))
+
+
+class TestFuzzyCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = FuzzyCatalog()
+        self.catalog.bulk_load(BOOKS)
+
+    def isbns(self, field, query, **kwargs):
+        return [isbn for isbn, _, _ in self.catalog.search(field, query, **kwargs)]
+
+    def test_typos(self):
+        self.assertEqual(self.isbns("Title", "lord of the rngs", k=1), ["9780000000001"])
+        self.assertEqual(self.isbns("Title", "hobit"), ["9780000000002"])
+        self.assertEqual(self.isbns("Title", "les miserables"), ["9780000000006"])
+        self.assertEqual(self.isbns("Author", "tolkein"), ["9780000000001", "9780000000002"])
+
+    def test_closer_and_shorter_titles_rank_first(self):
+        self.assertEqual(self.isbns("Title", "lord of the rngs"), ["9780000000001", "9780000000003"])
+        self.assertEqual(self.isbns("Title", "dun"), ["9780000000004", "9780000000005"])
+        self.assertEqual(self.isbns("Title", "dnue"), ["9780000000004"])
+        self.assertEqual(self.catalog.search("Title", "lord of the rings")[0][:2], ("9780000000001", 0))
+
+    def test_unrelated_query_finds_nothing(self):
+        self.assertEqual(self.catalog.search("Title", "zzzz"), [])
+        self.assertEqual(self.catalog.search("Title", " ! "), [])
+
+    def test_add_update_remove(self):
+        self.catalog.add("9780000000007", "Children of Dune", "Frank Herbert")
+        self.assertIn("9780000000007", self.isbns("Title", "chlidren of dune"))
+        self.catalog.add("9780000000007", "Chapterhouse: Dune", "Frank Herbert")
+        self.assertEqual(self.isbns("Title", "chlidren of dune"), [])
+        self.catalog.remove("9780000000004")
+        self.catalog.remove("9780000000004")
+        self.assertNotIn("9780000000004", self.isbns("Title", "dune"))
+        self.assertEqual(len(self.catalog), len(BOOKS))
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def test_compaction_keeps_results(self):
+        index = FuzzyIndex()
+        index.bulk_load((i, f"title number {i}") for i in range(100))
+        for i in range(60):
+            index.remove(i)
+        self.assertEqual(len(index), 40)
+        self.assertLess(len(index._docs), 60)       # tombstones were compacted away
+        self.assertEqual(index.search("titel number 77", k=1)[0][:2], (77, 2))
+
+    def test_only_candidates_are_scored(self):
+        rng = random.Random(3)
+        words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(7)) for _ in range(500)]
+        index = FuzzyIndex()
+        index.bulk_load((i, " ".join(rng.sample(words, 3))) for i in range(5000))
+        target = index._docs[1234][1]
+        calls = []
+        original = fuzzy.substring_distance
+        fuzzy.substring_distance = lambda *args: calls.append(1) or original(*args)
+        try:
+            result = index.search(target[:5] + "x" + target[6:], k=3)
+        finally:
+            fuzzy.substring_distance = original
+        self.assertEqual(result[0][:2], (1234, 1))
+        self.assertLessEqual(len(calls), fuzzy.RERANK_FACTOR * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
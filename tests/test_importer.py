@@ -0,0 +1,112 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.database.importer import (BookImporter, import_file, normalize_isbn,
+                                   read_csv, read_jsonl, read_marc_lite)
+from src.database.sqlite import SQLiteService
+
+MARC = """=LDR  00000nam  2200000   4500
+=001  ocm00001
+=020  \\\\$a0131103628 (pbk.)
+=100  1\\$aKernighan, Brian W.,
+=245  14$aThe C programming language /$cBrian W. Kernighan.
+
+=LDR  00000nam  2200000   4500
+=020  \\\\$a9780262033848
+=100  1\\$aCormen, Thomas H.
+=245  10$aIntroduction to algorithms :$bthird edition.
+"""
+
+
+class TestReaders(unittest.TestCase):
+    def test_csv_header_picks_columns(self):
+        rows = list(read_csv(io.StringIO("Title,ISBN,Author\nDune,9780441013593,Frank Herbert\nshort\n")))
+        self.assertEqual(rows, [(2, ("9780441013593", "Dune", "Frank Herbert")),
+                                (3, "expected 3 columns, got 1")])
+
+    def test_csv_without_header_is_positional(self):
+        rows = list(read_csv(io.StringIO('9780441013593,"Dune, Deluxe",Frank Herbert\n')))
+        self.assertEqual(rows, [(1, ("9780441013593", "Dune, Deluxe", "Frank Herbert"))])
+
+    def test_csv_header_missing_column(self):
+        with self.assertRaises(ValueError):
+            list(read_csv(io.StringIO("isbn,title\n1,2\n")))
+
+    def test_jsonl(self):
+        text = '{"isbn": "9780441013593", "title": "Dune", "author": "Frank Herbert"}\n\n{oops\n[1]\n'
+        rows = list(read_jsonl(io.StringIO(text)))
+        self.assertEqual(rows[0], (1, ("9780441013593", "Dune", "Frank Herbert")))
+        self.assertEqual([line for line, _ in rows], [1, 3, 4])
+        self.assertTrue(rows[1][1].startswith("invalid JSON"))
+        self.assertEqual(rows[2][1], "expected a JSON object")
+
+    def test_marc_lite(self):
+        self.assertEqual(list(read_marc_lite(io.StringIO(MARC))), [
+            (1, ("0131103628", "The C programming language", "Kernighan, Brian W")),
+            (7, ("9780262033848", "Introduction to algorithms: third edition", "Cormen, Thomas H")),
+        ])
+
+    def test_normalize_isbn(self):
+        self.assertEqual(normalize_isbn("978-0-262-03384-8"), "9780262033848")
+        self.assertEqual(normalize_isbn("0-8044-2957-x"), "080442957X")
+        self.assertIsNone(normalize_isbn("12345"))
+        self.assertEqual(normalize_isbn("9780262033849"), "9780262033849")
+        self.assertIsNone(normalize_isbn("9780262033849", strict=True))
+        self.assertEqual(normalize_isbn("080442957X", strict=True), "080442957X")
+
+
+class TestBookImporter(unittest.TestCase):
+    def setUp(self):
+        self.storage = SQLiteService(":memory:")
+        self.storage.ensure_books_table()
+        self.conn = self.storage.conn
+
+    def books(self):
+        return self.conn.execute("SELECT isbn, title, author FROM books ORDER BY isbn").fetchall()
+
+    def test_chunks_dedupe_and_invalid_rows(self):
+        self.conn.execute("INSERT INTO books (isbn, title, author) VALUES ('9780000000000', 'Old', 'Kept')")
+        self.conn.commit()
+        records = [(i + 1, (f"978000000000{i % 4}", f"Book {i}", "Author")) for i in range(6)]
+        records.append((7, ("", "No ISBN", "Author")))
+        records.append((8, ("9780000000009", "No author", " ")))
+        records.append((9, "invalid JSON"))
+        progress = []
+        importer = BookImporter(self.conn, chunk_size=2, progress=lambda r: progress.append(r.inserted))
+        report = importer.run(iter(records))
+
+        self.assertEqual((report.read, report.inserted, report.duplicates, report.invalid), (9, 3, 3, 3))
+        self.assertEqual(self.books(), [("9780000000000", "Old", "Kept"),
+                                        ("9780000000001", "Book 1", "Author"),
+                                        ("9780000000002", "Book 2", "Author"),
+                                        ("9780000000003", "Book 3", "Author")])
+        self.assertEqual(progress, [1, 3, 3, 3])     # the first chunk hit the existing book
+        self.assertEqual([line for line, _ in report.errors], [7, 8, 9])
+        self.assertIn("missing author for ISBN 9780000000009", report.describe())
+
+    def test_import_changes_data_version(self):
+        before = self.storage.data_version()
+        BookImporter(self.conn).run(iter([(1, ("9780441013593", "Dune", "Frank Herbert"))]))
+        self.assertNotEqual(self.storage.data_version(), before)
+
+    def test_import_file_by_extension(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        directory = tmp.name
+        path = os.path.join(directory, "books.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(10):
+                f.write(json.dumps({"isbn": f"97800000000{i:02d}", "title": f"Book {i}", "author": "A"}) + "\n")
+        fractions = []
+        report = import_file(self.conn, path, chunk_size=4, progress=lambda r: fractions.append(r.fraction))
+        self.assertEqual(report.inserted, 10)
+        self.assertEqual(fractions[-1], 1.0)
+        with self.assertRaises(ValueError):
+            import_file(self.conn, os.path.join(directory, "books.xlsx"))
+
+
+if __name__ == '__main__':
+    unittest.main()
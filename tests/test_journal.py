@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from src.database.journal import ActivityJournal, iter_journal, segment_paths, tail
+
+class TestActivityJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "journal")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_and_scan(self):
+        journal = ActivityJournal(self.directory)
+        for i in range(100):
+            journal.append("ADD", f"Book {i}")
+        journal.flush()
+
+        records = list(iter_journal(self.directory))
+        self.assertEqual(len(records), 100)
+        self.assertEqual(records[0]["details"], "Book 0")
+        self.assertEqual(records[-1]["action"], "ADD")
+        journal.close()
+
+    def test_segment_rotation(self):
+        journal = ActivityJournal(self.directory, segment_bytes=500)
+        for i in range(100):
+            journal.append("ADD", f"Book {i}")
+        journal.close()
+
+        self.assertGreater(len(segment_paths(self.directory)), 1)
+        for path in segment_paths(self.directory):
+            self.assertLessEqual(os.path.getsize(path), 500)
+        details = [r["details"] for r in iter_journal(self.directory)]
+        self.assertEqual(details, [f"Book {i}" for i in range(100)])
+
+    def test_tail_and_reverse(self):
+        journal = ActivityJournal(self.directory, segment_bytes=300)
+        for i in range(50):
+            journal.append("LOG", str(i))
+        journal.close()
+
+        self.assertEqual([r["details"] for r in tail(self.directory, 3)], ["47", "48", "49"])
+        newest = next(iter_journal(self.directory, reverse=True))
+        self.assertEqual(newest["details"], "49")
+
+    def test_reopen_appends(self):
+        journal = ActivityJournal(self.directory)
+        journal.append("ADD", "first")
+        journal.close()
+
+        journal = ActivityJournal(self.directory)
+        journal.append("ADD", "second")
+        journal.close()
+        self.assertEqual([r["details"] for r in iter_journal(self.directory)], ["first", "second"])
+
+        with self.assertRaises(ValueError):
+            journal.append("ADD", "after close")
+
+    def test_partial_line_is_skipped(self):
+        journal = ActivityJournal(self.directory)
+        journal.append("ADD", "complete")
+        journal.close()
+        with open(segment_paths(self.directory)[-1], "ab") as f:
+            f.write(b'{"ts": 1, "act')
+
+        self.assertEqual([r["details"] for r in iter_journal(self.directory)], ["complete"])
+        self.assertEqual([r["details"] for r in tail(self.directory, 5)], ["complete"])
+
+        journal = ActivityJournal(self.directory)
+        journal.append("ADD", "after crash")
+        journal.close()
+        self.assertEqual([r["details"] for r in iter_journal(self.directory)], ["complete", "after crash"])
+
+    def test_export_text(self):
+        journal = ActivityJournal(self.directory)
+        journal.append("LOG", "hello")
+        path = os.path.join(self.tmp.name, "out.log")
+        self.assertEqual(journal.export_text(path), 1)
+        journal.close()
+        with open(path) as f:
+            self.assertIn("LOG: hello", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
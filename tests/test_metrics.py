@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+
+from src.data_struct.metrics import Metrics, Histogram, SIZE_BUCKETS
+from src.data_struct.Bsearch import BinarySearchTree
+from src.data_struct.graph import Graphs
+from src.database.sqlite import SQLiteService
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics(enabled=True)
+
+    def test_disabled_registry_records_nothing(self):
+        metrics = Metrics()
+        metrics.inc("books_added_total")
+        metrics.set("catalog_size", 10)
+        metrics.observe("search_seconds", 0.1)
+        with metrics.timer("search_seconds"):
+            pass
+        self.assertEqual(metrics.rows(), [])
+        self.assertEqual(metrics.to_prometheus(), "")
+
+    def test_counters_and_gauges_by_label(self):
+        self.metrics.inc("searches_total", strategy="bst")
+        self.metrics.inc("searches_total", 2, strategy="bst")
+        self.metrics.inc("searches_total", strategy="dict")
+        self.metrics.set("catalog_load_seconds", 1.5, source="snapshot")
+        rows = {(row[0], row[1]): row for row in self.metrics.rows()}
+        self.assertEqual(rows[("searches_total", "strategy=bst")][4], 3)
+        self.assertEqual(rows[("searches_total", "strategy=dict")][4], 1)
+        self.assertEqual(rows[("catalog_load_seconds", "source=snapshot")][2], "gauge")
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram(SIZE_BUCKETS)
+        for value in range(1, 101):
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.max, 100)
+        self.assertTrue(32 <= histogram.quantile(0.5) <= 64)
+        self.assertTrue(64 <= histogram.quantile(0.95) <= 100)
+
+    def test_timer_observes_elapsed_seconds(self):
+        with self.metrics.timer("work_seconds", step="a"):
+            pass
+        name, labels, kind, count, mean, _, _, _ = self.metrics.rows()[0]
+        self.assertEqual((name, labels, kind, count), ("work_seconds", "step=a", "histogram", 1))
+        self.assertGreaterEqual(mean, 0)
+
+    def test_prometheus_text_format(self):
+        self.metrics.describe("depth", "Nodes per lookup", buckets=(1, 2, 4))
+        for value in (1, 3, 3, 9):
+            self.metrics.observe("depth", value, tree='a"b')
+        self.metrics.inc("hits_total")
+        lines = self.metrics.to_prometheus().splitlines()
+        self.assertIn("# HELP depth Nodes per lookup", lines)
+        self.assertIn("# TYPE depth histogram", lines)
+        self.assertIn('depth_bucket{tree="a\\"b",le="2"} 1', lines)
+        self.assertIn('depth_bucket{tree="a\\"b",le="4"} 3', lines)
+        self.assertIn('depth_bucket{tree="a\\"b",le="+Inf"} 4', lines)
+        self.assertIn('depth_count{tree="a\\"b"} 4', lines)
+        self.assertIn("hits_total 1", lines)
+
+    def test_write_prometheus(self):
+        self.metrics.inc("hits_total")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "library.prom")
+            self.metrics.write_prometheus(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), self.metrics.to_prometheus())
+            self.assertEqual(os.listdir(tmp), ["library.prom"])
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics(enabled=True)
+
+    def _histogram(self, name):
+        return next(row for row in self.metrics.rows() if row[0] == name)
+
+    def test_bst_lookup_depth(self):
+        bst = BinarySearchTree(metrics=self.metrics)
+        for key in ("m", "f", "t", "a"):
+            bst.insert(key, key.upper())
+        self.assertEqual(bst.search("a"), "A")
+        self.assertIsNone(bst.search("z"))
+        _, _, _, count, mean, _, _, peak = self._histogram("bst_lookup_depth")
+        self.assertEqual(count, 2)
+        self.assertEqual(peak, 3)
+        self.assertEqual(mean, 2.5)
+
+    def test_recommendation_nodes_visited(self):
+        graph = Graphs(metrics=self.metrics)
+        for title in "ABCD":
+            graph.add_book_node(title)
+        graph.add_edge("A", "B")
+        graph.add_edge("B", "C")
+        self.assertEqual(graph.get_recommendations("A"), ["B", "C"])
+        self.assertEqual(self._histogram("recommendation_nodes_visited")[7], 3)
+
+    def test_sql_query_time_by_verb(self):
+        service = SQLiteService(":memory:", metrics=self.metrics)
+        item_id = service.create_item("Title", "Details")
+        service.read_all()
+        service.conn.cursor().execute("SELECT COUNT(*) FROM items")
+        service.delete_item(item_id)
+        labels = {row[1]: row[3] for row in self.metrics.rows() if row[0] == "sql_query_seconds"}
+        self.assertEqual(labels["op=insert"], 1)
+        self.assertEqual(labels["op=select"], 2)
+        self.assertEqual(labels["op=delete"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import random
+import threading
+import unittest
+
+from src.data_struct.prefix_index import CatalogSearchIndex, PrefixIndex, SearchWorker, tokenize
+
+BOOKS = [
+    ("9780000000001", "The Lord of the Rings", "J. R. R. Tolkien"),
+    ("9780000000002", "The Hobbit", "J. R. R. Tolkien"),
+    ("9780000000003", "Lord of the Flies", "William Golding"),
+    ("9780000000004", "Dune", "Frank Herbert"),
+    ("9780000000005", "Dune Messiah", "Frank Herbert"),
+]
+
+
+def brute_force(rows, query):
+    words = tokenize(query)
+    matches = [(title.lower(), isbn) for isbn, title, _ in rows
+               if all(any(token.startswith(w) for token in tokenize(title)) for w in words)]
+    return [isbn for _, isbn in sorted(matches)]
+
+
+class TestCatalogSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = CatalogSearchIndex()
+        self.index.bulk_load(BOOKS)
+
+    def test_word_prefixes_in_any_order(self):
+        self.assertEqual(self.index.search("Title", "lor"), ["9780000000003", "9780000000001"])
+        self.assertEqual(self.index.search("Title", "rin lor"), ["9780000000001"])
+        self.assertEqual(self.index.search("Author", "tolk"), ["9780000000001", "9780000000002"])
+        self.assertEqual(self.index.search("Title", "  "), [])
+
+    def test_isbn_prefix(self):
+        self.assertEqual(self.index.search("ISBN", "978000000000"), [isbn for isbn, _, _ in BOOKS])
+        self.assertEqual(self.index.search("ISBN", "9780000000004"), ["9780000000004"])
+
+    def test_add_update_remove(self):
+        self.index.add("9780000000006", "Children of Dune", "Frank Herbert")
+        self.assertIn("9780000000006", self.index.search("Title", "dune"))
+        self.index.add("9780000000006", "Dune Chronicles", "Frank Herbert")
+        self.assertEqual(self.index.search("Title", "child"), [])
+        self.assertIn("9780000000006", self.index.search("Title", "chron"))
+        self.index.remove("9780000000004")
+        self.index.remove("9780000000004")     # replays are harmless
+        self.assertEqual(self.index.search("Title", "dune"), ["9780000000006", "9780000000005"])
+        self.assertEqual(self.index.search("ISBN", "9780000000004"), [])
+
+    def test_narrowing_matches_fresh_search(self):
+        rng = random.Random(7)
+        words = ["alpha", "alpine", "beta", "bet", "gamma", "game", "delta", "del"]
+        rows = [(f"978{i:010d}", " ".join(rng.choice(words) for _ in range(3)), "a") for i in range(2000)]
+        index = CatalogSearchIndex()
+        index.bulk_load(rows)
+        previous = None
+        for query in ("a", "al", "alp", "alpi", "alpine", "alpine g", "alpine gam", "alpine game"):
+            fresh = index.search("Title", query)
+            self.assertEqual(fresh, brute_force(rows, query))
+            if previous is not None:
+                self.assertEqual(index.search("Title", query, candidates=previous), fresh)
+                self.assertTrue(index.indexes["Title"].narrowed or len(previous) > len(fresh))
+            previous = fresh
+
+    def test_cancelled_search_returns_none(self):
+        index = PrefixIndex(lambda book_id: "common words here")
+        index.bulk_load((i, "common words here") for i in range(10000))
+        self.assertIsNone(index.search("com wor", cancelled=lambda: True))
+
+
+class TestSearchWorker(unittest.TestCase):
+    def setUp(self):
+        self.worker = SearchWorker(lambda: list(BOOKS))
+        self.worker.start()
+        self.assertEqual(self.worker.results.get(timeout=5)[:2], ("ready", len(BOOKS)))
+
+    def tearDown(self):
+        self.worker.close()
+
+    def result(self):
+        message = self.worker.results.get(timeout=5)
+        self.assertEqual(message[0], "result")
+        return message
+
+    def test_query_then_narrow(self):
+        seq = self.worker.submit("Title", "d")
+        _, got_seq, _, _, ids, _, narrowed = self.result()
+        self.assertEqual((got_seq, ids, narrowed), (seq, ["9780000000004", "9780000000005"], False))
+        self.worker.submit("Title", "dune")
+        _, _, _, _, ids, _, narrowed = self.result()
+        self.assertEqual((ids, narrowed), (["9780000000004", "9780000000005"], True))
+
+    def test_writes_are_applied_in_order_and_stop_narrowing(self):
+        self.worker.submit("Title", "dun")
+        self.result()
+        self.worker.add("9780000000006", "Dune Chronicles", "Frank Herbert")
+        self.worker.remove("9780000000004")
+        self.worker.submit("Title", "dune")
+        _, _, _, _, ids, _, narrowed = self.result()
+        self.assertEqual((ids, narrowed), (["9780000000006", "9780000000005"], False))
+
+    def test_superseded_queries_are_skipped(self):
+        gate = threading.Event()
+        self.worker.load_rows = lambda: gate.wait() and list(BOOKS)
+        self.worker.rebuild()                   # keeps the worker busy until the gate opens
+        self.worker.submit("Title", "l")
+        self.worker.submit("Title", "lo")
+        latest = self.worker.submit("Title", "lord")
+        gate.set()
+        self.assertEqual(self.worker.results.get(timeout=5)[0], "ready")
+        _, seq, _, text, _, _, _ = self.result()
+        self.assertEqual((seq, text), (latest, "lord"))
+        self.assertTrue(self.worker.results.empty())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+import tkinter
+import unittest
+
+from src.ui.profiling import CallbackProfiler, callback_label
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def after_wrapper(func):
+    # Same shape as the closure tkinter.Misc.after registers
+    def callit():
+        func()
+    return callit
+
+
+class TestCallbackProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.slow = []
+        self.profiler = CallbackProfiler(os.path.join(self.tmp.name, "profile"), threshold=0.02,
+                                         on_slow=lambda label, seconds: self.slow.append(label))
+        self.original = tkinter.CallWrapper
+        self.profiler.install()
+
+    def tearDown(self):
+        self.profiler.uninstall()
+        self.tmp.cleanup()
+
+    def invoke(self, func):
+        # What Tk does for command=, bind() and after() callbacks
+        tkinter.CallWrapper(func, None, None)()
+
+    def test_uninstall_restores_tkinter(self):
+        self.assertIsNot(tkinter.CallWrapper, self.original)
+        self.profiler.uninstall()
+        self.assertIs(tkinter.CallWrapper, self.original)
+
+    def test_slow_callback_is_flagged_and_sampled(self):
+        def refresh_books_display():
+            busy(0.06)
+        self.invoke(refresh_books_display)
+        self.invoke(lambda: None)
+
+        label = callback_label(refresh_books_display)
+        self.assertEqual(self.slow, [label])
+        count, total, worst = self.profiler.calls[label]
+        self.assertEqual(count, 1)
+        self.assertGreaterEqual(worst, 0.06)
+        own = [stack for stack in self.profiler.stacks if stack.startswith(label + ";")]
+        self.assertTrue(own)
+        self.assertTrue(all("refresh_books_display (" in stack for stack in own))
+
+    def test_paused_time_is_not_charged(self):
+        def open_dialog():
+            with self.profiler.paused():
+                time.sleep(0.05)
+        self.invoke(open_dialog)
+        self.assertEqual(self.slow, [])
+
+    def test_labels_look_through_after_wrapper(self):
+        def poll_catalog_load():
+            pass
+        self.assertEqual(callback_label(after_wrapper(poll_catalog_load)),
+                         callback_label(poll_catalog_load))
+        self.assertIn("<lambda>@test_profiling.py:", callback_label(lambda: None))
+
+    def test_write_report(self):
+        self.invoke(lambda: busy(0.03))
+        output_dir = self.profiler.write()
+        self.assertEqual(sorted(os.listdir(output_dir)), ["callbacks.txt", "slow.txt", "stacks.folded"])
+        with open(os.path.join(output_dir, "stacks.folded")) as f:
+            for line in f:
+                stack, count = line.rsplit(" ", 1)
+                self.assertTrue(stack)
+                self.assertGreater(int(count), 0)
+        with open(os.path.join(output_dir, "slow.txt")) as f:
+            self.assertIn("<lambda>", f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
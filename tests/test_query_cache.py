@@ -0,0 +1,62 @@
+import unittest
+
+from src.data_struct.query_cache import QueryCache, approximate_size
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = QueryCache(max_bytes=10_000)
+
+    def test_hit_after_put(self):
+        self.cache.put(("bst", "Title", "dune"), ("Dune", 1))
+        self.assertEqual(self.cache.get(("bst", "Title", "dune")), ("Dune", 1))
+        self.assertIsNone(self.cache.get(("bst", "Title", "emma")))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_bump_invalidates_everything(self):
+        self.cache.put(("recommend", "Dune"), ("Dune Messiah",))
+        self.cache.bump()
+        self.assertIsNone(self.cache.get(("recommend", "Dune")))
+        # The stale entry is dropped when it is met
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.bytes, 0)
+
+    def test_result_from_older_generation_is_not_stored(self):
+        generation = self.cache.generation
+        self.cache.bump()       # a write happened while the result was computed
+        self.assertFalse(self.cache.put(("dict", "Title", "dune"), "stale", generation))
+        self.assertIsNone(self.cache.get(("dict", "Title", "dune")))
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        value = "x" * 2000
+        for i in range(4):
+            self.cache.put(("q", i), value + str(i))
+        self.cache.get(("q", 0))                # 0 is now the most recent
+        self.cache.put(("q", 4), value + "4")   # over budget: 1 goes first
+        self.assertIsNone(self.cache.get(("q", 1)))
+        self.assertIsNotNone(self.cache.get(("q", 0)))
+        self.assertLessEqual(self.cache.bytes, self.cache.max_bytes)
+        self.assertEqual(self.cache.bytes, sum(
+            approximate_size(("q", i)) + approximate_size(value + str(i)) for i in (0, 2, 3, 4)))
+
+    def test_value_larger_than_cache_is_skipped(self):
+        self.assertFalse(self.cache.put(("q",), "x" * 20_000))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_get_or_compute(self):
+        calls = []
+        compute = lambda: calls.append(1) or ["Dune"]
+        self.assertEqual(self.cache.get_or_compute(("recommend", "Emma"), compute), ["Dune"])
+        self.assertEqual(self.cache.get_or_compute(("recommend", "Emma"), compute), ["Dune"])
+        self.assertEqual(len(calls), 1)
+        self.cache.bump()
+        self.cache.get_or_compute(("recommend", "Emma"), compute)
+        self.assertEqual(len(calls), 2)
+
+    def test_approximate_size_follows_containers(self):
+        book = {"title": "Dune" * 100, "author": "Herbert"}
+        self.assertGreater(approximate_size([book]), approximate_size("Dune" * 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
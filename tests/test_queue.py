@@ -1,5 +1,9 @@
 import unittest
-from src.data_struct.queue import LibrarySystem
+import time
+from src.data_struct.queue import (LibrarySystem, Waitlist, Holders,
+                                   PRIORITY_STAFF, PRIORITY_COURSE_RESERVE, PRIORITY_PATRON,
+                                   CHECKED_OUT, WAITLISTED, RETURNED, BOOK_NOT_FOUND, NOT_WAITING,
+                                   STOCK_CHANGED, NOT_ON_SHELF, HOLD_RESTORED, NOT_BORROWED)
 
 class TestLibrarySystem(unittest.TestCase):
     def setUp(self):
@@ -69,5 +73,219 @@ class TestLibrarySystem(unittest.TestCase):
         self.assertEqual(len(queue), 1)
         self.assertEqual(queue[0], "USER3")
 
+    def test_undo_helpers(self):
+        self.library.check_out_book("USER1", "B002")  # Take last copy
+        self.library.check_out_book("USER2", "B002")  # Add to queue
+        self.library.check_out_book("USER3", "B002")  # Add to queue
+
+        # Cancelling a hold removes only that user
+        self.assertTrue(self.library.cancel_reservation("B002", "USER3"))
+        result = self.library.cancel_reservation("B002", "USER3")
+        self.assertEqual(result.status, NOT_WAITING)
+        self.assertIn("not on the waitlist", result.describe())
+
+        # Undoing a return puts the promoted user back at the front
+        self.library.return_book("B002", "USER1")
+        self.library.undo_return("B002", "USER1", "USER2")
+        book = self.library.books["B002"]
+        self.assertEqual(list(book["checked_out_to"]), ["USER1"])
+        self.assertEqual(book["reservation_queue"][0], "USER2")
+        self.assertEqual(book["available_copies"], 0)
+
+    def test_waitlist_cancellation_keeps_fifo(self):
+        waitlist = Waitlist(f"USER{i}" for i in range(1000))
+        for i in range(0, 1000, 2):
+            waitlist.remove(f"USER{i}")
+
+        self.assertEqual(len(waitlist), 500)
+        self.assertNotIn("USER0", waitlist)
+        self.assertIn("USER1", waitlist)
+        self.assertEqual(waitlist[0], "USER1")
+        self.assertEqual(waitlist[1], "USER3")
+        self.assertEqual(waitlist.popleft(), "USER1")
+        self.assertEqual(waitlist.popleft(), "USER3")
+
+        # A cancelled user who rejoins goes to the back
+        waitlist.append("USER0")
+        self.assertEqual(list(waitlist)[-1], "USER0")
+        with self.assertRaises(ValueError):
+            waitlist.append("USER0")
+
+    def test_holders_multiset(self):
+        holders = Holders(["USER1", "USER2", "USER1"])
+        self.assertEqual(len(holders), 3)
+        self.assertEqual(holders.count("USER1"), 2)
+        holders.remove("USER1")
+        self.assertIn("USER1", holders)
+        holders.remove("USER1")
+        self.assertNotIn("USER1", holders)
+        with self.assertRaises(ValueError):
+            holders.remove("USER1")
+        self.assertEqual(list(holders), ["USER2"])
+
+    def test_priority_classes(self):
+        self.library.check_out_book("USER1", "B002")  # Take last copy
+        self.library.check_out_book("PATRON", "B002")
+        self.library.check_out_book("COURSE", "B002", PRIORITY_COURSE_RESERVE)
+        self.library.check_out_book("STAFF", "B002", PRIORITY_STAFF)
+
+        queue = self.library.books["B002"]["reservation_queue"]
+        self.assertEqual(list(queue), ["STAFF", "COURSE", "PATRON"])
+        self.library.return_book("B002", "USER1")
+        self.assertIn("STAFF", self.library.books["B002"]["checked_out_to"])
+
+    def test_undo_return_keeps_original_hold(self):
+        library = LibrarySystem(hold_days=7)
+        library.add_book("B1", "Book 1", 1)
+        library.check_out_book("USER1", "B1")
+        library.check_out_book("PATRON", "B1")
+        result = library.return_book("B1", "USER1")
+        promoted, priority, expires_at = result.served[0]
+        self.assertEqual((promoted, priority), ("PATRON", PRIORITY_PATRON))
+        self.assertIsNotNone(expires_at)
+
+        # A staff hold placed since must stay ahead of the re-queued patron
+        library.check_out_book("STAFF", "B1", PRIORITY_STAFF)
+        library.undo_return("B1", "USER1", promoted, priority, expires_at)
+        queue = library.books["B1"]["reservation_queue"]
+        self.assertEqual(list(queue), ["STAFF", "PATRON"])
+        self.assertEqual(queue.popleft(), "STAFF")
+        self.assertEqual(queue.popleft_hold(), ("PATRON", PRIORITY_PATRON, expires_at))
+
+    def test_hold_limit(self):
+        library = LibrarySystem(max_holds_per_user=1)
+        library.add_book("B1", "Book 1", 0)
+        library.add_book("B2", "Book 2", 0)
+        library.check_out_book("USER1", "B1")
+        library.check_out_book("USER1", "B2")
+        self.assertNotIn("USER1", library.books["B2"]["reservation_queue"])
+
+        # Cancelling frees the slot
+        library.cancel_reservation("B1", "USER1")
+        library.check_out_book("USER1", "B2")
+        self.assertIn("USER1", library.books["B2"]["reservation_queue"])
+        self.assertEqual(library.hold_count("USER1"), 1)
+
+    def test_expired_holds_are_skipped(self):
+        waitlist = Waitlist()
+        waitlist.append("EXPIRED", expires_at=time.time() - 1)
+        waitlist.append("ACTIVE")
+        self.assertNotIn("EXPIRED", waitlist)
+        self.assertEqual(waitlist.peek(), "ACTIVE")
+        self.assertEqual(waitlist.popleft(), "ACTIVE")
+        self.assertIsNone(waitlist.peek())
+
+    def test_structured_results_and_events(self):
+        events = []
+        self.library.subscribe(events.append)
+
+        result = self.library.check_out_book("USER1", "B002")
+        self.assertEqual(result.status, CHECKED_OUT)
+        self.assertEqual(result.available_copies, 0)
+
+        result = self.library.check_out_book("USER2", "B002")
+        self.assertEqual(result.status, WAITLISTED)
+        self.assertEqual(result.position, 1)
+
+        result = self.library.return_book("B002", "USER1")
+        self.assertEqual(result.status, RETURNED)
+        self.assertEqual(result.promoted_user, "USER2")
+        self.assertIn("USER2", result.describe())
+
+        self.assertEqual(self.library.return_book("MISSING", "USER1").status, BOOK_NOT_FOUND)
+        self.assertEqual([e.status for e in events],
+                         [CHECKED_OUT, WAITLISTED, RETURNED, BOOK_NOT_FOUND])
+
+        status = self.library.view_book_status("B002")
+        self.assertEqual(status.checked_out_to, ["USER2"])
+        self.assertEqual(status.waitlist, [])
+        self.assertIsNone(self.library.view_book_status("MISSING"))
+
+    def test_bulk_checkout_and_return(self):
+        batches = []
+        self.library.subscribe(batches.append, batch=True)
+
+        results = self.library.check_out_many([
+            ("USER1", "B002"),
+            ("USER2", "B001"),
+            ("USER3", "B002"),
+            ("USER4", "MISSING"),
+            ("USER5", "B002", PRIORITY_STAFF),
+        ])
+        self.assertEqual([r.status for r in results],
+                         [CHECKED_OUT, CHECKED_OUT, WAITLISTED, BOOK_NOT_FOUND, WAITLISTED])
+        self.assertEqual(list(self.library.books["B002"]["reservation_queue"]), ["USER5", "USER3"])
+
+        results = self.library.return_many([("B002", "USER1"), ("B001", "USER2"), ("B002", "NOBODY")])
+        self.assertEqual(results[0].promoted_user, "USER5")
+        self.assertIsNone(results[1].promoted_user)
+        self.assertFalse(results[2])
+        self.assertEqual(self.library.books["B001"]["available_copies"], 2)
+        self.assertEqual(list(self.library.books["B002"]["reservation_queue"]), ["USER3"])
+
+        # One delivery per bulk call
+        self.assertEqual([len(batch) for batch in batches], [5, 3])
+
+    def test_deferred_events(self):
+        batches = []
+        self.library.subscribe(batches.append, batch=True)
+        with self.library.deferred_events():
+            self.library.check_out_book("USER1", "B001")
+            self.library.check_out_book("USER2", "B001")
+        self.assertEqual([len(batch) for batch in batches], [2])
+
+    def test_availability_counters(self):
+        self.assertEqual(self.library.availability("B001"), (2, 2))
+        self.assertIsNone(self.library.availability("B999"))
+        self.library.check_out_many([("USER1", "B001"), ("USER2", "B002"), ("USER3", "B002")])
+        self.assertEqual(self.library.availability(), (1, 3))
+        self.library.return_book("B002", "USER2")          # goes straight to USER3
+        self.assertEqual(self.library.availability(), (1, 3))
+        self.library.restore({"B001": ["USER1", "USER4"]}, {})
+        self.assertEqual(self.library.availability("B001"), (0, 2))
+        self.assertEqual(self.library.availability(), (0, 3))
+        self.library.remove_book("B001")
+        self.assertEqual(self.library.availability(), (0, 1))
+
+    def test_add_and_withdraw_copies(self):
+        self.library.check_out_book("USER1", "B002")
+        self.library.check_out_book("USER2", "B002")
+        self.library.check_out_book("USER3", "B002")
+        batches = []
+        self.library.subscribe(batches.append, batch=True)
+
+        result = self.library.add_copies("B002", 3)     # two go to the waitlist
+        self.assertEqual(result.status, STOCK_CHANGED)
+        self.assertEqual((result.total_copies, result.available_copies), (4, 1))
+        self.assertEqual([r.status for r in batches[0]], [STOCK_CHANGED, CHECKED_OUT, CHECKED_OUT])
+        self.assertEqual(list(self.library.books["B002"]["checked_out_to"]), ["USER1", "USER2", "USER3"])
+
+        result = self.library.add_copies("B002", -2)
+        self.assertEqual(result.status, NOT_ON_SHELF)
+        self.assertEqual(self.library.availability("B002"), (1, 4))
+        self.assertTrue(self.library.add_copies("B002", -1))
+        self.assertEqual(self.library.availability(), (2, 5))
+        self.assertEqual(self.library.add_copies("B999", 1).status, BOOK_NOT_FOUND)
+
+    def test_undo_added_copies_restores_holds(self):
+        self.library.check_out_book("USER1", "B002")
+        self.library.check_out_book("USER2", "B002")
+        self.library.check_out_book("STAFF", "B002", PRIORITY_STAFF)
+        result = self.library.add_copies("B002", 3)
+        self.assertEqual([hold[0] for hold in result.served], ["STAFF", "USER2"])
+
+        # What the GUI records as the inverse: requeue newest first, then withdraw
+        for hold in reversed(result.served):
+            self.assertEqual(self.library.undo_promotion("B002", *hold).status, HOLD_RESTORED)
+        self.assertTrue(self.library.add_copies("B002", -3))
+        book = self.library.books["B002"]
+        self.assertEqual(list(book["reservation_queue"]), ["STAFF", "USER2"])
+        self.assertEqual(list(book["checked_out_to"]), ["USER1"])
+        self.assertEqual(self.library.availability("B002"), (0, 1))
+        self.assertEqual(self.library.undo_promotion("B002", "USER2").status, NOT_BORROWED)
+
+        # Redo serves the same holds again
+        self.assertEqual([hold[0] for hold in self.library.add_copies("B002", 3).served], ["STAFF", "USER2"])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,71 @@
+import unittest
+from src.data_struct.sharding import ShardedCatalog, CatalogShard, shard_of
+
+ROWS = [
+    ("001", "Atomic Habits", "James Clear"),
+    ("002", "The Pragmatic Programmer", "Andrew Hunt"),
+    ("003", "Dune", "Frank Herbert"),
+    ("004", "Dune Messiah", "Frank Herbert"),
+    ("005", "Clean Code", "Robert Martin"),
+    ("006", "Children of Dune", "Frank Herbert"),
+]
+
+class TestShardedCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = ShardedCatalog(num_shards=3)
+        self.catalog.bulk_load(ROWS)
+
+    def test_routing_is_stable(self):
+        self.assertEqual(shard_of("001", 8), shard_of("001", 8))
+        self.assertEqual(len(self.catalog), 6)
+        self.assertEqual(sum(self.catalog.shard_sizes()), 6)
+        self.assertEqual(self.catalog.search_by_isbn("003")["title"], "Dune")
+
+    def test_scatter_gather_search(self):
+        titles = [book["title"] for book in self.catalog.search("dune")]
+        self.assertEqual(titles, ["Children of Dune", "Dune", "Dune Messiah"])
+        herbert = self.catalog.search("herbert", limit=2)
+        self.assertEqual([book["isbn"] for book in herbert], ["006", "003"])
+        prefix = self.catalog.search_by_title("dune")
+        self.assertEqual([book["isbn"] for book in prefix], ["003", "004"])
+
+    def test_update_and_delete(self):
+        self.assertFalse(self.catalog.add_book("001", "Duplicate", "X"))
+        self.assertTrue(self.catalog.update_book("005", "Dune Encyclopedia", "Willis McNelly"))
+        self.assertEqual(len(self.catalog.search_by_title("dune")), 3)
+        self.assertEqual(self.catalog.search_by_title("clean"), [])
+        self.assertTrue(self.catalog.delete_book("003"))
+        self.assertFalse(self.catalog.delete_book("003"))
+        self.assertEqual(len(self.catalog), 5)
+        self.assertIsNone(self.catalog.search_by_isbn("003"))
+
+    def test_bulk_load_builds_balanced_tree(self):
+        shard = CatalogShard()
+        shard.bulk_load([(f"{i:06d}", f"Book {i}", "Author") for i in range(5000)])
+
+        def height(node):
+            depth, level = 0, [node] if node else []
+            while level:
+                depth += 1
+                level = [child for n in level for child in (n.left, n.right) if child]
+            return depth
+        self.assertLessEqual(height(shard.tree.root), 13)
+
+    def test_worker_processes_match_local(self):
+        with ShardedCatalog(num_shards=2, parallel=True) as catalog:
+            catalog.bulk_load(ROWS)
+            catalog.add_book("007", "Dune Chronicles", "Frank Herbert")
+            titles = [book["title"] for book in catalog.search("dune")]
+            self.assertEqual(titles, ["Children of Dune", "Dune", "Dune Chronicles", "Dune Messiah"])
+            self.assertEqual(catalog.search_by_title("a"), self.catalog.search_by_title("a"))
+
+    def test_failed_scatter_leaves_no_stale_replies(self):
+        with ShardedCatalog(num_shards=2, parallel=True) as catalog:
+            catalog.bulk_load(ROWS)
+            with self.assertRaises(AttributeError):
+                catalog.search_by_title(None)
+            self.assertEqual([book["isbn"] for book in catalog.search_by_title("dune")], ["003", "004"])
+            self.assertEqual(sum(catalog.shard_sizes()), 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from src.data_struct.similarity import shingles, compute_signatures, find_similar_pairs
+from src.data_struct.graph import Graphs
+
+class TestSimilarity(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            ("001", "Atomic Habits", "James Clear"),
+            ("002", "Atomic Habits Workbook", "James Clear"),
+            ("003", "The Pragmatic Programmer", "Andrew Hunt"),
+            ("004", "Pragmatic Programmer", "Andrew Hunt"),
+            ("005", "Dune", "Frank Herbert"),
+        ]
+
+    def test_shingles(self):
+        result = shingles("Dune", "Frank Herbert")
+        self.assertIn("dun", result)
+        self.assertIn("une", result)
+        self.assertIn("@herbert", result)
+
+    def test_signatures_are_deterministic(self):
+        first = compute_signatures(self.rows, workers=1)
+        second = compute_signatures(self.rows, workers=1)
+        self.assertEqual(first, second)
+        self.assertEqual(len(first["001"]), 64)
+
+    def test_signatures_with_process_pool(self):
+        inline = compute_signatures(self.rows, workers=1)
+        pooled = compute_signatures(self.rows, workers=2, chunk_size=2)
+        self.assertEqual(inline, pooled)
+
+    def test_find_similar_pairs(self):
+        pairs = {(a, b) for a, b, _ in find_similar_pairs(self.rows, workers=1)}
+        self.assertIn(("003", "004"), pairs)
+        self.assertNotIn(("001", "005"), pairs)
+
+    def test_graph_bulk_edges(self):
+        graph = Graphs()
+        for title in ("A", "B", "C"):
+            graph.add_book_node(title)
+        graph.add_edge("A", "B")
+        added = graph.add_edges([("A", "B"), ("B", "C"), ("C", "Missing")])
+        self.assertEqual(added, [("B", "C")])
+        self.assertEqual(graph.get_similar_books("B"), ["A", "C"])
+
+    def test_rename_onto_existing_title_merges_nodes(self):
+        graph = Graphs()
+        for title in ("A", "B", "C", "D"):
+            graph.add_book_node(title)
+        graph.add_edges([("A", "B"), ("A", "C"), ("B", "D")])
+        self.assertTrue(graph.rename_book("A", "B"))
+        self.assertNotIn("A", graph.graph)
+        self.assertEqual(graph.get_similar_books("B"), ["D", "C"])
+        self.assertEqual(graph.get_similar_books("C"), ["B"])
+        self.assertEqual(graph.get_recommendations("C"), ["B", "D"])
+
+    def test_split_restores_merged_nodes(self):
+        graph = Graphs()
+        for title in ("A", "B", "C", "D", "E"):
+            graph.add_book_node(title)
+        graph.add_edges([("A", "B"), ("A", "C"), ("B", "D")])
+        before = {title: list(edges) for title, edges in graph.graph.items()}
+        nodes = graph.node_edges(("A", "B"))
+        graph.rename_book("A", "B")
+        graph.add_edge("B", "E")                    # gained after the merge
+        graph.split_book("B", nodes)
+        self.assertEqual(graph.get_similar_books("A"), before["A"])
+        self.assertEqual(graph.get_similar_books("B"), ["A", "D", "E"])
+        self.assertEqual(graph.get_similar_books("C"), ["A"])
+        self.assertEqual(graph.get_similar_books("D"), ["B"])
+        self.assertEqual(graph.get_similar_books("E"), ["B"])
+
+if __name__ == '__main__':
+    unittest.main()
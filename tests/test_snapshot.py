@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from src.data_struct.Bsearch import BinarySearchTree
+from src.data_struct.linkedList import BookLinkedList
+from src.data_struct.snapshot import save_snapshot, load_snapshot, SnapshotError
+from src.database.sqlite import SQLiteService
+
+BOOKS = [
+    ("978-3", "Dune", "Frank Herbert"),
+    ("978-1", "Atomic Habits", "James Clear"),
+    ("978-5", "Clean Code", "Robert Martin"),
+    ("978-2", "Café Stories", "Zoë Author"),
+]
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "catalog.snap")
+        self.bst = BinarySearchTree()
+        self.linked_list = BookLinkedList()
+        for isbn, title, author in BOOKS:
+            self.bst.insert(isbn, (title, author, isbn))
+            self.linked_list.add_book(title, author, isbn)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        self.assertEqual(save_snapshot(self.path, self.bst, self.linked_list, "db1", 7), 4)
+        snapshot = load_snapshot(self.path, "db1", 7)
+
+        bst = snapshot.build_bst()
+        self.assertEqual(list(bst.preorder()), list(self.bst.preorder()))
+        self.assertEqual(len(bst), 4)
+        self.assertEqual(bst.search("978-2"), ("Café Stories", "Zoë Author", "978-2"))
+        linked_list = snapshot.build_linked_list()
+        self.assertEqual(linked_list.get_all_books(), self.linked_list.get_all_books())
+        self.assertEqual(linked_list.tail.isbn, "978-2")
+        self.assertEqual(snapshot.build_book_dictionary().search_by_isbn("978-5")["title"], "Clean Code")
+
+    def test_empty_catalog(self):
+        save_snapshot(self.path, BinarySearchTree(), BookLinkedList(), "db1", 0)
+        snapshot = load_snapshot(self.path, "db1", 0)
+        self.assertEqual(len(snapshot), 0)
+        self.assertIsNone(snapshot.build_bst().root)
+
+    def test_stale_or_corrupt_snapshot_is_rejected(self):
+        save_snapshot(self.path, self.bst, self.linked_list, "db1", 7)
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.path, "db1", 8)
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.path, "other-db", 7)
+
+        with open(self.path, "r+b") as f:
+            f.seek(-3, os.SEEK_END)
+            f.write(b"XYZ")
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.path, "db1", 7)
+
+    def test_data_version_tracks_changes(self):
+        storage = SQLiteService(":memory:")
+        storage.conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, isbn TEXT, title TEXT)")
+        storage.track_changes("books")
+        database_id, version = storage.data_version()
+        storage.conn.executemany("INSERT INTO books (isbn, title) VALUES (?, ?)", [("1", "A"), ("2", "B")])
+        storage.conn.execute("UPDATE books SET title = 'C' WHERE isbn = '1'")
+        storage.conn.execute("DELETE FROM books WHERE isbn = '2'")
+        self.assertEqual(storage.data_version(), (database_id, version + 4))
+
+        storage.track_changes("books")   # idempotent
+        self.assertEqual(storage.data_version(), (database_id, version + 4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -38,6 +38,29 @@ class TestActivityStack(unittest.TestCase):
         self.assertEqual(len(actions), 10)
         self.assertEqual(actions[0]["action"], "ACTION14")
         
+    def test_configurable_capacity(self):
+        stack = ActivityStack(max_size=1000)
+        for i in range(2500):
+            stack.push(f"ACTION{i}", f"Details{i}")
+
+        # Oldest entries are evicted, newest stay on top
+        self.assertEqual(stack.size, 1000)
+        self.assertEqual(stack.peek()[0], "ACTION2499")
+        actions = stack.get_all_actions()
+        self.assertEqual(actions[-1]["action"], "ACTION1500")
+
+        with self.assertRaises(ValueError):
+            ActivityStack(max_size=0)
+
+    def test_timestamp_formatting(self):
+        node = ActivityNode("ADD", "Book 1", created=0.0)
+        self.assertIsInstance(node.created, float)
+        self.assertRegex(node.timestamp, r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+
+        self.stack.push("ADD", "Book 1")
+        popped = self.stack.pop()
+        self.assertRegex(popped[2], r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+
     def test_empty_stack(self):
         # Test operations on empty stack
         self.assertIsNone(self.stack.pop())
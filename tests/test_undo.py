@@ -0,0 +1,88 @@
+import unittest
+from src.data_struct.Stacks import ActivityStack
+from src.data_struct.undo import UndoManager
+
+class TestUndoManager(unittest.TestCase):
+    def setUp(self):
+        self.books = {}
+        self.applied = []
+        self.manager = UndoManager(self.apply)
+
+    def apply(self, ops):
+        self.applied.append(list(ops))
+        for op in ops:
+            if op[0] == "add":
+                self.books[op[1]] = op[2]
+            elif op[0] == "delete":
+                del self.books[op[1]]
+
+    def add(self, isbn, title):
+        forward = [("add", isbn, title)]
+        self.apply(forward)
+        self.manager.record("ADD", f"Added {title}", forward, [("delete", isbn)])
+
+    def test_undo_and_redo(self):
+        self.add("001", "Book 1")
+        self.assertEqual(self.manager.undo(), "Added Book 1")
+        self.assertEqual(self.books, {})
+        self.assertEqual(self.manager.redo(), "Added Book 1")
+        self.assertEqual(self.books, {"001": "Book 1"})
+
+    def test_nothing_to_undo(self):
+        self.assertIsNone(self.manager.undo())
+        self.assertIsNone(self.manager.redo())
+        self.assertFalse(self.manager.can_undo())
+
+    def test_new_action_clears_redo(self):
+        self.add("001", "Book 1")
+        self.manager.undo()
+        self.assertTrue(self.manager.can_redo())
+        self.add("002", "Book 2")
+        self.assertFalse(self.manager.can_redo())
+
+    def test_batch_is_single_inverse(self):
+        with self.manager.batch("IMPORT", "Imported 3 books"):
+            for i in range(3):
+                self.add(f"00{i}", f"Book {i}")
+        self.assertEqual(self.manager.undo_stack.size, 1)
+
+        self.applied.clear()
+        self.manager.undo()
+        # One apply call, inverses in reverse order
+        self.assertEqual(self.applied, [[("delete", "002"), ("delete", "001"), ("delete", "000")]])
+        self.assertEqual(self.books, {})
+
+    def test_interrupted_batch_is_still_undoable(self):
+        with self.assertRaises(RuntimeError):
+            with self.manager.batch("IMPORT", "Imported books"):
+                self.add("001", "Book 1")
+                self.add("002", "Book 2")
+                raise RuntimeError("disk full")
+        self.assertTrue(self.manager.can_undo())
+        self.assertEqual(self.manager.undo(), "Imported books (interrupted)")
+        self.assertEqual(self.books, {})
+
+        # The manager is usable again afterwards
+        self.add("003", "Book 3")
+        self.assertEqual(self.manager.undo_stack.size, 1)
+
+    def test_failed_undo_keeps_entry(self):
+        self.add("001", "Book 1")
+        self.books.clear()
+        with self.assertRaises(KeyError):
+            self.manager.undo()
+        self.assertTrue(self.manager.can_undo())
+
+    def test_history_keeps_undone_actions(self):
+        history = ActivityStack(10)
+        self.manager = UndoManager(self.apply, history=history)
+        self.add("001", "Book 1")
+        self.manager.undo()
+        self.manager.redo()
+        self.assertEqual([(node.action, node.details) for node in history],
+                         [("REDO", "ADD: Added Book 1"), ("UNDO", "ADD: Added Book 1"),
+                          ("ADD", "Added Book 1")])
+        self.assertEqual(self.manager.undo_stack.size, 1)
+
+if __name__ == '__main__':
+    unittest.main()